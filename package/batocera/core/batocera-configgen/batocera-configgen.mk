@@ -140,6 +140,9 @@ endef
 define BATOCERA_CONFIGGEN_SCRIPTS
 	install -D -m 0755 $(BATOCERA_CONFIGGEN_PKGDIR)/scripts/batocera-joysticks-hotkeys.py \
 	    $(TARGET_DIR)/usr/bin/batocera-joysticks-hotkeys
+
+	install -D -m 0755 $(BATOCERA_CONFIGGEN_PKGDIR)/scripts/configgen-daemon.service \
+	    $(TARGET_DIR)/usr/share/batocera/services/configgen_daemon
 endef
 
 BATOCERA_CONFIGGEN_POST_INSTALL_TARGET_HOOKS = BATOCERA_CONFIGGEN_CONFIGS
@@ -6,12 +6,11 @@ from collections.abc import Mapping
 from dataclasses import InitVar, dataclass, field
 from typing import TYPE_CHECKING, Any
 
-import yaml
-
 from .batoceraPaths import BATOCERA_CONF, BATOCERA_SHADERS, DEFAULTS_DIR, ES_SETTINGS, USER_SHADERS
 from .config import Config, SystemConfig
 from .exceptions import MissingEmulator
 from .settings.unixSettings import UnixSettings
+from .utils.cache import file_signature, load_cached
 
 if TYPE_CHECKING:
     from argparse import Namespace
@@ -40,6 +39,19 @@ def _dict_merge(destination: dict[str, Any], source: Mapping[str, Any]) -> None:
 
 
 def _load_defaults(system_name: str, default_yml: Path, default_arch_yml: Path, /) -> dict[str, Any] | None:
+    # the merged defaults only depend on the system and on the yml files, so they are
+    # kept from a launch to another until one of the files changes
+    return load_cached(
+        f'defaults-{default_yml.parent}-{default_yml.stem}-{system_name}',
+        (system_name, file_signature(default_yml, default_arch_yml, content=True)),
+        lambda: _parse_defaults(system_name, default_yml, default_arch_yml),
+    )
+
+
+def _parse_defaults(system_name: str, default_yml: Path, default_arch_yml: Path, /) -> dict[str, Any] | None:
+    # only needed when the cached defaults are outdated
+    import yaml
+
     try:
         defaults = yaml.load(default_yml.read_text(), Loader=yaml.CLoader)
     except Exception:
@@ -85,6 +97,29 @@ def _load_system_config(system_name: str, /) -> dict[str, Any]:
     return data
 
 
+def _load_es_settings() -> tuple[bool, str]:
+    try:
+        es_config = ET.parse(ES_SETTINGS)
+
+        # showFPS
+        drawframerate_node = es_config.find('./bool[@name="DrawFramerate"]')
+        drawframerate_value = drawframerate_node.attrib['value'] if drawframerate_node is not None else 'false'
+        if drawframerate_value not in ['false', 'true']:
+            drawframerate_value = 'false'
+
+        show_fps = drawframerate_value == 'true'
+
+        # uimode
+        uimode_node = es_config.find('./string[@name="UIMode"]')
+        uimode_value = uimode_node.attrib['value'] if uimode_node is not None else 'Full'
+        if uimode_value not in ['Full', 'Kiosk', 'Kid']:
+            uimode_value = 'Full'
+    except Exception:
+        return False, 'Full'
+
+    return show_fps, uimode_value
+
+
 @dataclass(slots=True)
 class Emulator:
     args: InitVar[Namespace]
@@ -128,7 +163,7 @@ class Emulator:
         _logger.info('game settings name: %s', gsname)
 
         # load configuration from batocera.conf
-        settings = UnixSettings(BATOCERA_CONF)
+        settings = UnixSettings(BATOCERA_CONF, cached=True)
 
         global_settings = settings.get_all('global')
         system_settings = settings.get_all(args.system)
@@ -138,6 +173,7 @@ class Emulator:
         # update config
         system_data.update(settings.get_all_iter('display', keep_name=True, keep_defaults=True))
         system_data.update(settings.get_all_iter('controllers', keep_name=True))
+        system_data.update(settings.get_all_iter('configgen', keep_name=True))
 
         language = settings.config.get('DEFAULT', 'system.language', fallback=None)
         if language is not None:
@@ -154,27 +190,9 @@ class Emulator:
             _logger.error('no emulator defined. exiting.')
             raise MissingEmulator
 
-        try:
-            es_config = ET.parse(ES_SETTINGS)
-
-            # showFPS
-            drawframerate_node = es_config.find('./bool[@name="DrawFramerate"]')
-            drawframerate_value = drawframerate_node.attrib['value'] if drawframerate_node is not None else 'false'
-            if drawframerate_value not in ['false', 'true']:
-                drawframerate_value = 'false'
-
-            system_data['showFPS'] = drawframerate_value == 'true'
-
-            # uimode
-            uimode_node = es_config.find('./string[@name="UIMode"]')
-            uimode_value = uimode_node.attrib['value'] if uimode_node is not None else 'Full'
-            if uimode_value not in ['Full', 'Kiosk', 'Kid']:
-                uimode_value = 'Full'
-
-            system_data['uimode'] = uimode_value
-        except Exception:
-            system_data['showFPS'] = False
-            system_data['uimode'] = 'Full'
+        system_data['showFPS'], system_data['uimode'] = load_cached(
+            'es-settings', file_signature(ES_SETTINGS, content=True), _load_es_settings
+        )
 
         _logger.debug('uimode: %s', system_data['uimode'])
 
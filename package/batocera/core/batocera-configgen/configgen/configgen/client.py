@@ -0,0 +1,104 @@
+# emulatorlauncher entry point: forwards the launch to the configgen daemon when it runs, so that
+# the configgen modules don't have to be imported again for each game. Only the stdlib is imported here.
+
+from __future__ import annotations
+
+import json
+import os
+import signal
+import socket
+import sys
+from typing import TYPE_CHECKING, BinaryIO, Final
+
+if TYPE_CHECKING:
+    from types import FrameType
+
+DAEMON_SOCKET: Final = '/var/run/configgen-daemon.sock'
+# <emulatorlauncher pid> -> pid of the daemon process running its launch (and thus the emulator), for
+# batocera-es-swissknife
+DAEMON_LAUNCHES: Final = '/var/run/configgen-launches'
+
+
+def _connect() -> socket.socket | None:
+    if not os.path.exists(DAEMON_SOCKET):  # noqa: PTH110
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(DAEMON_SOCKET)
+    except OSError:
+        connection.close()
+        return None
+
+    return connection
+
+
+def _forward(connection: socket.socket, /) -> int | None:
+    """Runs the launch in the daemon and returns its exit code, or None if the daemon could not start it."""
+    request = json.dumps({'argv': sys.argv, 'env': dict(os.environ), 'cwd': os.getcwd()}).encode()  # noqa: PTH109
+
+    try:
+        # the launcher writes its logs (and the emulator its output) where ours go
+        socket.send_fds(connection, [len(request).to_bytes(4, 'big')], [0, 1, 2])
+        connection.sendall(request)
+    except OSError:
+        return None
+
+    replies = connection.makefile('rb')
+
+    try:
+        pid = int(replies.readline())
+    except (OSError, ValueError):
+        return None
+
+    launch_file = f'{DAEMON_LAUNCHES}/{os.getpid()}'
+    try:
+        os.makedirs(DAEMON_LAUNCHES, exist_ok=True)  # noqa: PTH103
+        with open(launch_file, 'w') as f:  # noqa: PTH123
+            f.write(f'{pid}\n')
+    except OSError:
+        pass
+
+    try:
+        return _wait(replies, pid)
+    finally:
+        try:
+            os.unlink(launch_file)  # noqa: PTH108
+        except OSError:
+            pass
+
+
+def _wait(replies: BinaryIO, pid: int, /) -> int:
+    # the launcher handles the signals sent to emulatorlauncher, as when it runs in this process
+    def forward_signal(signal_number: int, frame: FrameType | None, /) -> None:
+        try:
+            os.kill(pid, signal_number)
+        except ProcessLookupError:
+            pass
+
+    signal.signal(signal.SIGINT, forward_signal)
+    signal.signal(signal.SIGTERM, forward_signal)
+
+    try:
+        reply = replies.readline().split()
+    except OSError:
+        reply = []
+
+    if len(reply) == 2 and reply[0] == b'exit':
+        return int(reply[1])
+
+    # the launcher died without reporting an exit code
+    return 1
+
+
+def launch() -> None:
+    if (connection := _connect()) is not None:
+        with connection:
+            exit_code = _forward(connection)
+
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from .emulatorlauncher import launch as launch_in_process
+
+    launch_in_process()
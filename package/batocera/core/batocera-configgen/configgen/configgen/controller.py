@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import threading
 import xml.etree.ElementTree as ET
 from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import InitVar, dataclass, field, replace
@@ -9,10 +11,14 @@ from typing import TYPE_CHECKING, Final, Literal, Self, TypedDict, Unpack, cast
 from .batoceraPaths import BATOCERA_ES_DIR, HOME, USER_ES_DIR
 from .exceptions import BatoceraException
 from .input import Input, InputDict, InputMapping
+from .utils.cache import file_signature, load_cached
+from .utils.inputDevices import get_device_inventory
 
 if TYPE_CHECKING:
     from argparse import Namespace
 
+    from .utils.cache import FileSignature
+
 
 """Default mapping of Batocera keys to SDL_GAMECONTROLLERCONFIG keys."""
 _DEFAULT_SDL_MAPPING: Final = {
@@ -74,25 +80,77 @@ def _key_to_sdl_game_controller_config(keyname: str, input: Input, /) -> str | N
     raise BatoceraException(f'Unknown controller input type: {input.type!r}')
 
 
-def _find_input_config(roots: Iterable[ET.Element], name: str, guid: str, /) -> ET.Element:
-    path = './inputConfig'
+_ES_INPUT_FILES: Final = (USER_ES_DIR / 'es_input.cfg', BATOCERA_ES_DIR / 'es_input.cfg')
+
+
+@dataclass(slots=True, frozen=True)
+class _InputConfig:
+    name: str
+    type: Literal['keyboard', 'joystick']
+    inputs: tuple[Input, ...]
+
+
+@dataclass(slots=True)
+class _InputConfigDatabase:
+    """The inputConfig elements of the es_input.cfg files, indexed as they are searched."""
+
+    by_guid_and_name: dict[tuple[str, str], _InputConfig] = field(default_factory=dict)
+    by_guid: dict[str, _InputConfig] = field(default_factory=dict)
+    by_name: dict[str, _InputConfig] = field(default_factory=dict)
+
+    def find(self, name: str, guid: str, /) -> _InputConfig:
+        if (
+            (input_config := self.by_guid_and_name.get((guid, name))) is not None
+            or (input_config := self.by_guid.get(guid)) is not None
+            or (input_config := self.by_name.get(name)) is not None
+        ):
+            return input_config
+
+        raise BatoceraException(f'Could not find controller data for "{name}" with GUID "{guid}"')
+
+
+def _parse_input_configs(files: Iterable[Path], /) -> _InputConfigDatabase:
+    database = _InputConfigDatabase()
 
-    for root in roots:
-        element = root.find(f'{path}[@deviceGUID="{guid}"][@deviceName="{name}"]')
-        if element is not None:
-            return element
+    # the user file comes first and the first element of a file wins, as with ElementTree.find()
+    for conffile in files:
+        if not conffile.exists():
+            continue
 
-    for root in roots:
-        element = root.find(f'{path}[@deviceGUID="{guid}"]')
-        if element is not None:
-            return element
+        for element in ET.parse(conffile).getroot().iterfind('./inputConfig'):
+            input_config = _InputConfig(
+                name=cast('str', element.get('deviceName')),
+                type=cast('Literal["keyboard", "joystick"]', element.get('type')),
+                inputs=tuple(input for _, input in Input.from_parent_element(element)),
+            )
+            guid = element.get('deviceGUID')
 
-    for root in roots:
-        element = root.find(f'{path}[@deviceName="{name}"]')
-        if element is not None:
-            return element
+            if guid is not None:
+                database.by_guid_and_name.setdefault((guid, input_config.name), input_config)
+                database.by_guid.setdefault(guid, input_config)
+            database.by_name.setdefault(input_config.name, input_config)
 
-    raise BatoceraException(f'Could not find controller data for "{name}" with GUID "{guid}"')
+    return database
+
+
+_input_config_database: tuple[tuple[FileSignature, ...], _InputConfigDatabase] | None = None
+_input_config_database_lock: Final = threading.Lock()
+
+
+def _load_input_config_database() -> _InputConfigDatabase:
+    # compiled once per change of the es_input.cfg files and shared by the launcher and the hotplug thread
+    global _input_config_database
+
+    signature = file_signature(*_ES_INPUT_FILES, content=True)
+
+    with _input_config_database_lock:
+        if _input_config_database is None or _input_config_database[0] != signature:
+            _input_config_database = (
+                signature,
+                load_cached('es-input', signature, lambda: _parse_input_configs(_ES_INPUT_FILES)),
+            )
+
+        return _input_config_database[1]
 
 
 class _RelaxedDict(TypedDict):
@@ -130,6 +188,8 @@ class Controller:
 
     inputs_: InitVar[InputMapping | Iterable[tuple[str, Input]] | None] = None
     inputs: InputDict = field(init=False)
+    # SDL lines of the default mapping by ignored buttons, computed once as many generators ask for them
+    _sdl_game_db_lines: dict[tuple[str, ...], str] = field(init=False, default_factory=dict, repr=False, compare=False)
 
     def __post_init__(self, inputs_: InputMapping | Iterable[tuple[str, Input]] | None, /) -> None:
         self.inputs = dict(inputs_) if inputs_ is not None else {}
@@ -139,6 +199,15 @@ class Controller:
 
     def generate_sdl_game_db_line(self, sdl_mapping: Mapping[str, str] = _DEFAULT_SDL_MAPPING, /, ignore_buttons: list[str] | None = None) -> str:
         """Returns an SDL_GAMECONTROLLERCONFIG-formatted string for the given configuration."""
+        if sdl_mapping is _DEFAULT_SDL_MAPPING:
+            key = tuple(ignore_buttons) if ignore_buttons is not None else ()
+            if (line := self._sdl_game_db_lines.get(key)) is None:
+                line = self._sdl_game_db_lines[key] = self._build_sdl_game_db_line(sdl_mapping, ignore_buttons)
+            return line
+
+        return self._build_sdl_game_db_line(sdl_mapping, ignore_buttons)
+
+    def _build_sdl_game_db_line(self, sdl_mapping: Mapping[str, str], ignore_buttons: list[str] | None, /) -> str:
         config = [self.guid, self.real_name.replace(",", "."), "platform:Linux"]
 
         def add_mapping(input: Input) -> None:
@@ -188,7 +257,7 @@ class Controller:
         relaxed_values: list[int] = [int(cache_content[i]) for i in range(1, n+1)]
 
         # get full list of axis (in case one is not used in es)
-        caps = evdev.InputDevice(self.device_path).capabilities()
+        caps = get_device_inventory().capabilities(self.device_path)
         code_values: dict[int, int]  = {}
         i = 0
         for code, _ in caps[evdev.ecodes.EV_ABS]:
@@ -211,21 +280,17 @@ class Controller:
     # Create a controller array with the player id as a key
     @classmethod
     def load_for_players(cls, max_players: int, args: Namespace, /) -> ControllerList:
-        cfg_roots = [
-            ET.parse(conffile).getroot()
-            for conffile in (USER_ES_DIR / 'es_input.cfg', BATOCERA_ES_DIR / 'es_input.cfg')
-            if conffile.exists()
-        ]
+        database = _load_input_config_database()
 
         return [
             controller
             for player_number in range(1, max_players + 1)
-            if (controller := cls._find_best_controller(cfg_roots, args, player_number)) is not None
+            if (controller := cls._find_best_controller(database, args, player_number)) is not None
         ]
 
     @classmethod
     def _find_best_controller(
-        cls, roots: Iterable[ET.Element], args: Namespace, player_number: int, /,
+        cls, database: _InputConfigDatabase, args: Namespace, player_number: int, /,
     ) -> Controller | None:
         index: int | None = getattr(args, f'p{player_number}index')
 
@@ -235,12 +300,13 @@ class Controller:
         guid: str = getattr(args, f'p{player_number}guid')
         real_name: str = getattr(args, f'p{player_number}name')
 
-        input_config = _find_input_config(roots, real_name, guid)
+        input_config = database.find(real_name, guid)
         return cls(
-            name=cast('str', input_config.get("deviceName")),
-            type=cast('Literal["keyboard", "joystick"]', input_config.get("type")),
+            name=input_config.name,
+            type=input_config.type,
             guid=guid,
-            inputs_=Input.from_parent_element(input_config),
+            # the database is shared, each controller gets its own inputs
+            inputs_=((input.name, input.replace()) for input in input_config.inputs),
             player_number=player_number,
             index=index,
             real_name=real_name,
@@ -264,12 +330,22 @@ def generate_sdl_game_controller_config(controllers: Controllers, /, ignore_butt
 
 
 def write_sdl_controller_db(
-    controllers: Controllers, outputFile: str | Path = "/tmp/gamecontrollerdb.txt", /,
+    controllers: Controllers, outputFile: str | Path = "/tmp/gamecontrollerdb.txt", /, ignore_buttons: list[str] | None = None,
 ) -> Path:
     outputFile = Path(outputFile)
-
-    with outputFile.open("w") as text_file:
-        text_file.write(generate_sdl_game_controller_config(controllers))
+    content = generate_sdl_game_controller_config(controllers, ignore_buttons=ignore_buttons)
+
+    # several generators write the same file: it is only replaced when its content changes,
+    # and atomically so that an emulator never reads a partial file
+    try:
+        if outputFile.read_text() == content:
+            return outputFile
+    except (OSError, UnicodeDecodeError):
+        pass
+
+    tmp_file = outputFile.with_name(f'{outputFile.name}.{os.getpid()}.tmp')
+    tmp_file.write_text(content)
+    tmp_file.replace(outputFile)
 
     return outputFile
 
@@ -3,9 +3,9 @@ from __future__ import annotations
 import logging
 import re
 from pathlib import Path
-from typing import TYPE_CHECKING, Final, NotRequired, TypedDict, cast
+from typing import TYPE_CHECKING, Final, NotRequired, TypedDict
 
-import pyudev
+from .utils.inputDevices import get_device_inventory
 
 if TYPE_CHECKING:
     from .types import DeviceInfoDict, DeviceInfoMapping
@@ -31,38 +31,35 @@ class _Device(TypedDict):
 def getDevicesInformation() -> DeviceInfoDict:
     groups: dict[str | None, list[str]] = {}
     devices: dict[int, _Device] = {}
-    context   = pyudev.Context()
-    events    = context.list_devices(subsystem='input')
     mouses: list[int]    = []
     joysticks: list[int] = []
-    for ev in events:
-        eventId = dev2int(str(ev.device_node))
-        if eventId is not None:
-            isJoystick = ("ID_INPUT_JOYSTICK" in ev.properties and ev.properties["ID_INPUT_JOYSTICK"] == "1")
-            isWheel    = ("ID_INPUT_WHEEL"    in ev.properties and ev.properties["ID_INPUT_WHEEL"] == "1")
-            isMouse    = ("ID_INPUT_MOUSE"    in ev.properties and ev.properties["ID_INPUT_MOUSE"] == "1") or ("ID_INPUT_TOUCHPAD" in ev.properties and ev.properties["ID_INPUT_TOUCHPAD"] == "1")
-            group = None
+    for ev in get_device_inventory().devices.values():
+        eventId = ev.event_id
+        isJoystick = ("ID_INPUT_JOYSTICK" in ev.properties and ev.properties["ID_INPUT_JOYSTICK"] == "1")
+        isWheel    = ("ID_INPUT_WHEEL"    in ev.properties and ev.properties["ID_INPUT_WHEEL"] == "1")
+        isMouse    = ("ID_INPUT_MOUSE"    in ev.properties and ev.properties["ID_INPUT_MOUSE"] == "1") or ("ID_INPUT_TOUCHPAD" in ev.properties and ev.properties["ID_INPUT_TOUCHPAD"] == "1")
+        group = None
+        if "ID_PATH" in ev.properties:
+            group = ev.properties["ID_PATH"]
+        if isJoystick or isMouse:
+            if isJoystick:
+                joysticks.append(eventId)
+            if isMouse:
+                mouses.append(eventId)
+            devices[eventId] = {
+                "node": ev.node,
+                "sysfs_path": str((Path(ev.sys_path) / "device" / "device").resolve()),
+                "group": group,
+                "isJoystick": isJoystick,
+                "isWheel": isWheel,
+                "isMouse": isMouse
+            }
             if "ID_PATH" in ev.properties:
-                group = ev.properties["ID_PATH"]
-            if isJoystick or isMouse:
-                if isJoystick:
-                    joysticks.append(eventId)
-                if isMouse:
-                    mouses.append(eventId)
-                devices[eventId] = {
-                    "node": cast('str', ev.device_node),
-                    "sysfs_path": str((Path(ev.sys_path) / "device" / "device").resolve()),
-                    "group": group,
-                    "isJoystick": isJoystick,
-                    "isWheel": isWheel,
-                    "isMouse": isMouse
-                }
-                if "ID_PATH" in ev.properties:
-                    if isWheel and "WHEEL_ROTATION_ANGLE" in ev.properties:
-                        devices[eventId]["wheel_rotation"] = int(ev.properties["WHEEL_ROTATION_ANGLE"])
-                    if group not in groups:
-                        groups[group] = []
-                    groups[group].append(cast('str', ev.device_node))
+                if isWheel and "WHEEL_ROTATION_ANGLE" in ev.properties:
+                    devices[eventId]["wheel_rotation"] = int(ev.properties["WHEEL_ROTATION_ANGLE"])
+                if group not in groups:
+                    groups[group] = []
+                groups[group].append(ev.node)
     mouses.sort()
     joysticks.sort()
     res: DeviceInfoDict = {}
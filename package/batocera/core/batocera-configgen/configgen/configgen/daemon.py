@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import contextlib
+import json
+import logging
+import os
+import pkgutil
+import signal
+import socket
+import struct
+import sys
+import threading
+import traceback
+from importlib import import_module
+from pathlib import Path
+from typing import Final
+
+from .client import DAEMON_LAUNCHES, DAEMON_SOCKET
+
+_logger = logging.getLogger(__name__)
+
+_MAX_FDS: Final = 3
+
+
+def _preload() -> None:
+    # everything a launch may import is imported once here, the launches only fork this process
+    from . import emulatorlauncher, generators  # noqa: F401
+
+    for module in pkgutil.iter_modules(generators.__path__):
+        if not module.ispkg:
+            continue
+
+        for generator_module in pkgutil.iter_modules([str(Path(generators.__path__[0]) / module.name)]):
+            if not generator_module.name.endswith('Generator'):
+                continue
+
+            try:
+                import_module(f'{generators.__name__}.{module.name}.{generator_module.name}')
+            except Exception as e:
+                _logger.debug('unable to preload the generator %s: %s', generator_module.name, e)
+
+    # heavy libraries only imported by some steps of the launch
+    for library in ('PIL.Image', 'evdev', 'pyudev', 'sdl2', 'yaml'):
+        try:
+            import_module(library)
+        except Exception as e:
+            _logger.debug('unable to preload %s: %s', library, e)
+
+
+def _receive_request(connection: socket.socket, /) -> tuple[dict[str, object], list[int]]:
+    header, fds, _, _ = socket.recv_fds(connection, 4, _MAX_FDS)
+    size = int.from_bytes(header, 'big')
+
+    data = bytearray()
+    while len(data) < size:
+        if not (chunk := connection.recv(size - len(data))):
+            raise ConnectionError('incomplete request')
+        data += chunk
+
+    return json.loads(data), fds
+
+
+def _watch_client(connection: socket.socket, finished: threading.Event, /) -> None:
+    # the client doesn't send anything more: the connection is only closed when it exits
+    try:
+        connection.recv(1)
+    except OSError:
+        pass
+
+    if not finished.is_set():
+        # the client was killed (ie SIGKILL): the launch, emulator included, is killed with it
+        with contextlib.suppress(OSError):
+            client_pid, _, _ = struct.unpack('3i', connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i')))
+            Path(DAEMON_LAUNCHES, str(client_pid)).unlink(missing_ok=True)
+        os.killpg(0, signal.SIGKILL)
+
+
+def _run_launch(connection: socket.socket, /) -> None:
+    # forked process: runs a single launch as emulatorlauncher would, in the environment of the client
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    # the launch and the processes it starts get their own process group, to be killed with the client
+    os.setsid()
+    finished = threading.Event()
+    exit_code = 1
+
+    try:
+        request, fds = _receive_request(connection)
+
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+            os.close(fd)
+
+        os.environ.clear()
+        os.environ.update(request['env'])  # pyright: ignore[reportArgumentType, reportCallIssue]
+        os.chdir(request['cwd'])  # pyright: ignore[reportArgumentType]
+        sys.argv = list(request['argv'])  # pyright: ignore[reportArgumentType, reportCallIssue]
+
+        connection.sendall(f'{os.getpid()}\n'.encode())
+        threading.Thread(target=_watch_client, args=(connection, finished), name='client-watch', daemon=True).start()
+
+        from . import profiler
+        from .emulatorlauncher import launch
+
+        profiler.reset()
+
+        try:
+            launch()
+            exit_code = 0
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 0 if e.code is None else 1
+    except BaseException:
+        traceback.print_exc()
+    finally:
+        # os._exit() doesn't run the atexit hooks: the queued log records are written here
+        with contextlib.suppress(Exception):
+            from .utils.logger import stop_log_queue
+
+            stop_log_queue()
+        with contextlib.suppress(Exception):
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finished.set()
+        with contextlib.suppress(OSError):
+            connection.sendall(f'exit {exit_code}\n'.encode())
+        os._exit(0)
+
+
+def serve() -> None:
+    """
+    Resident configgen: emulatorlauncher (configgen.client) forwards its launches here through a unix socket.
+
+    Each launch runs in a process forked from this one, so that the configgen modules, the generators and the
+    heavy libraries are already imported, while no state is kept from a launch to another.
+    """
+    _preload()
+
+    Path(DAEMON_SOCKET).unlink(missing_ok=True)
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    # only root can connect: the socket is created 0600, without a window with the default permissions
+    umask = os.umask(0o177)
+    try:
+        server.bind(DAEMON_SOCKET)
+    finally:
+        os.umask(umask)
+    server.listen()
+
+    # the launches are not waited for, they report their exit code to their client
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    try:
+        while True:
+            connection, _ = server.accept()
+
+            if os.fork() == 0:
+                server.close()
+                _run_launch(connection)
+
+            connection.close()
+    finally:
+        server.close()
+        Path(DAEMON_SOCKET).unlink(missing_ok=True)
+
+
+if __name__ == '__main__':
+    serve()
@@ -12,7 +12,6 @@ profiler.start()
 ### import always needed ###
 import argparse
 import contextlib
-import ctypes
 import json
 import logging
 import os
@@ -20,74 +19,89 @@ import signal
 import subprocess
 import threading
 import time
-from copy import deepcopy
 from pathlib import Path
 from sys import exit
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, Final
 
-import pyudev
-import sdl2
-
-from .batoceraPaths import BATOCERA_SHARE_DIR, ES_GAMES_METADATA, SAVES, SYSTEM_SCRIPTS, USER_SCRIPTS
+from .batoceraPaths import BATOCERA_CONF, BATOCERA_SHARE_DIR, ES_GAMES_METADATA, SAVES, SYSTEM_SCRIPTS, USER_SCRIPTS
 from .controller import Controller
 from .Emulator import Emulator
 from .exceptions import BadCommandLineArguments, BaseBatoceraException, BatoceraException, UnexpectedEmulatorExit
 from .generators import get_generator
 from .gun import Gun
-from .utils import bezels as bezelsUtil, metadata, videoMode, wheelsUtils
+from .settings.unixSettings import UnixSettings
+from .utils import metadata, videoMode, wheelsUtils
+from .utils.cache import file_signature
 from .utils.evmapy import evmapy
+from .utils.hooks import run_hooks
 from .utils.hotkeygen import set_hotkeygen_context
+from .utils.hotplug import ControllerHotplugMonitor
+from .utils.inputDevices import get_device_inventory
 from .utils.logger import setup_logging
+from .utils.outputCapture import OutputCapture
 from .utils.overlayfs import mount_overlayfs
+from .utils.scheduler import TaskScheduler
 from .utils.squashfs import mount_squashfs
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
     from types import FrameType
 
     from .Command import Command
+    from .controller import ControllerList
     from .generators.Generator import Generator
+    from .gun import GunList
     from .types import Resolution
 
 _logger = logging.getLogger(__name__)
 
-# A lock to safely modify the active controller list from multiple threads
+# emulator output in streaming mode: only this tail of each stream is kept, then logged and written on exit
+_EMULATOR_OUTPUT_TAIL_BYTES: Final = 64 * 1024
+
+# A lock to safely modify the active controllers from multiple threads
 _player_controllers_lock = threading.Lock()
-# A global variable to hold the current, up-to-date list of player controllers
-_active_player_controllers = []
+# A global variable to hold the current, up-to-date controllers by player number (None when disconnected)
+_active_player_controllers: dict[int, Controller | None] = {}
 # Global reference to the evmapy configurator instance
-_evmapy_instance = None
+_evmapy_instance: evmapy | None = None
 
 def main(args: argparse.Namespace, maxnbplayers: int) -> int:
-    original_rom = args.rom
-
-    # squashfs roms if squashed
-    if original_rom.suffix == ".squashfs":
-        with mount_squashfs(original_rom) as squash_rom:
-            return start_rom(args, maxnbplayers, squash_rom, original_rom)
-    else:
-        return start_rom(args, maxnbplayers, original_rom, original_rom)
-
-def start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_rom: Path) -> int:
-    global _active_player_controllers, _evmapy_instance
-
-    player_controllers = Controller.load_for_players(maxnbplayers, args)
-
-    # Initialize the global state with the initial controller list
-    with _player_controllers_lock:
-        _active_player_controllers = list(player_controllers)
-
-    # Start the background monitor thread.
-    monitor_thread = threading.Thread(target=_controller_monitor_thread, daemon=True)
+    return start_rom(args, maxnbplayers, args.rom)
 
+def start_rom(args: argparse.Namespace, maxnbplayers: int, original_rom: Path) -> int:
     # find the system to run
     systemName: str = args.system
     _logger.debug("Running system: %s", systemName)
-    system = Emulator(args, original_rom)
+    with profiler.span('emulator_config'):
+        system = Emulator(args, original_rom)
+
+    # squashfs roms if squashed, kept mounted for the next launches when configgen.squashfs_cache is set
+    with (
+        mount_squashfs(
+            original_rom,
+            cache_size=system.config.get_int('configgen.squashfs_cache', 0),
+            idle_timeout=system.config.get_int('configgen.squashfs_cache_idle', 600),
+        )
+        if original_rom.suffix == ".squashfs"
+        else contextlib.nullcontext(original_rom)
+    ) as rom, TaskScheduler(system.config.get_bool('configgen.parallel_prelaunch', True)) as scheduler:
+        # the independent steps before the emulator run overlap, unless configgen.parallel_prelaunch=0
+        profiler.set_trace_metadata(parallel_prelaunch=scheduler.parallel)
+        return _start_rom(args, maxnbplayers, rom, original_rom, system, scheduler)
+
+def _start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_rom: Path, system: Emulator, scheduler: TaskScheduler) -> int:
+    global _active_player_controllers, _evmapy_instance
 
-    _logger.debug("Settings: %s", {
-        key: '***' if 'password' in key else value for key, value in system.config.items()
-    })
+    systemName: str = args.system
+
+    # the input devices are enumerated once, for the controllers, guns, wheels and hotkeys configuration
+    scheduler.submit('devices', lambda: get_device_inventory().devices)
+    scheduler.submit('controllers', lambda: Controller.load_for_players(maxnbplayers, args))
+
+    # the masked copy of the settings is only built when it is logged
+    if _logger.isEnabledFor(logging.DEBUG):
+        _logger.debug("Settings: %s", {
+            key: '***' if 'password' in key else value for key, value in system.config.items()
+        })
 
     if "emulator" in system.config and "core" in system.config:
         _logger.debug('emulator: %s, core: %s', system.config.emulator, system.config.core)
@@ -96,9 +110,19 @@ def start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_r
             _logger.debug('emulator: %s', system.config.emulator)
 
     # metadata
-    md = metadata.get_games_meta_data(ES_GAMES_METADATA, systemName, rom)
+    scheduler.submit('metadata', lambda: metadata.get_games_meta_data(ES_GAMES_METADATA, systemName, rom))
+    scheduler.submit('guns', lambda: Gun.get_and_precalibrate_all(system, rom))
+
+    player_controllers: ControllerList = scheduler.result('controllers')
+    md: dict[str, str] = scheduler.result('metadata')
+    guns: GunList = scheduler.result('guns')
+
+    # Initialize the global state with the initial controller list
+    with _player_controllers_lock:
+        _active_player_controllers = {controller.player_number: controller for controller in player_controllers}
 
-    guns = Gun.get_and_precalibrate_all(system, rom)
+    # follows the controllers (dis)connections while the emulator runs
+    hotplug_monitor = ControllerHotplugMonitor(player_controllers, _on_controllers_changed)
 
     with wheelsUtils.configure_wheels(player_controllers, system, md) as (player_controllers, wheels):
         # find the generator
@@ -111,53 +135,40 @@ def start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_r
         ) as rom:
             # the resolution must be changed before configuration while the configuration may depend on it (ie bezels)
             wantedGameMode = generator.getResolutionMode(system.config)
-            systemMode = videoMode.getCurrentMode()
+            with profiler.span('video_mode_query'):
+                systemMode = videoMode.getCurrentMode()
 
             resolutionChanged = False
             mouseChanged = False
             exitCode = 0
             try:
-                # lower the resolution if mode is auto
-                newsystemMode = systemMode  # newsystemMode is the mode after minmax (ie in 1K if tv was in 4K), systemmode is the mode before (ie in es)
-                if system.config.video_mode == "" or system.config.video_mode == "default":
-                    _logger.debug("minTomaxResolution")
-                    _logger.debug("video mode before minmax: %s", systemMode)
-                    videoMode.minTomaxResolution()
-                    newsystemMode = videoMode.getCurrentMode()
-                    if newsystemMode != systemMode:
+                with profiler.span('video_mode_change'):
+                    # lower the resolution if mode is auto
+                    newsystemMode = systemMode  # newsystemMode is the mode after minmax (ie in 1K if tv was in 4K), systemmode is the mode before (ie in es)
+                    if system.config.video_mode == "" or system.config.video_mode == "default":
+                        _logger.debug("minTomaxResolution")
+                        _logger.debug("video mode before minmax: %s", systemMode)
+                        videoMode.minTomaxResolution()
+                        newsystemMode = videoMode.getCurrentMode()
+                        if newsystemMode != systemMode:
+                            resolutionChanged = True
+
+                    _logger.debug("current video mode: %s", newsystemMode)
+                    _logger.debug("wanted video mode: %s", wantedGameMode)
+
+                    if wantedGameMode != 'default' and wantedGameMode != newsystemMode:
+                        videoMode.changeMode(wantedGameMode)
                         resolutionChanged = True
+                    gameResolution = videoMode.getCurrentResolution()
+
+                    # if resolution is reversed (ie ogoa boards), reverse it in the gameResolution to have it correct
+                    if videoMode.isResolutionReversed():
+                        x = gameResolution["width"]
+                        gameResolution["width"]  = gameResolution["height"]
+                        gameResolution["height"] = x
+                    _logger.debug('resolution: %sx%s', gameResolution["width"], gameResolution["height"])
 
-                _logger.debug("current video mode: %s", newsystemMode)
-                _logger.debug("wanted video mode: %s", wantedGameMode)
-
-                if wantedGameMode != 'default' and wantedGameMode != newsystemMode:
-                    videoMode.changeMode(wantedGameMode)
-                    resolutionChanged = True
-                gameResolution = videoMode.getCurrentResolution()
-
-                # if resolution is reversed (ie ogoa boards), reverse it in the gameResolution to have it correct
-                if videoMode.isResolutionReversed():
-                    x = gameResolution["width"]
-                    gameResolution["width"]  = gameResolution["height"]
-                    gameResolution["height"] = x
-                _logger.debug('resolution: %sx%s', gameResolution["width"], gameResolution["height"])
-
-                try:
-                    res = subprocess.run(
-                        ["/usr/bin/batocera-resolution", "listOutputs"],
-                        capture_output=True,
-                        text=True,
-                        timeout=3
-                    )
-                    outputs = res.stdout.split() if res.returncode == 0 else []
-
-                    if len(outputs) > 1:
-                        _logger.debug("Multiple displays detected (%s). Resetting mouse to primary display", ", ".join(outputs))
-                        subprocess.call(["/usr/bin/hotkeygen", "--reset-mouse"])
-                    else:
-                        _logger.debug("Single display detected (%s). Skipping mouse reset to keep cursor hidden", ", ".join(outputs) if outputs else "default")
-                except Exception as e:
-                    _logger.warning("Failed to check display count or reset mouse: %s", e)
+                scheduler.submit('reset_mouse', _reset_mouse)
 
                 # savedir: create the save directory if not already done
                 dirname = SAVES / system.name
@@ -171,7 +182,7 @@ def start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_r
 
                 if generator.getMouseMode(system.config, rom):
                     mouseChanged = True
-                    videoMode.changeMouse(True)
+                    scheduler.submit('mouse_mode', lambda: videoMode.changeMouse(True), after=('reset_mouse',))
 
                 # SDL VSync is a big deal on OGA and RPi4
                 if not system.config.get_bool('sdlvsync', True):
@@ -180,16 +191,17 @@ def start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_r
                     system.config["sdlvsync"] = '1'
                 os.environ.update({'SDL_RENDER_VSYNC': system.config["sdlvsync"]})
 
-                # run a script before emulator starts
-                callExternalScripts(SYSTEM_SCRIPTS, "gameStart", [systemName, system.config.emulator, effectiveCore, rom])
-                callExternalScripts(USER_SCRIPTS, "gameStart", [systemName, system.config.emulator, effectiveCore, rom])
+                hooks_args = [systemName, system.config.emulator, effectiveCore, rom]
+                hooks_timeout = system.config.get_int('configgen.hooks_timeout', 0)
 
                 # run the emulator
                 _evmapy_instance = evmapy(systemName, system.config.emulator, effectiveCore, original_rom, player_controllers, guns)
-                with (
-                    _evmapy_instance,
-                    set_hotkeygen_context(generator, system)
-                ):
+                with contextlib.ExitStack() as stack:
+                    with profiler.span('evmapy'):
+                        stack.enter_context(_evmapy_instance)
+                    with profiler.span('hotkeygen'):
+                        stack.enter_context(set_hotkeygen_context(generator, system))
+
                     # change directory if wanted
                     executionDirectory = generator.executionDirectory(system.config, rom)
                     if executionDirectory is not None:
@@ -204,9 +216,14 @@ def start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_r
                         if hud_setting and hud_setting != "none":
                             mango_active = True
 
-                    cmd = generator.generate(system, rom, player_controllers, md, guns, wheels, gameResolution)
+                    scheduler.submit('gun_help', lambda: _generate_gun_help(system, rom, guns, gameResolution))
+
+                    with profiler.span('generate'):
+                        cmd = generator.generate(system, rom, player_controllers, md, guns, wheels, gameResolution)
 
-                    hud_bezel = getHudBezel(system, generator, rom, gameResolution, system.guns_borders_size_name(guns), system.guns_border_ratio_type(guns))
+                    # the bezel reads the files and the config written by generate() (ie getInGameRatio of dolphin)
+                    with profiler.span('bezel'):
+                        hud_bezel: Path | None = getHudBezel(system, generator, rom, gameResolution, system.guns_borders_size_name(guns), system.guns_border_ratio_type(guns))
 
                     # MangoHUD Setup
                     if mango_active:
@@ -271,14 +288,6 @@ def start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_r
                         except Exception as overlay_error:
                             _logger.error("Could not initialize standalone bezel overlay: %s", overlay_error)
 
-                    # generate the gun help
-                    try:
-                        default_gun_help_dir = Path("/var/run/batocera-overlays")
-                        bezelsUtil.generate_gun_help(systemName, rom, system.config.use_guns, guns, default_gun_help_dir, "gun_help.png", gameResolution)
-                    except Exception as e:
-                        _logger.error("Failed to generate the gun help image")
-                        _logger.error(e)
-
                     # gun borders
                     try:
                         if system.config.use_guns and guns:
@@ -288,19 +297,31 @@ def start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_r
                                 gun_border_size_name = system.guns_borders_size_name(guns)
                                 if gun_border_size_name is not None:
                                     _logger.debug("using configgen internal gun borders for emulator %s", system.config.emulator)
+                                    from .utils.bezels import gunsBordersColorFomConfig
                                     from .utils.gun_borders import draw_gun_borders
                                     draw_gun_borders(
                                         gun_border_size_name,
-                                        bezelsUtil.gunsBordersColorFomConfig(system.config),
+                                        gunsBordersColorFomConfig(system.config),
                                         system.guns_border_ratio_type(guns)
                                     )
                     except Exception as e:
                         _logger.error("Failed to draw_gun_borders for gun_borders")
                         _logger.error(e)
 
-                    with profiler.pause():
-                        monitor_thread.start()
-                        exitCode = runCommand(cmd)
+                    # only the emulator run waits for all the prelaunch steps
+                    scheduler.wait_all()
+                    _logger.debug("prelaunch steps: %s", ", ".join(f"{name}={duration:.1f}ms" for name, duration in scheduler.timings.items()))
+
+                    # run a script before emulator starts, once evmapy runs and the configuration is written
+                    with profiler.span('scripts_game_start'):
+                        run_hooks((SYSTEM_SCRIPTS, USER_SCRIPTS), "gameStart", hooks_args, timeout=hooks_timeout)
+
+                    with profiler.pause(), profiler.span('run'):
+                        hotplug_monitor.start()
+                        try:
+                            exitCode = runCommand(cmd, streaming=system.config.get_str('configgen.emulator_output', 'streaming') != 'buffered')
+                        finally:
+                            hotplug_monitor.stop()
 
                 # Terminate standalone bezel overlay (if running) after the emulator exits
                 if bezel_proc:
@@ -312,10 +333,13 @@ def start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_r
                         bezel_proc.kill()
 
                 # run a script after emulator shuts down
-                callExternalScripts(USER_SCRIPTS, "gameStop", [systemName, system.config.emulator, effectiveCore, rom])
-                callExternalScripts(SYSTEM_SCRIPTS, "gameStop", [systemName, system.config.emulator, effectiveCore, rom])
+                with profiler.span('scripts_game_stop'):
+                    run_hooks((USER_SCRIPTS, SYSTEM_SCRIPTS), "gameStop", hooks_args, timeout=hooks_timeout)
 
             finally:
+                # the prelaunch steps (ie the mouse mode) are done before being reverted
+                scheduler.close()
+
                 # always restore the resolution
                 if resolutionChanged:
                     try:
@@ -332,6 +356,15 @@ def start_rom(args: argparse.Namespace, maxnbplayers: int, rom: Path, original_r
     # exit
     return exitCode
 
+def _createTransparentHudBezel(png_file: Path, info_file: Path, gameResolution: Resolution) -> None:
+    from .utils import bezels as bezelsUtil
+
+    w = gameResolution["width"]
+    h = gameResolution["height"]
+    bezelsUtil.createTransparentBezel(png_file, w, h)
+    with info_file.open("w") as fd:
+        fd.write(f'{{ "width":{w}, "height":{h}, "opacity":1.0000000, "messagex":0.220000, "messagey":0.120000 }}')
+
 def getHudBezel(system: Emulator, generator: Generator, rom: Path, gameResolution: Resolution, bordersSize: str | None, bordersRatio: str | None):
     if generator.supportsInternalBezels():
         _logger.debug("skipping bezels for emulator %s", system.config.emulator)
@@ -344,16 +377,17 @@ def getHudBezel(system: Emulator, generator: Generator, rom: Path, gameResolutio
     if (not bezel or bezel == 'none') and (not bezel_tattoo or bezel_tattoo == '0') and (not bezel_qrcode or bezel_qrcode == '0') and bordersSize is None:
         return None
 
+    # imported here while it loads PIL and qrcode
+    from .utils import bezels as bezelsUtil
+
     # no bezel, generate a transparent one for the tatoo/gun borders ... and so on
-    if not bezel or bezel == 'none':
+    transparent = not bezel or bezel == 'none'
+    if transparent:
         overlay_png_file  = Path("/tmp/bezel_transhud_black.png")
         overlay_info_file = Path("/tmp/bezel_transhud_black.info")
-        bezelsUtil.createTransparentBezel(overlay_png_file, gameResolution["width"], gameResolution["height"])
 
-        w = gameResolution["width"]
-        h = gameResolution["height"]
-        with overlay_info_file.open("w") as fd:
-            fd.write(f'{{ "width":{w}, "height":{h}, "opacity":1.0000000, "messagex":0.220000, "messagey":0.120000 }}')
+        # the transparent bezel is only written when really needed, ie once the final image is not cached
+        infos = {"width": gameResolution["width"], "height": gameResolution["height"]}
     else:
         _logger.debug("hud enabled. trying to apply the bezel %s", bezel)
 
@@ -365,17 +399,17 @@ def getHudBezel(system: Emulator, generator: Generator, rom: Path, gameResolutio
         overlay_info_file = bz_infos["info"]
         overlay_png_file  = bz_infos["png"]
 
-    # check the info file
-    # bottom, top, left and right must not cover too much the image to be considered as compatible
-    if overlay_info_file.exists():
-        try:
-            with overlay_info_file.open() as f:
-                infos = json.load(f)
-        except Exception:
-            _logger.warning("unable to read %s", overlay_info_file)
+        # check the info file
+        # bottom, top, left and right must not cover too much the image to be considered as compatible
+        if overlay_info_file.exists():
+            try:
+                with overlay_info_file.open() as f:
+                    infos = json.load(f)
+            except Exception:
+                _logger.warning("unable to read %s", overlay_info_file)
+                infos = {}
+        else:
             infos = {}
-    else:
-        infos = {}
 
     if "width" in infos and "height" in infos:
         bezel_width  = infos["width"]
@@ -449,49 +483,96 @@ def getHudBezel(system: Emulator, generator: Generator, rom: Path, gameResolutio
     # if screen and bezel sizes doesn't match, resize
     # stretch option
     bezel_stretch = system.config.get_bool('bezel_stretch')
-    if (bezel_width != gameResolution["width"] or bezel_height != gameResolution["height"]):
+    needs_resize = bezel_width != gameResolution["width"] or bezel_height != gameResolution["height"]
+    cheevos_id = system.es_game_info.get("cheevosId", "0") if bezel_qrcode != "0" else "0"
+
+    if not needs_resize and bezel_tattoo == "0" and cheevos_id == "0" and bordersSize is None:
+        if transparent:
+            _createTransparentHudBezel(overlay_png_file, overlay_info_file, gameResolution)
+        _logger.debug("applying bezel %s", overlay_png_file)
+        return overlay_png_file
+
+    # the final image only depends on these values, reuse it when it has already been generated
+    cache_key = (
+        ("transparent", gameResolution["width"], gameResolution["height"]) if transparent else file_signature(overlay_png_file),
+        gameResolution["width"],
+        gameResolution["height"],
+        bezel_stretch,
+        (
+            bezel_tattoo,
+            system.config.get('bezel.tattoo_corner', 'NW'),
+            system.config.get_bool("bezel.resize_tattoo", True),
+            file_signature(bezelsUtil.tattooPath(system)),
+        ) if bezel_tattoo != "0" else None,
+        (cheevos_id, system.config.get('bezel.qrcode_corner', 'NE')) if cheevos_id != "0" else None,
+        (bordersSize, bordersRatio, bezelsUtil.gunsBordersColorFomConfig(system.config)) if bordersSize is not None else None,
+    )
+    if (cached_png_file := bezelsUtil.getCachedBezel(cache_key)) is not None:
+        _logger.debug("applying bezel %s", cached_png_file)
+        return cached_png_file
+
+    if transparent:
+        _createTransparentHudBezel(overlay_png_file, overlay_info_file, gameResolution)
+
+    # the bezel is decoded once, each step works on the in-memory image and the result is encoded once
+    bezel_image = bezelsUtil.openBezelImage(overlay_png_file)
+
+    if needs_resize:
         _logger.debug("bezel needs to be resized")
-        output_png_file = Path("/tmp/bezel.png")
         try:
-            bezelsUtil.resizeImage(overlay_png_file, output_png_file, gameResolution["width"], gameResolution["height"], bezel_stretch)
+            bezel_image = bezelsUtil.resizeBezelImage(bezel_image, gameResolution["width"], gameResolution["height"], bezel_stretch)
         except Exception as e:
             _logger.error("failed to resize the image %s", e)
             return None
-        overlay_png_file = output_png_file
 
     if bezel_tattoo != "0":
-        output_png_file = Path("/tmp/bezel_tattooed.png")
-        bezelsUtil.tatooImage(overlay_png_file, output_png_file, system)
-        overlay_png_file = output_png_file
+        bezel_image = bezelsUtil.tattooBezelImage(bezel_image, system)
 
-    if bezel_qrcode != "0" and (cheevos_id := system.es_game_info.get("cheevosId", "0")) != "0":
-        output_png_file = Path("/tmp/bezel_qrcode.png")
-        bezelsUtil.addQRCode(overlay_png_file, output_png_file, cheevos_id, system)
-        overlay_png_file = output_png_file
+    if cheevos_id != "0":
+        bezel_image = bezelsUtil.addQRCodeToBezelImage(bezel_image, cheevos_id, system)
 
     # borders
     if bordersSize is not None:
         _logger.debug("Draw gun borders")
-        output_png_file = Path("/tmp/bezel_gunborders.png")
         innerSize, outerSize = bezelsUtil.gunBordersSize(bordersSize)
         _logger.debug("Gun border ratio = %s", bordersRatio)
-        bezelsUtil.gunBorderImage(overlay_png_file, output_png_file, bordersRatio, innerSize, outerSize, bezelsUtil.gunsBordersColorFomConfig(system.config))
-        overlay_png_file = output_png_file
+        bezel_image, _ = bezelsUtil.gunBorderBezelImage(bezel_image, bordersRatio, innerSize, outerSize, bezelsUtil.gunsBordersColorFomConfig(system.config))
+
+    overlay_png_file = Path("/tmp/bezel.png")
+    bezelsUtil.saveBezelImage(bezel_image, overlay_png_file)
+
+    bezelsUtil.cacheBezel(cache_key, overlay_png_file)
 
     _logger.debug("applying bezel %s", overlay_png_file)
     return overlay_png_file
 
-def callExternalScripts(folder: Path, event: str, args: Iterable[str | Path]) -> None:
-    if not folder.is_dir():
-        return
+def _reset_mouse() -> None:
+    try:
+        outputs = videoMode.getScreens()
 
-    for file in folder.iterdir():
-        if file.is_dir():
-            callExternalScripts(file, event, args)
+        if len(outputs) > 1:
+            _logger.debug("Multiple displays detected (%s). Resetting mouse to primary display", ", ".join(outputs))
+            subprocess.call(["/usr/bin/hotkeygen", "--reset-mouse"])
         else:
-            if os.access(file, os.X_OK):
-                _logger.debug("calling external script: %s", [file, event, *args])
-                subprocess.call([file, event, *args])
+            _logger.debug("Single display detected (%s). Skipping mouse reset to keep cursor hidden", ", ".join(outputs) if outputs else "default")
+    except Exception as e:
+        _logger.warning("Failed to check display count or reset mouse: %s", e)
+
+def _generate_gun_help(system: Emulator, rom: Path, guns: GunList, gameResolution: Resolution) -> None:
+    default_gun_help_dir = Path("/var/run/batocera-overlays")
+
+    if not system.config.use_guns and not guns:
+        # no help to show: only remove the one of a previous game, without loading PIL
+        (default_gun_help_dir / "gun_help.png").unlink(missing_ok=True)
+        return
+
+    try:
+        from .utils import bezels as bezelsUtil
+
+        bezelsUtil.generate_gun_help(system.name, rom, system.config.use_guns, guns, default_gun_help_dir, "gun_help.png", gameResolution)
+    except Exception as e:
+        _logger.error("Failed to generate the gun help image")
+        _logger.error(e)
 
 def hudConfig_protectStr(string: str | Path | None) -> str:
     if string is None:
@@ -585,125 +666,16 @@ def getHudConfig(
     configstr = configstr.replace("%EMULATORCORE%", hudConfig_protectStr(emulatorstr))
     return configstr.replace("%THUMBNAIL%", hudConfig_protectStr(gameThumbnail))
 
-def _reconfigure_evmapy_on_the_fly():
-    # Re-runs the evmapy configuration by creating a NEW evmapy instance with the latest controller list.
-    global _evmapy_instance, _active_player_controllers
-
+def _on_controllers_changed(changes: dict[int, Controller | None]) -> None:
+    # Called by the hotplug monitor with the players whose controller was connected or disconnected:
+    # only the evmapy configuration of these devices is rewritten.
     with _player_controllers_lock:
-        if not _evmapy_instance:
-            return
-
-        _logger.info(">>> --- STARTING EVMAPY RECONFIGURATION ---")
-
-        valid_controllers = [c for c in _active_player_controllers if c is not None]
-        _logger.info(">>> Found %s valid controllers to configure.", len(valid_controllers))
-        for c in valid_controllers:
-            _logger.info(">>>   - Configuring P%s with Path: %s", c.player_number, c.device_path)
-
-        new_evmapy_instance = evmapy(
-            system=_evmapy_instance.system,
-            emulator=_evmapy_instance.emulator,
-            core=_evmapy_instance.core,
-            rom=_evmapy_instance.rom,
-            controllers=deepcopy(valid_controllers),
-            guns=_evmapy_instance.guns
-        )
-
-        _evmapy_instance = new_evmapy_instance
+        _active_player_controllers.update(changes)
 
-        subprocess.call(['batocera-evmapy', 'stop'])
-        time.sleep(0.5)
-        cast('Any', _evmapy_instance)._evmapy__prepare()
-        subprocess.call(['batocera-evmapy', 'start'])
+        if _evmapy_instance is not None:
+            _evmapy_instance.update_controllers(changes)
 
-        _logger.info(">>> --- EVMAPY RECONFIGURATION COMPLETE ---")
-
-
-def _controller_monitor_thread():
-    # Runs in the background, watching for controller add/remove events.
-    # Uses pysdl2 to reliably get controller GUIDs and paths, then intelligently "revives"
-    # the original controller object to preserve player order without disrupting the emulator.
-    global _active_player_controllers
-
-    initial_controllers_snapshot = []
-    with _player_controllers_lock:
-        initial_controllers_snapshot = deepcopy(_active_player_controllers)
-        for i, p_controller in enumerate(initial_controllers_snapshot):
-            if p_controller and p_controller.guid:
-                _logger.info(">>>   [P%s] Stored GUID: %s, Initial Path: %s", i+1, p_controller.guid, p_controller.device_path)
-
-    we_initialized_sdl = False
-    try:
-        if sdl2.SDL_WasInit(sdl2.SDL_INIT_JOYSTICK) == 0:
-            _logger.info(">>> SDL2 joystick subsystem not initialized. Initializing it now.")
-            sdl2.SDL_Init(sdl2.SDL_INIT_JOYSTICK)
-            we_initialized_sdl = True
-        else:
-            _logger.info(">>> SDL2 joystick subsystem already initialized by host (emulator). Will not re-initialize.")
-    except Exception as e:
-        _logger.error("FATAL: Could not initialize pysdl2 for controller monitoring: %s", e)
-        return
-
-    context = pyudev.Context()
-    monitor = pyudev.Monitor.from_netlink(context)
-    monitor.filter_by(subsystem='input')
-
-    _logger.info(">>> Starting background controller monitor.")
-    for device in iter(monitor.poll, None):
-        if device.properties.get('ID_INPUT_JOYSTICK') != '1':
-            continue
-
-        _logger.info("--- Joystick Event Detected: %s on %s ---", device.action, device.sys_path)
-        reconfigure_needed = False
-
-        sdl2.SDL_JoystickUpdate()
-        online_controllers_map = {}
-        for i in range(sdl2.SDL_NumJoysticks()):
-            try:
-                guid_struct = sdl2.SDL_JoystickGetDeviceGUID(i)
-                guid_str_buffer = (ctypes.c_char * 33)()
-                sdl2.SDL_JoystickGetGUIDString(guid_struct, guid_str_buffer, 33)
-                guid = guid_str_buffer.value.decode('utf-8')
-
-                path_bytes = sdl2.SDL_JoystickPathForIndex(i)
-                path = path_bytes.decode('utf-8') if path_bytes else None
-
-                if guid and path:
-                    online_controllers_map[guid] = path
-            except Exception as e:
-                _logger.warning("Error while querying joystick index %s with pysdl2: %s", i, e)
-
-        _logger.info(">>> [Check 1] Pysdl2 scan found online controllers: %s", online_controllers_map)
-
-        with _player_controllers_lock:
-            new_active_controllers: list[Controller | None] = [None] * len(initial_controllers_snapshot)
-
-            for i, initial_controller in enumerate(initial_controllers_snapshot):
-                if initial_controller and initial_controller.guid in online_controllers_map:
-                    new_path = online_controllers_map[initial_controller.guid]
-                    if initial_controller.device_path != new_path:
-                        _logger.info(">>> [Revival] Player %s (GUID: %s) path has changed.", initial_controller.player_number, initial_controller.guid)
-                        initial_controller.device_path = new_path
-                    new_active_controllers[i] = initial_controller
-
-            current_paths = [c.device_path if c else None for c in _active_player_controllers]
-            new_paths = [c.device_path if c else None for c in new_active_controllers]
-
-            if current_paths != new_paths:
-                _logger.info(">>> [Check 2] Controller state changed. Old Paths: %s. New Paths: %s", current_paths, new_paths)
-                _active_player_controllers = new_active_controllers
-                reconfigure_needed = True
-            else:
-                _logger.info(">>> [Check 2] No change in assigned controller paths detected.")
-
-        if reconfigure_needed:
-            time.sleep(1)
-            _reconfigure_evmapy_on_the_fly()
-
-    if we_initialized_sdl:
-        sdl2.SDL_QuitSubSystem(sdl2.SDL_INIT_JOYSTICK)
-
-def runCommand(command: Command) -> int:
+def runCommand(command: Command, *, streaming: bool = True) -> int:
     global proc
 
     # compute environment : first the current envs, then override by values set at generator level
@@ -722,10 +694,19 @@ def runCommand(command: Command) -> int:
     exitcode = 0
 
     try:
-        out, err = proc.communicate()
-        exitcode = proc.returncode
-        _logger.debug(out.decode(errors='backslashreplace'))
-        _logger.error(err.decode(errors='backslashreplace'))
+        if streaming:
+            # the output is drained while the emulator runs: only its tail is kept in memory
+            assert proc.stdout is not None and proc.stderr is not None
+            stdout_capture = OutputCapture(proc.stdout, LOGS / 'emulator_stdout.log', tail_bytes=_EMULATOR_OUTPUT_TAIL_BYTES)
+            stderr_capture = OutputCapture(proc.stderr, LOGS / 'emulator_stderr.log', tail_bytes=_EMULATOR_OUTPUT_TAIL_BYTES)
+            exitcode = proc.wait()
+            out, err = stdout_capture.join(), stderr_capture.join()
+        else:
+            out_bytes, err_bytes = proc.communicate()
+            exitcode = proc.returncode
+            out, err = out_bytes.decode(errors='backslashreplace'), err_bytes.decode(errors='backslashreplace')
+        _logger.debug(out)
+        _logger.error(err)
     except BrokenPipeError:
         # Seeing BrokenPipeError? This is probably caused by head truncating output in the front-end
         # Examine es-core/src/platform.cpp::runSystemCommand for additional context
@@ -744,8 +725,22 @@ def signal_handler(signal: int, frame: FrameType | None):
         _logger.debug('killing proc')
         proc.kill()
 
+def _logging_settings() -> dict[str, Any]:
+    # read before the Emulator configuration, as the logging is set up first
+    settings = UnixSettings(BATOCERA_CONF, cached=True).config
+
+    return {
+        # configgen.log_level=info skips the (large) debug records entirely
+        'level': logging.getLevelNamesMapping().get(
+            settings.get('DEFAULT', 'configgen.log_level', fallback='debug').upper(), logging.DEBUG
+        ),
+        'json_lines': settings.get('DEFAULT', 'configgen.log_format', fallback='text') == 'json',
+        # off by default: the records still queued when configgen is killed are lost
+        'queued': settings.get('DEFAULT', 'configgen.log_queue', fallback='0') == '1',
+    }
+
 def launch() -> None:
-    with setup_logging():
+    with setup_logging(**_logging_settings()):
         global proc
         proc = None
         signal.signal(signal.SIGINT, signal_handler)
@@ -754,6 +749,7 @@ def launch() -> None:
         if (version_file := BATOCERA_SHARE_DIR / 'batocera.version').exists():
             batocera_version = version_file.read_text().strip()
         _logger.info('Batocera version: %s', batocera_version)
+        profiler.set_trace_metadata(version=batocera_version)
 
         parser = argparse.ArgumentParser(description='emulator-launcher script')
 
@@ -787,6 +783,7 @@ def launch() -> None:
         parser.add_argument("-spinner",        help="configure spinner",           action="store_true")
 
         args = parser.parse_args()
+        profiler.set_trace_metadata(system=args.system, rom=args.rom, emulator=args.emulator, core=args.core)
         exitcode = 0
         try:
             exitcode = main(args, maxnbplayers)
@@ -800,6 +797,7 @@ def launch() -> None:
             _logger.exception("configgen exception: ")
 
         profiler.stop()
+        profiler.write_trace()
 
         time.sleep(1) # this seems to be required so that the gpu memory is restituated and available for es
 
@@ -135,13 +135,8 @@ def createLibretroConfig(
     # retroarch-core-options.cfg
     mkdir_if_not_exists(RETROARCH_CORE_CUSTOM.parent)
 
-    try:
-        coreSettings = UnixSettings(RETROARCH_CORE_CUSTOM, separator=' ')
-    except UnicodeError:
-        # invalid retroarch-core-options.cfg
-        # remove it and try again
-        RETROARCH_CORE_CUSTOM.unlink()
-        coreSettings = UnixSettings(RETROARCH_CORE_CUSTOM, separator=' ')
+    # deferred: the file is only read and written again when the core settings changed
+    coreSettings = UnixSettings(RETROARCH_CORE_CUSTOM, separator=' ', deferred=True)
 
     # Create/update retroarch-core-options.cfg
     libretroOptions.generateCoreSettings(coreSettings, system, rom, guns, wheels)
@@ -845,7 +840,13 @@ def createLibretroConfig(
         retroarchConfig['input_overlay_show_mouse_cursor'] = "true"
 
     # write coreSettings a bit late while guns configs can modify it
-    coreSettings.write()
+    try:
+        coreSettings.write()
+    except UnicodeError:
+        # invalid retroarch-core-options.cfg
+        # remove it and try again
+        RETROARCH_CORE_CUSTOM.unlink()
+        coreSettings.write()
 
     # Bezel option
     try:
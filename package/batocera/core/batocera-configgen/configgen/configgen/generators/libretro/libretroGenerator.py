@@ -22,6 +22,7 @@ from ...batoceraPaths import (
 from ...exceptions import BatoceraException, MissingCore
 from ...settings.unixSettings import UnixSettings
 from ...utils import videoMode as videoMode
+from ...utils.cache import file_signature
 from ..Generator import Generator
 from . import libretroConfig, libretroControllers, libretroRetroarchCustom
 from .libretroPaths import (
@@ -101,7 +102,8 @@ class LibretroGenerator(Generator):
             if not RETROARCH_CUSTOM.is_file():
                 libretroRetroarchCustom.generateRetroarchCustom()
             #  Write controllers configuration files
-            retroconfig = UnixSettings(RETROARCH_CUSTOM, separator=' ')
+            # deferred: the file is only read and written again when the generated settings changed
+            retroconfig = UnixSettings(RETROARCH_CUSTOM, separator=' ', deferred=True)
 
             if 'lightgun_map' in system.config:
                 lightgun = system.config.get_bool('lightgun_map')
@@ -118,12 +120,15 @@ class LibretroGenerator(Generator):
                 bezel = None
 
             libretroConfig.writeLibretroConfig(self, retroconfig, system, playersControllers, metadata, guns, wheels, rom, bezel, shaderBezel, gameResolution, gfxBackend)
-            retroconfig.write()
+            written = retroconfig.write()
 
             # duplicate config to mapping files while ra now split in 2 parts
             remapconfigDir = RETROARCH_CONFIG / "config" / "remaps" / "common"
-            mkdir_if_not_exists(remapconfigDir)
-            shutil.copyfile(RETROARCH_CUSTOM, remapconfigDir / "common.rmp")
+            remapconfigFile = remapconfigDir / "common.rmp"
+            # the copy keeps the mtime of the config, an up to date copy has the same mtime and size
+            if written or file_signature(RETROARCH_CUSTOM)[0][1:] != file_signature(remapconfigFile)[0][1:]:
+                mkdir_if_not_exists(remapconfigDir)
+                shutil.copy2(RETROARCH_CUSTOM, remapconfigFile)
 
         # Retroarch core on the filesystem
         retroarchCore = RETROARCH_CORES / f"{system.config.core}_libretro.so"
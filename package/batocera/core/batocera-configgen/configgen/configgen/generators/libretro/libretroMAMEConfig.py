@@ -1,21 +1,23 @@
 from __future__ import annotations
 
-import codecs
 import csv
 import logging
-import os
 import shutil
 import xml.etree.ElementTree as ET
 import zipfile
 from pathlib import Path
-from typing import TYPE_CHECKING
-from xml.dom import minidom
+from typing import TYPE_CHECKING, Any
 
 from ...batoceraPaths import BIOS, CONFIGS, DEFAULTS_DIR, ROMS, SAVES, USER_DECORATIONS, mkdir_if_not_exists
+from ...exceptions import BatoceraException
 from ..mame.mameCommon import is_atom_floppy
+from ..mame.mameConfigFile import get_section, load_config, remove_sections, write_config
+from ..mame.mamePaths import MAME_HASH
+from ..mame.mameSoftwareList import get_software
+from ..mame.mameTables import get_controls, get_game_list, get_mess_controls, get_mess_system
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Mapping, Sequence
 
     from ...controller import Controller, Controllers
     from ...Emulator import Emulator
@@ -85,7 +87,7 @@ def generateMAMEConfigs(playersControllers: Controllers, system: Emulator, rom:
             pluginsToLoad += [ "offscreenreload" ]
         if pluginsToLoad:
             commandLine += [ "-plugins", "-plugin", ",".join(pluginsToLoad) ]
-        messMode = -1
+        messSystem = None
         messModel = ''
     else:
         # Set up command line for MESS or MAMEVirtual
@@ -101,27 +103,17 @@ def generateMAMEConfigs(playersControllers: Controllers, system: Emulator, rom:
             softList = 'fmtowns_cd'
 
         # Determine MESS system name (if needed)
-        openFile = (DEFAULTS_DIR / "data" / "mame" / "messSystems.csv").open()
-        messSystems: list[str] = []
-        messSysName: list[str] = []
-        messRomType: list[str] = []
-        messAutoRun: list[str] = []
-        with openFile:
-            messDataList = csv.reader(openFile, delimiter=';', quotechar="'")
-            for row in messDataList:
-                messSystems.append(row[0])
-                messSysName.append(row[1])
-                messRomType.append(row[2])
-                messAutoRun.append(row[3])
-        messMode = messSystems.index(system.name)
+        messSystem = get_mess_system(system.name)
+        if messSystem is None:
+            raise BatoceraException(f"Unknown MESS system {system.name}")
 
         # Alternate system for machines that have different configs (ie computers with different hardware)
-        messModel = messSysName[messMode]
+        messModel = messSystem.model
         if altmodel := system.config.get("altmodel"):
             messModel = altmodel
         commandLine += [ messModel ]
 
-        if messSysName[messMode] == "":
+        if messSystem.model == "":
             # Command line for non-arcade, non-system ROMs (lcdgames, plugnplay)
             if system.config.get_bool("customcfg"):
                 cfgPath = CONFIGS / corePath / "custom"
@@ -239,7 +231,7 @@ def generateMAMEConfigs(playersControllers: Controllers, system: Emulator, rom:
                         else:
                             commandLine += [ "-flop1" ]
                     else:
-                        commandLine += [ "-" + messRomType[messMode] ]
+                        commandLine += [ "-" + messSystem.rom_type ]
                 else:
                     if boot_disk:
                         if (altromtype == "flop1" or not altromtype) and boot_disk in [ "macos30", "macos608", "macos701", "macos75" ]:
@@ -247,12 +239,12 @@ def generateMAMEConfigs(playersControllers: Controllers, system: Emulator, rom:
                         elif altromtype:
                             commandLine += [ "-" + altromtype ]
                         else:
-                            commandLine += [ "-" + messRomType[messMode] ]
+                            commandLine += [ "-" + messSystem.rom_type ]
                     else:
                         if altromtype:
                             commandLine += [ "-" + altromtype ]
                         else:
-                            commandLine += [ "-" + messRomType[messMode] ]
+                            commandLine += [ "-" + messSystem.rom_type ]
                 # Use the full filename for MESS non-softlist ROMs
                 commandLine += [ f'"{rom}"' ]
                 commandLine += [ "-rompath", f'"{rom.parent};/userdata/bios/"' ]
@@ -298,11 +290,11 @@ def generateMAMEConfigs(playersControllers: Controllers, system: Emulator, rom:
 
             # MESS config folder
             if system.config.get_bool("customcfg"):
-                cfgPath = CONFIGS / corePath / messSysName[messMode] / "custom"
+                cfgPath = CONFIGS / corePath / messSystem.model / "custom"
             else:
-                cfgPath = SAVES / "mame" / "cfg" / messSysName[messMode]
+                cfgPath = SAVES / "mame" / "cfg" / messSystem.model
             if system.config.get_bool("pergamecfg"):
-                cfgPath = CONFIGS / corePath / messSysName[messMode] / rom.name
+                cfgPath = CONFIGS / corePath / messSystem.model / rom.name
             mkdir_if_not_exists(cfgPath)
             commandLine += [ '-cfg_directory', f'"{cfgPath}"' ]
 
@@ -340,15 +332,8 @@ def generateMAMEConfigs(playersControllers: Controllers, system: Emulator, rom:
                 autoRunDelay = 2
 
                 # if using software list, use "usage" for autoRunCmd (if provided)
-                if softList != "":
-                    softListFile = Path(f'/usr/bin/mame/hash/{softList}.xml')
-                    if softListFile.exists():
-                        softwarelist = ET.parse(softListFile)
-                        for software in softwarelist.findall('software'):
-                            if software.attrib and software.get('name') == romDrivername:
-                                for info in software.iter('info'):
-                                    if info.get('name') == 'usage':
-                                        autoRunCmd = f'{info.get('value')}\\n'
+                if softList != "" and (software := get_software(softList, romDrivername)) and software.usage is not None:
+                    autoRunCmd = f'{software.usage}\\n'
 
                 # if still undefined, default autoRunCmd based on media type
                 if autoRunCmd == "":
@@ -375,7 +360,7 @@ def generateMAMEConfigs(playersControllers: Controllers, system: Emulator, rom:
                                 autoRunCmd = row[1] + "\\n"
             elif system.name == "atom":
                 autoRunDelay = 2
-                autoRunCmd = messAutoRun[messMode]
+                autoRunCmd = messSystem.autorun
                 if (
                     (altromtype == "flop1") or
                     (softList and softList.endswith("flop")) or
@@ -391,7 +376,7 @@ def generateMAMEConfigs(playersControllers: Controllers, system: Emulator, rom:
                                     break
             else:
                 # Check for an override file, otherwise use generic (if it exists)
-                autoRunCmd = messAutoRun[messMode]
+                autoRunCmd = messSystem.autorun
                 autoRunFile = DEFAULTS_DIR / 'data' / 'mame' / f'{softList}_autoload.csv'
                 if autoRunFile.exists():
                     with autoRunFile.open() as openARFile:
@@ -470,7 +455,7 @@ def generateMAMEConfigs(playersControllers: Controllers, system: Emulator, rom:
         cmdFile.close()
 
     # Call Controller Config
-    if messMode == -1:
+    if messSystem is None:
         generateMAMEPadConfig(cfgPath, playersControllers, system, "", rom, specialController, guns)
     else:
         generateMAMEPadConfig(cfgPath, playersControllers, system, messModel, rom, specialController, guns)
@@ -485,12 +470,20 @@ def prepSoftwareList(subdirSoftList: Sequence[str], softList: str, softDir: Path
             shutil.rmtree(checkFile)
     # Prepare hashfile path
     mkdir_if_not_exists(hashDir)
-    # Remove existing xml files
+    hashFile = MAME_HASH / f"{softList}.xml"
+    hashFileCopy = hashDir / f"{softList}.xml"
+    # Remove the other xml files
     for file in hashDir.iterdir():
-        if file.suffix == ".xml":
+        if file.suffix == ".xml" and file != hashFileCopy:
             file.unlink()
-    # Copy hashfile
-    shutil.copy2(Path("/usr/bin/mame/hash") / f"{softList}.xml", hashDir / f"{softList}.xml")
+    # Copy hashfile, unless the copy of the previous launch is still up to date
+    hashFileStat = hashFile.stat()
+    try:
+        hashFileCopyStat = hashFileCopy.stat()
+    except FileNotFoundError:
+        hashFileCopyStat = None
+    if hashFileCopyStat is None or (hashFileCopyStat.st_mtime_ns, hashFileCopyStat.st_size) != (hashFileStat.st_mtime_ns, hashFileStat.st_size):
+        shutil.copy2(hashFile, hashFileCopy)
     # Link ROM's parent folder if needed, ROM's folder otherwise
     if softList in subdirSoftList:
         (softDir / softList).symlink_to(romParent.parent, target_is_directory=True)
@@ -498,49 +491,33 @@ def prepSoftwareList(subdirSoftList: Sequence[str], softList: str, softDir: Path
         (softDir / softList).symlink_to(romParent, target_is_directory=True)
 
 def getMameControlScheme(system: Emulator, rom: Path) -> str:
-    # Game list files
-    mame_data_dir = DEFAULTS_DIR / 'data' / 'mame'
-    mameCapcom = mame_data_dir / 'mameCapcom.txt'
-    mameKInstinct = mame_data_dir / 'mameKInstinct.txt'
-    mameMKombat = mame_data_dir / 'mameMKombat.txt'
-    mameNeogeo = mame_data_dir / 'mameNeogeo.txt'
-    mameTwinstick = mame_data_dir / 'mameTwinstick.txt'
-    mameRotatedstick = mame_data_dir / 'mameRotatedstick.txt'
-
     # Controls for games with 5-6 buttons or other unusual controls
     controllerType = system.config.get("altlayout", "auto")
 
     if controllerType in [ "default", "neomini", "neocd", "twinstick", "qbert" ]:
         return controllerType
 
-    capcomList = set(mameCapcom.read_text().split())
-    mkList = set(mameMKombat.read_text().split())
-    kiList = set(mameKInstinct.read_text().split())
-    neogeoList = set(mameNeogeo.read_text().split())
-    twinstickList = set(mameTwinstick.read_text().split())
-    qbertList = set(mameRotatedstick.read_text().split())
-
-    romName = rom.stem
-    if romName in capcomList:
+    gameList = get_game_list(rom.stem)
+    if gameList == "capcom":
         if controllerType in [ "auto", "snes", "fightstick" ]:
             return "sfsnes"
         if controllerType == "megadrive":
             return "megadrive"
-    elif romName in mkList:
+    elif gameList == "mkombat":
         if controllerType in [ "auto", "snes", "fightstick" ]:
             return "mksnes"
         if controllerType == "megadrive":
             return "mkmegadrive"
-    elif romName in kiList:
+    elif gameList == "kinstinct":
         if controllerType in [ "auto", "snes", "fightstick" ]:
             return "kisnes"
         if controllerType == "megadrive":
             return "megadrive"
-    elif romName in  neogeoList:
+    elif gameList == "neogeo":
         return "neomini"
-    elif romName in  twinstickList:
+    elif gameList == "twinstick":
         return "twinstick"
-    elif romName in  qbertList:
+    elif gameList == "rotatedstick":
         return "qbert"
     else:
         if controllerType == "fightstick":
@@ -558,13 +535,8 @@ def generateMAMEPadConfig(
     guns: Guns,
 ) -> None:
     # config file
-    config = minidom.Document()
     configFile = cfgPath / "default.cfg"
-    if configFile.exists():
-        try:
-            config = minidom.parse(str(configFile))
-        except Exception:
-            pass # reinit the file
+    config = load_config(configFile)
 
     customCfg = system.config.get_bool('customcfg')
 
@@ -577,15 +549,8 @@ def generateMAMEPadConfig(
     # Get controller scheme
     altButtons = getMameControlScheme(system, rom)
 
-    # Load standard controls from csv
-    controlFile = DEFAULTS_DIR / 'data' / 'mame' / 'mameControls.csv'
-    controlDict: dict[str, dict[str, str]] = {}
-    with controlFile.open() as openFile:
-        controlList = csv.reader(openFile)
-        for row in controlList:
-            if row[0] not in controlDict:
-                controlDict[row[0]] = {}
-            controlDict[row[0]][row[1]] = row[2]
+    # Standard controls
+    controlDict = get_controls()
 
     # Common controls
     mappings: dict[str, str] = {}
@@ -597,16 +562,15 @@ def generateMAMEPadConfig(
         for controlDef in controlDict[altButtons]:
             mappings.update({controlDef: controlDict[altButtons][controlDef]})
 
-    xml_mameconfig = getRoot(config, "mameconfig")
-    xml_mameconfig.setAttribute("version", "10") # otherwise, config of pad won't work at first run (batocera v33)
-    xml_system = getSection(config, xml_mameconfig, "system")
-    xml_system.setAttribute("name", "default")
+    config.set("version", "10") # otherwise, config of pad won't work at first run (batocera v33)
+    xml_system = get_section(config, "system")
+    xml_system.set("name", "default")
 
-    removeSection(config, xml_system, "input")
-    xml_input = config.createElement("input")
-    xml_system.appendChild(xml_input)
+    remove_sections(xml_system, "input")
+    xml_input = ET.Element("input")
+    xml_system.append(xml_input)
 
-    messControlDict = {}
+    messControlDict: Mapping[str, Mapping[str, Mapping[str, Any]]] = {}
     if messSysName in [ "bbcb", "bbcm", "bbcm512", "bbcmc" ]:
         if specialController == 'none':
             useControls = "bbc"
@@ -620,8 +584,8 @@ def generateMAMEPadConfig(
     else:
         useControls = messSysName
 
-    config_alt: minidom.Document | None = None
-    xml_input_alt: minidom.Element | None = None
+    config_alt: ET.Element | None = None
+    xml_input_alt: ET.Element | None = None
     overwriteSystem = True
     configFile_alt: Path | None = None
 
@@ -630,85 +594,40 @@ def generateMAMEPadConfig(
     specialControlList = [ "cdimono1", "apfm1000", "astrocde", "adam", "arcadia", "gamecom", "tutor", "crvision", "bbcb", "bbcm", "bbcm512", "bbcmc", "xegs", \
         "socrates", "vgmplay", "pdp1", "vc4000", "fmtmarty", "gp32", "apple2p", "apple2e", "apple2ee" ]
     if messSysName in specialControlList:
-        # Load mess controls from csv
-        messControlFile = DEFAULTS_DIR / 'data' / 'mame' / 'messControls.csv'
-        with messControlFile.open() as openMessFile:
-            controlList = csv.reader(openMessFile, delimiter=';')
-            for row in controlList:
-                if row[0] not in messControlDict:
-                    messControlDict[row[0]] = {}
-                messControlDict[row[0]][row[1]] = {}
-                currentEntry = messControlDict[row[0]][row[1]]
-                currentEntry['type'] = row[2]
-                currentEntry['player'] = int(row[3])
-                currentEntry['tag'] = row[4]
-                currentEntry['key'] = row[5]
-                if currentEntry['type'] in [ 'special', 'main' ]:
-                    currentEntry['mapping'] = row[6]
-                    currentEntry['useMapping'] = row[7]
-                    currentEntry['reversed'] = row[8]
-                    currentEntry['mask'] = row[9]
-                    currentEntry['default'] = row[10]
-                elif currentEntry['type'] == 'analog':
-                    currentEntry['incMapping'] = row[6]
-                    currentEntry['decMapping'] = row[7]
-                    currentEntry['useMapping1'] = row[8]
-                    currentEntry['useMapping2'] = row[9]
-                    currentEntry['reversed'] = row[10]
-                    currentEntry['mask'] = row[11]
-                    currentEntry['default'] = row[12]
-                    currentEntry['delta'] = row[13]
-                    currentEntry['axis'] = row[14]
-                if currentEntry['type'] == 'combo':
-                    currentEntry['kbMapping'] = row[6]
-                    currentEntry['mapping'] = row[7]
-                    currentEntry['useMapping'] = row[8]
-                    currentEntry['reversed'] = row[9]
-                    currentEntry['mask'] = row[10]
-                    currentEntry['default'] = row[11]
-                if currentEntry['reversed'] == 'False':
-                    currentEntry['reversed'] = False
-                else:
-                    currentEntry['reversed'] = True
+        messControlDict = get_mess_controls()
 
-        config_alt = minidom.Document()
         configFile_alt = cfgPath / f"{messSysName}.cfg"
-        if configFile_alt.exists():
-            try:
-                config_alt = minidom.parse(str(configFile_alt))
-            except Exception:
-                pass # reinit the file
+        config_alt = load_config(configFile_alt)
 
         perGameCfg = system.config.get_bool('pergamecfg')
         if configFile_alt.exists() and (customCfg or perGameCfg):
             overwriteSystem = False
 
-        xml_mameconfig_alt = getRoot(config_alt, "mameconfig")
-        xml_mameconfig_alt.setAttribute("version", "10")
-        xml_system_alt = getSection(config_alt, xml_mameconfig_alt, "system")
-        xml_system_alt.setAttribute("name", messSysName)
+        config_alt.set("version", "10")
+        xml_system_alt = get_section(config_alt, "system")
+        xml_system_alt.set("name", messSysName)
 
-        removeSection(config_alt, xml_system_alt, "input")
-        xml_input_alt = config_alt.createElement("input")
-        xml_system_alt.appendChild(xml_input_alt)
+        remove_sections(xml_system_alt, "input")
+        xml_input_alt = ET.Element("input")
+        xml_system_alt.append(xml_input_alt)
 
         # Hide the LCD display on CD-i
         if useControls == "cdimono1":
-            removeSection(config_alt, xml_system_alt, "video")
-            xml_video_alt = config_alt.createElement("video")
-            xml_system_alt.appendChild(xml_video_alt)
+            remove_sections(xml_system_alt, "video")
+            xml_video_alt = ET.Element("video")
+            xml_system_alt.append(xml_video_alt)
 
-            xml_screencfg_alt = config_alt.createElement("target")
-            xml_screencfg_alt.setAttribute("index", "0")
-            xml_screencfg_alt.setAttribute("view", "Main Screen Standard (4:3)")
-            xml_video_alt.appendChild(xml_screencfg_alt)
+            xml_screencfg_alt = ET.Element("target")
+            xml_screencfg_alt.set("index", "0")
+            xml_screencfg_alt.set("view", "Main Screen Standard (4:3)")
+            xml_video_alt.append(xml_screencfg_alt)
 
         # If using BBC keyboard controls, enable keyboard to gamepad
         if useControls == 'bbc':
-            xml_kbenable_alt = config_alt.createElement("keyboard")
-            xml_kbenable_alt.setAttribute("tag", ":")
-            xml_kbenable_alt.setAttribute("enabled", "1")
-            xml_input_alt.appendChild(xml_kbenable_alt)
+            xml_kbenable_alt = ET.Element("keyboard")
+            xml_kbenable_alt.set("tag", ":")
+            xml_kbenable_alt.set("enabled", "1")
+            xml_input_alt.append(xml_kbenable_alt)
 
     # Don't configure pads if guns are present and "use_guns" is on
     if not (system.config.use_guns and guns):
@@ -724,53 +643,47 @@ def generateMAMEPadConfig(
             for mapping in mappings_use:
                 if mappings_use[mapping] in pad.inputs:
                     if mapping in [ 'START', 'COIN' ]:
-                        xml_input.appendChild(generateSpecialPortElement(pad, config, 'standard', nplayer, pad.index, mapping + str(nplayer), mappings_use[mapping], retroPad[mappings_use[mapping]], False, "", ""))
+                        xml_input.append(generateSpecialPortElement(pad, 'standard', nplayer, pad.index, mapping + str(nplayer), mappings_use[mapping], retroPad[mappings_use[mapping]], False, "", ""))
                     else:
-                        xml_input.appendChild(generatePortElement(pad, config, nplayer, pad.index, mapping, mappings_use[mapping], retroPad[mappings_use[mapping]], False, altButtons))
+                        xml_input.append(generatePortElement(pad, nplayer, pad.index, mapping, mappings_use[mapping], retroPad[mappings_use[mapping]], False, altButtons))
                 else:
                     rmapping = reverseMapping(mappings_use[mapping])
                     if rmapping in retroPad:
-                            xml_input.appendChild(generatePortElement(pad, config, nplayer, pad.index, mapping, mappings_use[mapping], retroPad[rmapping], True, altButtons))
+                            xml_input.append(generatePortElement(pad, nplayer, pad.index, mapping, mappings_use[mapping], retroPad[rmapping], True, altButtons))
 
             #UI Mappings
             if nplayer == 1:
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_DOWN", "DOWN", mappings_use["JOYSTICK_DOWN"], retroPad[mappings_use["JOYSTICK_DOWN"]], False, "", ""))      # Down
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_LEFT", "LEFT", mappings_use["JOYSTICK_LEFT"], retroPad[mappings_use["JOYSTICK_LEFT"]], False, "", ""))    # Left
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_UP", "UP", mappings_use["JOYSTICK_UP"], retroPad[mappings_use["JOYSTICK_UP"]], False, "", ""))            # Up
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_RIGHT", "RIGHT", mappings_use["JOYSTICK_RIGHT"], retroPad[mappings_use["JOYSTICK_RIGHT"]], False, "", "")) # Right
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_SELECT", "ENTER", 'a', retroPad['a'], False, "", ""))                                                     # Select
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_DOWN", "DOWN", mappings_use["JOYSTICK_DOWN"], retroPad[mappings_use["JOYSTICK_DOWN"]], False, "", ""))      # Down
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_LEFT", "LEFT", mappings_use["JOYSTICK_LEFT"], retroPad[mappings_use["JOYSTICK_LEFT"]], False, "", ""))    # Left
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_UP", "UP", mappings_use["JOYSTICK_UP"], retroPad[mappings_use["JOYSTICK_UP"]], False, "", ""))            # Up
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_RIGHT", "RIGHT", mappings_use["JOYSTICK_RIGHT"], retroPad[mappings_use["JOYSTICK_RIGHT"]], False, "", "")) # Right
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_SELECT", "ENTER", 'a', retroPad['a'], False, "", ""))                                                     # Select
 
             if useControls in messControlDict:
                 for controlDef in messControlDict[useControls]:
                     thisControl = messControlDict[useControls][controlDef]
                     if nplayer == thisControl['player'] and xml_input_alt is not None and config_alt is not None:
                         if thisControl['type'] == 'special':
-                            xml_input_alt.appendChild(generateSpecialPortElement(pad, config_alt, thisControl['tag'], nplayer, pad.index, thisControl['key'], thisControl['mapping'], \
+                            xml_input_alt.append(generateSpecialPortElement(pad, thisControl['tag'], nplayer, pad.index, thisControl['key'], thisControl['mapping'], \
                                 retroPad[mappings_use[thisControl['useMapping']]], thisControl['reversed'], thisControl['mask'], thisControl['default']))
                         elif thisControl['type'] == 'main':
-                            xml_input.appendChild(generateSpecialPortElement(pad, config_alt, thisControl['tag'], nplayer, pad.index, thisControl['key'], thisControl['mapping'], \
+                            xml_input.append(generateSpecialPortElement(pad, thisControl['tag'], nplayer, pad.index, thisControl['key'], thisControl['mapping'], \
                                 retroPad[mappings_use[thisControl['useMapping']]], thisControl['reversed'], thisControl['mask'], thisControl['default']))
                         elif thisControl['type'] == 'analog':
-                            xml_input_alt.appendChild(generateAnalogPortElement(pad, config_alt, thisControl['tag'], nplayer, pad.index, thisControl['key'], mappings_use[thisControl['incMapping']], \
+                            xml_input_alt.append(generateAnalogPortElement(pad, thisControl['tag'], nplayer, pad.index, thisControl['key'], mappings_use[thisControl['incMapping']], \
                                 mappings_use[thisControl['decMapping']], retroPad[mappings_use[thisControl['useMapping1']]], retroPad[mappings_use[thisControl['useMapping2']]], thisControl['reversed'], \
                                 thisControl['mask'], thisControl['default'], thisControl['delta'], thisControl['axis']))
                         elif thisControl['type'] == 'combo':
-                            xml_input_alt.appendChild(generateComboPortElement(pad, config_alt, thisControl['tag'], pad.index, thisControl['key'], thisControl['kbMapping'], thisControl['mapping'], \
+                            xml_input_alt.append(generateComboPortElement(pad, thisControl['tag'], pad.index, thisControl['key'], thisControl['kbMapping'], thisControl['mapping'], \
                                 retroPad[mappings_use[thisControl['useMapping']]], thisControl['reversed'], thisControl['mask'], thisControl['default']))
 
     # save the config file
-    #mameXml = open(configFile, "w")
-    # TODO: python 3 - workawround to encode files in utf-8
     if overwriteMAME:
-        with codecs.open(str(configFile), "w", "utf-8") as mameXml:
-            dom_string = os.linesep.join([s for s in config.toprettyxml().splitlines() if s.strip()]) # remove ugly empty lines while minicom adds them...
-            mameXml.write(dom_string)
+        write_config(configFile, config)
 
     # Write alt config (if used, custom config is turned off or file doesn't exist yet)
     if messSysName in specialControlList and overwriteSystem and config_alt is not None and configFile_alt is not None:
-        with codecs.open(str(configFile_alt), "w", "utf-8") as mameXml_alt:
-            dom_string_alt = os.linesep.join([s for s in config_alt.toprettyxml().splitlines() if s.strip()]) # remove ugly empty lines while minicom adds them...
-            mameXml_alt.write(dom_string_alt)
+        write_config(configFile_alt, config_alt)
 
 def reverseMapping(key: str) -> str | None:
     if key == "joystick1down":
@@ -783,74 +696,68 @@ def reverseMapping(key: str) -> str | None:
         return "joystick2left"
     return None
 
-def generatePortElement(pad: Controller, config: minidom.Document, nplayer: int, padindex: int, mapping: str, key: str, input: str, reversed: bool, altButtons: str):
+def generatePortElement(pad: Controller, nplayer: int, padindex: int, mapping: str, key: str, input: str, reversed: bool, altButtons: str):
     # Generic input
-    xml_port = config.createElement("port")
-    xml_port.setAttribute("type", f"P{nplayer}_{mapping}")
-    xml_newseq = config.createElement("newseq")
-    xml_newseq.setAttribute("type", "standard")
-    xml_port.appendChild(xml_newseq)
-    value = config.createTextNode(input2definition(pad, key, input, padindex + 1, reversed, altButtons))
-    xml_newseq.appendChild(value)
+    xml_port = ET.Element("port")
+    xml_port.set("type", f"P{nplayer}_{mapping}")
+    xml_newseq = ET.Element("newseq")
+    xml_newseq.set("type", "standard")
+    xml_port.append(xml_newseq)
+    xml_newseq.text = input2definition(pad, key, input, padindex + 1, reversed, altButtons)
     return xml_port
 
-def generateSpecialPortElement(pad: Controller, config: minidom.Document, tag: str, nplayer: int, padindex: int, mapping: str, key: str, input: str, reversed: bool, mask: str, default: str):
+def generateSpecialPortElement(pad: Controller, tag: str, nplayer: int, padindex: int, mapping: str, key: str, input: str, reversed: bool, mask: str, default: str):
     # Special button input (ie mouse button to gamepad)
-    xml_port = config.createElement("port")
-    xml_port.setAttribute("tag", tag)
-    xml_port.setAttribute("type", mapping)
-    xml_port.setAttribute("mask", mask)
-    xml_port.setAttribute("defvalue", default)
-    xml_newseq = config.createElement("newseq")
-    xml_newseq.setAttribute("type", "standard")
-    xml_port.appendChild(xml_newseq)
+    xml_port = ET.Element("port")
+    xml_port.set("tag", tag)
+    xml_port.set("type", mapping)
+    xml_port.set("mask", mask)
+    xml_port.set("defvalue", default)
+    xml_newseq = ET.Element("newseq")
+    xml_newseq.set("type", "standard")
+    xml_port.append(xml_newseq)
     txt = input2definition(pad, key, input, padindex + 1, reversed, 0)
     if mapping == "COIN" + str(nplayer) and nplayer == 1:
         txt = txt + f" OR KEYCODE_{nplayer}_F{nplayer + 11}" # f12 for player 1
-    value = config.createTextNode(txt)
-    xml_newseq.appendChild(value)
+    xml_newseq.text = txt
     return xml_port
 
-def generateComboPortElement(pad: Controller, config: minidom.Document, tag: str, padindex: int, mapping: str, kbkey: str, key: str, input: str, reversed: bool, mask: str, default: str):
+def generateComboPortElement(pad: Controller, tag: str, padindex: int, mapping: str, kbkey: str, key: str, input: str, reversed: bool, mask: str, default: str):
     # Maps a keycode + button - for important keyboard keys when available
-    xml_port = config.createElement("port")
-    xml_port.setAttribute("tag", tag)
-    xml_port.setAttribute("type", mapping)
-    xml_port.setAttribute("mask", mask)
-    xml_port.setAttribute("defvalue", default)
-    xml_newseq = config.createElement("newseq")
-    xml_newseq.setAttribute("type", "standard")
-    xml_port.appendChild(xml_newseq)
-    value = config.createTextNode(f"KEYCODE_{kbkey} OR " + input2definition(pad, key, input, padindex + 1, reversed, 0))
-    xml_newseq.appendChild(value)
+    xml_port = ET.Element("port")
+    xml_port.set("tag", tag)
+    xml_port.set("type", mapping)
+    xml_port.set("mask", mask)
+    xml_port.set("defvalue", default)
+    xml_newseq = ET.Element("newseq")
+    xml_newseq.set("type", "standard")
+    xml_port.append(xml_newseq)
+    xml_newseq.text = f"KEYCODE_{kbkey} OR " + input2definition(pad, key, input, padindex + 1, reversed, 0)
     return xml_port
 
-def generateAnalogPortElement(pad: Controller, config: minidom.Document, tag: str, nplayer: int, padindex: int, mapping: str, inckey: str, deckey: str, mappedinput: str, mappedinput2: str, reversed: bool, mask: str, default: str, delta: str, axis: str = ''):
+def generateAnalogPortElement(pad: Controller, tag: str, nplayer: int, padindex: int, mapping: str, inckey: str, deckey: str, mappedinput: str, mappedinput2: str, reversed: bool, mask: str, default: str, delta: str, axis: str = ''):
     # Mapping analog to digital (mouse, etc)
-    xml_port = config.createElement("port")
-    xml_port.setAttribute("tag", tag)
-    xml_port.setAttribute("type", mapping)
-    xml_port.setAttribute("mask", mask)
-    xml_port.setAttribute("defvalue", default)
-    xml_port.setAttribute("keydelta", delta)
-    xml_newseq_inc = config.createElement("newseq")
-    xml_newseq_inc.setAttribute("type", "increment")
-    xml_port.appendChild(xml_newseq_inc)
-    incvalue = config.createTextNode(input2definition(pad, inckey, mappedinput, padindex + 1, reversed, 0, True))
-    xml_newseq_inc.appendChild(incvalue)
-    xml_newseq_dec = config.createElement("newseq")
-    xml_port.appendChild(xml_newseq_dec)
-    xml_newseq_dec.setAttribute("type", "decrement")
-    decvalue = config.createTextNode(input2definition(pad, deckey, mappedinput2, padindex + 1, reversed, 0, True))
-    xml_newseq_dec.appendChild(decvalue)
-    xml_newseq_std = config.createElement("newseq")
-    xml_port.appendChild(xml_newseq_std)
-    xml_newseq_std.setAttribute("type", "standard")
+    xml_port = ET.Element("port")
+    xml_port.set("tag", tag)
+    xml_port.set("type", mapping)
+    xml_port.set("mask", mask)
+    xml_port.set("defvalue", default)
+    xml_port.set("keydelta", delta)
+    xml_newseq_inc = ET.Element("newseq")
+    xml_newseq_inc.set("type", "increment")
+    xml_port.append(xml_newseq_inc)
+    xml_newseq_inc.text = input2definition(pad, inckey, mappedinput, padindex + 1, reversed, 0, True)
+    xml_newseq_dec = ET.Element("newseq")
+    xml_port.append(xml_newseq_dec)
+    xml_newseq_dec.set("type", "decrement")
+    xml_newseq_dec.text = input2definition(pad, deckey, mappedinput2, padindex + 1, reversed, 0, True)
+    xml_newseq_std = ET.Element("newseq")
+    xml_port.append(xml_newseq_std)
+    xml_newseq_std.set("type", "standard")
     if axis == '':
-        stdvalue = config.createTextNode("NONE")
+        xml_newseq_std.text = "NONE"
     else:
-        stdvalue = config.createTextNode(f"JOYCODE_{padindex + 1}_{axis}")
-    xml_newseq_std.appendChild(stdvalue)
+        xml_newseq_std.text = f"JOYCODE_{padindex + 1}_{axis}"
     return xml_port
 
 def input2definition(pad: Controller, key: str, input: str, joycode: int, reversed: bool, altButtons: str | int, ignoreAxis: bool = False) -> str:
@@ -903,31 +810,3 @@ def input2definition(pad: Controller, key: str, input: str, joycode: int, revers
             return f"JOYCODE_{joycode}_{input}"
     return "unknown"
 
-def getRoot(config: minidom.Document, name: str, /) -> minidom.Element:
-    xml_section = config.getElementsByTagName(name)
-
-    if len(xml_section) == 0:
-        xml_section = config.createElement(name)
-        config.appendChild(xml_section)
-    else:
-        xml_section = xml_section[0]
-
-    return xml_section
-
-def getSection(config: minidom.Document, xml_root: minidom.Element, name: str, /) -> minidom.Element:
-    xml_section = xml_root.getElementsByTagName(name)
-
-    if len(xml_section) == 0:
-        xml_section = config.createElement(name)
-        xml_root.appendChild(xml_section)
-    else:
-        xml_section = xml_section[0]
-
-    return xml_section
-
-def removeSection(config: minidom.Document, xml_root: minidom.Element, name: str, /) -> None:
-    xml_section = xml_root.getElementsByTagName(name)
-
-    for i in range(len(xml_section)):
-        old = xml_root.removeChild(xml_section[i])
-        old.unlink()
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import logging
+import xml.etree.ElementTree as ET
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_logger = logging.getLogger(__name__)
+
+
+def load_config(config_file: Path, /) -> ET.Element:
+    """Returns the mameconfig element of a MAME cfg file, or a new one if the file is missing or invalid."""
+    if config_file.exists():
+        # keep the comments in the mameconfig element
+        parser = ET.XMLParser(target=ET.TreeBuilder(insert_comments=True))
+        try:
+            root = ET.parse(config_file, parser).getroot()
+        except Exception:
+            pass # reinit the file
+        else:
+            if root.tag == "mameconfig":
+                return root
+
+    return ET.Element("mameconfig")
+
+
+def get_section(parent: ET.Element, name: str, /) -> ET.Element:
+    """Returns the first `name` element in `parent`, appended to it if there is none."""
+    if (section := parent.find(f".//{name}")) is None:
+        section = ET.SubElement(parent, name)
+
+    return section
+
+
+def remove_sections(parent: ET.Element, name: str, /) -> None:
+    for section in parent.findall(name):
+        parent.remove(section)
+
+
+def write_config(config_file: Path, config: ET.Element, /) -> None:
+    _logger.debug("Saving %s", config_file)
+    ET.indent(config, space="\t")
+    ET.ElementTree(config).write(config_file, encoding="utf-8", xml_declaration=True)
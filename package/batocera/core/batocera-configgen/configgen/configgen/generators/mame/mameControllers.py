@@ -1,13 +1,12 @@
 from __future__ import annotations
 
-import codecs
-import csv
 import logging
-import os
-from typing import TYPE_CHECKING
-from xml.dom import minidom
+import xml.etree.ElementTree as ET
+from typing import TYPE_CHECKING, Any
 
-from .mamePaths import MAME_CONFIG, MAME_DEFAULT_DATA
+from .mameConfigFile import get_section, load_config, remove_sections, write_config
+from .mamePaths import MAME_CONFIG
+from .mameTables import get_controls, get_mess_controls
 
 if TYPE_CHECKING:
     from collections.abc import Mapping
@@ -24,28 +23,15 @@ _logger = logging.getLogger(__name__)
 
 def generatePadsConfig(cfgPath: Path, playersControllers: Controllers, sysName: str, altButtons: MameControlScheme, customCfg: bool, specialController: str, decorations: str | None, useGuns: bool, guns: Guns, useWheels: bool, wheels: DeviceInfoMapping, useMouse: bool, multiMouse: bool, system: Emulator) -> None:
     # config file
-    config = minidom.Document()
     configFile = cfgPath / "default.cfg"
-    if configFile.exists():
-        try:
-            config = minidom.parse(str(configFile))
-        except Exception:
-            pass # reinit the file
+    config = load_config(configFile)
     if configFile.exists() and customCfg:
         overwriteMAME = False
     else:
         overwriteMAME = True
 
-    # Load standard controls from csv
-    controlFile = MAME_DEFAULT_DATA / 'mameControls.csv'
-    openFile = controlFile.open('r')
-    controlDict: dict[str, dict[str, str]] = {}
-    with openFile:
-        controlList = csv.reader(openFile)
-        for row in controlList:
-            if row[0] not in controlDict:
-                controlDict[row[0]] = {}
-            controlDict[row[0]][row[1]] = row[2]
+    # Standard controls
+    controlDict = get_controls()
 
     # Common controls
     mappings: dict[str, str] = {}
@@ -70,32 +56,31 @@ def generatePadsConfig(cfgPath: Path, playersControllers: Controllers, sysName:
         for controlDef in controlDict[altButtons]:
             mappings.update({controlDef: controlDict[altButtons][controlDef]})
 
-    xml_mameconfig = getRoot(config, "mameconfig")
-    xml_mameconfig.setAttribute("version", "10") # otherwise, config of pad won't work at first run (batocera v33)
-    xml_system     = getSection(config, xml_mameconfig, "system")
-    xml_system.setAttribute("name", "default")
+    config.set("version", "10") # otherwise, config of pad won't work at first run (batocera v33)
+    xml_system = get_section(config, "system")
+    xml_system.set("name", "default")
 
     # crosshairs
-    removeSection(config, xml_system, "crosshairs")
-    xml_crosshairs = config.createElement("crosshairs")
+    remove_sections(xml_system, "crosshairs")
+    xml_crosshairs = ET.Element("crosshairs")
     for p in range(4):
-        xml_crosshair = config.createElement("crosshair")
-        xml_crosshair.setAttribute("player", str(p))
+        xml_crosshair = ET.Element("crosshair")
+        xml_crosshair.set("player", str(p))
         mame_crosshair = system.config.get_str("mame_crosshair")
         if mame_crosshair == "enabled":
-            xml_crosshair.setAttribute("mode", "1")
+            xml_crosshair.set("mode", "1")
         elif mame_crosshair == "onmove":
             continue # keep no line
         else:
-            xml_crosshair.setAttribute("mode", "0")
-        xml_crosshairs.appendChild(xml_crosshair)
-    xml_system.appendChild(xml_crosshairs)
+            xml_crosshair.set("mode", "0")
+        xml_crosshairs.append(xml_crosshair)
+    xml_system.append(xml_crosshairs)
 
-    removeSection(config, xml_system, "input")
-    xml_input = config.createElement("input")
-    xml_system.appendChild(xml_input)
+    remove_sections(xml_system, "input")
+    xml_input = ET.Element("input")
+    xml_system.append(xml_input)
 
-    messControlDict = {}
+    messControlDict: Mapping[str, Mapping[str, Mapping[str, Any]]] = {}
     if sysName in [ "bbcb", "bbcm", "bbcm512", "bbcmc" ]:
         if specialController == 'none':
             useControls = "bbc"
@@ -110,8 +95,8 @@ def generatePadsConfig(cfgPath: Path, playersControllers: Controllers, sysName:
         useControls = sysName
     _logger.debug("Using %s for controller config.", useControls)
 
-    config_alt: minidom.Document | None = None
-    xml_input_alt: minidom.Element | None = None
+    config_alt: ET.Element | None = None
+    xml_input_alt: ET.Element | None = None
     overwriteSystem = True
     configFile_alt: Path | None = None
 
@@ -120,55 +105,10 @@ def generatePadsConfig(cfgPath: Path, playersControllers: Controllers, sysName:
     specialControlList = [ "cdimono1", "apfm1000", "astrocde", "adam", "arcadia", "gamecom", "tutor", "crvision", "bbcb", "bbcm", "bbcm512", "bbcmc", "xegs", \
         "socrates", "vgmplay", "pdp1", "vc4000", "fmtmarty", "gp32", "apple2p", "apple2e", "apple2ee" ]
     if sysName in specialControlList:
-        # Load mess controls from csv
-        messControlFile = MAME_DEFAULT_DATA / 'messControls.csv'
-        openMessFile = messControlFile.open('r')
-        with openMessFile:
-            controlList = csv.reader(openMessFile, delimiter=';')
-            for row in controlList:
-                if row[0] not in messControlDict:
-                    messControlDict[row[0]] = {}
-                messControlDict[row[0]][row[1]] = {}
-                currentEntry = messControlDict[row[0]][row[1]]
-                currentEntry['type'] = row[2]
-                currentEntry['player'] = int(row[3])
-                currentEntry['tag'] = row[4]
-                currentEntry['key'] = row[5]
-                if currentEntry['type'] in [ 'special', 'main' ]:
-                    currentEntry['mapping'] = row[6]
-                    currentEntry['useMapping'] = row[7]
-                    currentEntry['reversed'] = row[8]
-                    currentEntry['mask'] = row[9]
-                    currentEntry['default'] = row[10]
-                elif currentEntry['type'] == 'analog':
-                    currentEntry['incMapping'] = row[6]
-                    currentEntry['decMapping'] = row[7]
-                    currentEntry['useMapping1'] = row[8]
-                    currentEntry['useMapping2'] = row[9]
-                    currentEntry['reversed'] = row[10]
-                    currentEntry['mask'] = row[11]
-                    currentEntry['default'] = row[12]
-                    currentEntry['delta'] = row[13]
-                    currentEntry['axis'] = row[14]
-                if currentEntry['type'] == 'combo':
-                    currentEntry['kbMapping'] = row[6]
-                    currentEntry['mapping'] = row[7]
-                    currentEntry['useMapping'] = row[8]
-                    currentEntry['reversed'] = row[9]
-                    currentEntry['mask'] = row[10]
-                    currentEntry['default'] = row[11]
-                if currentEntry['reversed'] == 'False':
-                    currentEntry['reversed'] = False
-                else:
-                    currentEntry['reversed'] = True
+        messControlDict = get_mess_controls()
 
-        config_alt = minidom.Document()
         configFile_alt = cfgPath / f"{sysName}.cfg"
-        if (configFile_alt.exists() and cfgPath == (MAME_CONFIG / sysName)) or configFile_alt.exists():
-            try:
-                config_alt = minidom.parse(str(configFile_alt))
-            except Exception:
-                pass # reinit the file
+        config_alt = load_config(configFile_alt)
         if cfgPath == (MAME_CONFIG / sysName):
             perGameCfg = False
         else:
@@ -177,35 +117,34 @@ def generatePadsConfig(cfgPath: Path, playersControllers: Controllers, sysName:
         if configFile_alt.exists() and (customCfg or perGameCfg):
             overwriteSystem = False
 
-        xml_mameconfig_alt = getRoot(config_alt, "mameconfig")
-        xml_mameconfig_alt.setAttribute("version", "10")
-        xml_system_alt = getSection(config_alt, xml_mameconfig_alt, "system")
-        xml_system_alt.setAttribute("name", sysName)
+        config_alt.set("version", "10")
+        xml_system_alt = get_section(config_alt, "system")
+        xml_system_alt.set("name", sysName)
 
-        removeSection(config_alt, xml_system_alt, "input")
-        xml_input_alt = config_alt.createElement("input")
-        xml_system_alt.appendChild(xml_input_alt)
+        remove_sections(xml_system_alt, "input")
+        xml_input_alt = ET.Element("input")
+        xml_system_alt.append(xml_input_alt)
 
         # Hide the LCD display on CD-i
         if useControls == "cdimono1":
-            removeSection(config_alt, xml_system_alt, "video")
-            xml_video_alt = config_alt.createElement("video")
-            xml_system_alt.appendChild(xml_video_alt)
+            remove_sections(xml_system_alt, "video")
+            xml_video_alt = ET.Element("video")
+            xml_system_alt.append(xml_video_alt)
 
-            xml_screencfg_alt = config_alt.createElement("target")
-            xml_screencfg_alt.setAttribute("index", "0")
+            xml_screencfg_alt = ET.Element("target")
+            xml_screencfg_alt.set("index", "0")
             if decorations == "none":
-                xml_screencfg_alt.setAttribute("view", "Main Screen Standard (4:3)")
+                xml_screencfg_alt.set("view", "Main Screen Standard (4:3)")
             else:
-                xml_screencfg_alt.setAttribute("view", "Upright_Artwork")
-            xml_video_alt.appendChild(xml_screencfg_alt)
+                xml_screencfg_alt.set("view", "Upright_Artwork")
+            xml_video_alt.append(xml_screencfg_alt)
 
         # If using BBC keyboard controls, enable keyboard to gamepad
         if useControls == 'bbc':
-            xml_kbenable_alt = config_alt.createElement("keyboard")
-            xml_kbenable_alt.setAttribute("tag", ":")
-            xml_kbenable_alt.setAttribute("enabled", "1")
-            xml_input_alt.appendChild(xml_kbenable_alt)
+            xml_kbenable_alt = ET.Element("keyboard")
+            xml_kbenable_alt.set("tag", ":")
+            xml_kbenable_alt.set("enabled", "1")
+            xml_input_alt.append(xml_kbenable_alt)
 
     # Fill in controls on cfg files
     for nplayer, pad in enumerate(playersControllers, start=1):
@@ -231,7 +170,7 @@ def generatePadsConfig(cfgPath: Path, playersControllers: Controllers, sysName:
                 mappings_use["PEDAL2"] = "l2"
                 mappings_use["PADDLE"] = "joystick1left"
 
-        addCommonPlayerPorts(config, xml_input, nplayer)
+        addCommonPlayerPorts(xml_input, nplayer)
 
         ### find a keyboard key to simulate the action of the player (always like button 2) ; search in batocera.conf, else default config
         pedalsKeys = {1: "c", 2: "v", 3: "b", 4: "n"}
@@ -248,31 +187,31 @@ def generatePadsConfig(cfgPath: Path, playersControllers: Controllers, sysName:
             if mappings_use[mapping] in pad.inputs:
                 if mapping in [ 'START', 'COIN' ]:
                     # Generate the standard arcade mapping (e.g. START1, COIN1)
-                    xml_input.appendChild(generateSpecialPortElementPlayer(pad, config, 'standard', nplayer, pad.index, mapping, mappings_use[mapping], pad.inputs[mappings_use[mapping]], False, "", "", gunmappings, mousemappings, multiMouse, pedalkey))
+                    xml_input.append(generateSpecialPortElementPlayer(pad, 'standard', nplayer, pad.index, mapping, mappings_use[mapping], pad.inputs[mappings_use[mapping]], False, "", "", gunmappings, mousemappings, multiMouse, pedalkey))
                     # Generate the console/MESS mapping (e.g. P1_START, P1_SELECT)
                     console_type = f"P{nplayer}_START" if mapping == "START" else f"P{nplayer}_SELECT"
-                    xml_input.appendChild(generateSpecialPortElementPlayer(pad, config, 'standard', nplayer, pad.index, mapping, mappings_use[mapping], pad.inputs[mappings_use[mapping]], False, "", "", gunmappings, mousemappings, multiMouse, pedalkey, port_type=console_type))
+                    xml_input.append(generateSpecialPortElementPlayer(pad, 'standard', nplayer, pad.index, mapping, mappings_use[mapping], pad.inputs[mappings_use[mapping]], False, "", "", gunmappings, mousemappings, multiMouse, pedalkey, port_type=console_type))
                 else:
-                    xml_input.appendChild(generatePortElement(pad, config, nplayer, pad.index, mapping, mappings_use[mapping], pad.inputs[mappings_use[mapping]], False, altButtons, gunmappings, isWheel, mousemappings, multiMouse, pedalkey))
+                    xml_input.append(generatePortElement(pad, nplayer, pad.index, mapping, mappings_use[mapping], pad.inputs[mappings_use[mapping]], False, altButtons, gunmappings, isWheel, mousemappings, multiMouse, pedalkey))
             else:
                 rmapping = reverseMapping(mappings_use[mapping])
                 if rmapping in pad.inputs:
-                        xml_input.appendChild(generatePortElement(pad, config, nplayer, pad.index, mapping, mappings_use[mapping], pad.inputs[rmapping], True, altButtons, gunmappings, isWheel, mousemappings, multiMouse, pedalkey))
+                        xml_input.append(generatePortElement(pad, nplayer, pad.index, mapping, mappings_use[mapping], pad.inputs[rmapping], True, altButtons, gunmappings, isWheel, mousemappings, multiMouse, pedalkey))
 
         #UI Mappings
         if nplayer == 1:
             if hasStick(pad):
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_DOWN", "DOWN", mappings_use["JOYSTICK_DOWN"], pad.inputs[mappings_use["JOYSTICK_UP"]], False, "", ""))      # Down
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_LEFT", "LEFT", mappings_use["JOYSTICK_LEFT"], pad.inputs[mappings_use["JOYSTICK_LEFT"]], False, "", ""))    # Left
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_UP", "UP", mappings_use["JOYSTICK_UP"], pad.inputs[mappings_use["JOYSTICK_UP"]], False, "", ""))            # Up
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_RIGHT", "RIGHT", mappings_use["JOYSTICK_RIGHT"], pad.inputs[mappings_use["JOYSTICK_LEFT"]], False, "", "")) # Right
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_SELECT", "ENTER", 'b', pad.inputs['b'], False, "", ""))                                                     # Select
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_DOWN", "DOWN", mappings_use["JOYSTICK_DOWN"], pad.inputs[mappings_use["JOYSTICK_UP"]], False, "", ""))      # Down
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_LEFT", "LEFT", mappings_use["JOYSTICK_LEFT"], pad.inputs[mappings_use["JOYSTICK_LEFT"]], False, "", ""))    # Left
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_UP", "UP", mappings_use["JOYSTICK_UP"], pad.inputs[mappings_use["JOYSTICK_UP"]], False, "", ""))            # Up
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_RIGHT", "RIGHT", mappings_use["JOYSTICK_RIGHT"], pad.inputs[mappings_use["JOYSTICK_LEFT"]], False, "", "")) # Right
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_SELECT", "ENTER", 'b', pad.inputs['b'], False, "", ""))                                                     # Select
             else:
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_DOWN", "DOWN", mappings_use["JOYSTICK_DOWN"], pad.inputs[mappings_use["JOYSTICK_DOWN"]], False, "", ""))      # Down
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_LEFT", "LEFT", mappings_use["JOYSTICK_LEFT"], pad.inputs[mappings_use["JOYSTICK_LEFT"]], False, "", ""))    # Left
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_UP", "UP", mappings_use["JOYSTICK_UP"], pad.inputs[mappings_use["JOYSTICK_UP"]], False, "", ""))            # Up
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_RIGHT", "RIGHT", mappings_use["JOYSTICK_RIGHT"], pad.inputs[mappings_use["JOYSTICK_RIGHT"]], False, "", "")) # Right
-                xml_input.appendChild(generateComboPortElement(pad, config, 'standard', pad.index, "UI_SELECT", "ENTER", 'b', pad.inputs['b'], False, "", ""))                                                     # Select
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_DOWN", "DOWN", mappings_use["JOYSTICK_DOWN"], pad.inputs[mappings_use["JOYSTICK_DOWN"]], False, "", ""))      # Down
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_LEFT", "LEFT", mappings_use["JOYSTICK_LEFT"], pad.inputs[mappings_use["JOYSTICK_LEFT"]], False, "", ""))    # Left
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_UP", "UP", mappings_use["JOYSTICK_UP"], pad.inputs[mappings_use["JOYSTICK_UP"]], False, "", ""))            # Up
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_RIGHT", "RIGHT", mappings_use["JOYSTICK_RIGHT"], pad.inputs[mappings_use["JOYSTICK_RIGHT"]], False, "", "")) # Right
+                xml_input.append(generateComboPortElement(pad, 'standard', pad.index, "UI_SELECT", "ENTER", 'b', pad.inputs['b'], False, "", ""))                                                     # Select
 
         if useControls in messControlDict:
             for controlDef in messControlDict[useControls]:
@@ -292,13 +231,13 @@ def generatePadsConfig(cfgPath: Path, playersControllers: Controllers, sysName:
 
                             if key_to_use in pad.inputs:
                                 if thisControl['type'] == 'special':
-                                    xml_input_alt.appendChild(generateSpecialPortElement(pad, config_alt, thisControl['tag'], nplayer, pad.index, thisControl['key'], thisControl['mapping'], \
+                                    xml_input_alt.append(generateSpecialPortElement(pad, thisControl['tag'], nplayer, pad.index, thisControl['key'], thisControl['mapping'], \
                                         pad.inputs[key_to_use], reversed_flag, thisControl['mask'], thisControl['default'], pedalkey))
                                 elif thisControl['type'] == 'main':
-                                    xml_input.appendChild(generateSpecialPortElement(pad, config_alt, thisControl['tag'], nplayer, pad.index, thisControl['key'], thisControl['mapping'], \
+                                    xml_input.append(generateSpecialPortElement(pad, thisControl['tag'], nplayer, pad.index, thisControl['key'], thisControl['mapping'], \
                                         pad.inputs[key_to_use], reversed_flag, thisControl['mask'], thisControl['default'], pedalkey))
                                 elif thisControl['type'] == 'combo':
-                                    xml_input_alt.appendChild(generateComboPortElement(pad, config_alt, thisControl['tag'], pad.index, thisControl['key'], thisControl['kbMapping'], thisControl['mapping'], \
+                                    xml_input_alt.append(generateComboPortElement(pad, thisControl['tag'], pad.index, thisControl['key'], thisControl['kbMapping'], thisControl['mapping'], \
                                         pad.inputs[key_to_use], reversed_flag, thisControl['mask'], thisControl['default']))
 
                     elif thisControl['type'] == 'analog':
@@ -319,7 +258,7 @@ def generatePadsConfig(cfgPath: Path, playersControllers: Controllers, sysName:
                                     reversed_flag = True
 
                             if key_to_use1 in pad.inputs and key_to_use2 in pad.inputs:
-                                xml_input_alt.appendChild(generateAnalogPortElement(pad, config_alt, thisControl['tag'], nplayer, pad.index, thisControl['key'], mappings_use[thisControl['incMapping']], \
+                                xml_input_alt.append(generateAnalogPortElement(pad, thisControl['tag'], nplayer, pad.index, thisControl['key'], mappings_use[thisControl['incMapping']], \
                                     mappings_use[thisControl['decMapping']], pad.inputs[key_to_use1], pad.inputs[key_to_use2], reversed_flag, \
                                     thisControl['mask'], thisControl['default'], thisControl['delta'], thisControl['axis']))
 
@@ -336,27 +275,19 @@ def generatePadsConfig(cfgPath: Path, playersControllers: Controllers, sysName:
                 if gunnum in pedalsKeys:
                     pedalkey = pedalsKeys[gunnum]
             ###
-            addCommonPlayerPorts(config, xml_input, gunnum)
+            addCommonPlayerPorts(xml_input, gunnum)
             for mapping in gunmappings:
-                gun_port_element = generateGunPortElement(config, gunnum, mapping, gunmappings, pedalkey)
+                gun_port_element = generateGunPortElement(gunnum, mapping, gunmappings, pedalkey)
                 if gun_port_element is not None:
-                    xml_input.appendChild(gun_port_element)
+                    xml_input.append(gun_port_element)
 
     # save the config file
-    #mameXml = open(configFile, "w")
-    # TODO: python 3 - workawround to encode files in utf-8
     if overwriteMAME:
-        _logger.debug("Saving %s", configFile)
-        with codecs.open(str(configFile), "w", "utf-8") as mameXml:
-            dom_string = os.linesep.join([s for s in config.toprettyxml().splitlines() if s.strip()]) # remove ugly empty lines while minicom adds them...
-            mameXml.write(dom_string)
+        write_config(configFile, config)
 
     # Write alt config (if used, custom config is turned off or file doesn't exist yet)
     if sysName in specialControlList and overwriteSystem and config_alt is not None and configFile_alt is not None:
-        _logger.debug("Saving %s", configFile_alt)
-        with codecs.open(str(configFile_alt), "w", "utf-8") as mameXml_alt:
-            dom_string_alt = os.linesep.join([s for s in config_alt.toprettyxml().splitlines() if s.strip()]) # remove ugly empty lines while minicom adds them...
-            mameXml_alt.write(dom_string_alt)
+        write_config(configFile_alt, config_alt)
 
 def reverseMapping(key: str) -> str | None:
     if key == "joystick1down":
@@ -369,13 +300,13 @@ def reverseMapping(key: str) -> str | None:
         return "joystick2left"
     return None
 
-def generatePortElement(pad: Controller, config: minidom.Document, nplayer: int, padindex: int, mapping: str, key: str, input: Input, reversed: bool, altButtons: MameControlScheme, gunmappings: Mapping[str, str], isWheel: bool, mousemappings: Mapping[str, str], multiMouse: bool, pedalkey: str | None):
+def generatePortElement(pad: Controller, nplayer: int, padindex: int, mapping: str, key: str, input: Input, reversed: bool, altButtons: MameControlScheme, gunmappings: Mapping[str, str], isWheel: bool, mousemappings: Mapping[str, str], multiMouse: bool, pedalkey: str | None):
     # Generic input
-    xml_port = config.createElement("port")
-    xml_port.setAttribute("type", f"P{nplayer}_{mapping}")
-    xml_newseq = config.createElement("newseq")
-    xml_newseq.setAttribute("type", "standard")
-    xml_port.appendChild(xml_newseq)
+    xml_port = ET.Element("port")
+    xml_port.set("type", f"P{nplayer}_{mapping}")
+    xml_newseq = ET.Element("newseq")
+    xml_newseq.set("type", "standard")
+    xml_port.append(xml_newseq)
     keyval = input2definition(pad, key, input, padindex + 1, reversed, altButtons, False, isWheel)
     if mapping in gunmappings:
         keyval = keyval + f" OR GUNCODE_{nplayer}_{gunmappings[mapping]}"
@@ -386,20 +317,19 @@ def generatePortElement(pad: Controller, config: minidom.Document, nplayer: int,
             keyval = keyval + f" OR MOUSECODE_{nplayer}_{mousemappings[mapping]}"
         else:
             keyval = keyval + f" OR MOUSECODE_1_{mousemappings[mapping]}"
-    value = config.createTextNode(keyval)
-    xml_newseq.appendChild(value)
+    xml_newseq.text = keyval
     return xml_port
 
-def generateGunPortElement(config: minidom.Document, nplayer: int, mapping: str, gunmappings: Mapping[str, str], pedalkey: str | None):
+def generateGunPortElement(nplayer: int, mapping: str, gunmappings: Mapping[str, str], pedalkey: str | None):
     # Generic input
-    xml_port = config.createElement("port")
+    xml_port = ET.Element("port")
     if mapping in ["START", "COIN"]:
-        xml_port.setAttribute("type", mapping+str(nplayer))
+        xml_port.set("type", mapping+str(nplayer))
     else:
-        xml_port.setAttribute("type", f"P{nplayer}_{mapping}")
-    xml_newseq = config.createElement("newseq")
-    xml_newseq.setAttribute("type", "standard")
-    xml_port.appendChild(xml_newseq)
+        xml_port.set("type", f"P{nplayer}_{mapping}")
+    xml_newseq = ET.Element("newseq")
+    xml_newseq.set("type", "standard")
+    xml_port.append(xml_newseq)
     keyval = None
     if mapping in gunmappings:
         keyval = f"GUNCODE_{nplayer}_{gunmappings[mapping]}"
@@ -407,25 +337,24 @@ def generateGunPortElement(config: minidom.Document, nplayer: int, mapping: str,
             keyval += f" OR KEYCODE_{pedalkey.upper()}"
     if keyval is None:
         return None
-    value = config.createTextNode(keyval)
-    xml_newseq.appendChild(value)
+    xml_newseq.text = keyval
     return xml_port
 
-def generateSpecialPortElementPlayer(pad: Controller, config: minidom.Document, tag: str, nplayer: int, padindex: int, mapping: str, key: str, input: Input, reversed: bool, mask: str, default: str, gunmappings: Mapping[str, str], mousemappings: Mapping[str, str], multiMouse: bool, pedalkey: str | None, port_type: str | None = None):
+def generateSpecialPortElementPlayer(pad: Controller, tag: str, nplayer: int, padindex: int, mapping: str, key: str, input: Input, reversed: bool, mask: str, default: str, gunmappings: Mapping[str, str], mousemappings: Mapping[str, str], multiMouse: bool, pedalkey: str | None, port_type: str | None = None):
     # Special button input (ie mouse button to gamepad)
-    xml_port = config.createElement("port")
-    xml_port.setAttribute("tag", tag)
+    xml_port = ET.Element("port")
+    xml_port.set("tag", tag)
 
     # Use the custom port type if provided, otherwise default to START1/COIN1 style
     if port_type is None:
         port_type = mapping+str(nplayer)
-    xml_port.setAttribute("type", port_type)
+    xml_port.set("type", port_type)
 
-    xml_port.setAttribute("mask", mask)
-    xml_port.setAttribute("defvalue", default)
-    xml_newseq = config.createElement("newseq")
-    xml_newseq.setAttribute("type", "standard")
-    xml_port.appendChild(xml_newseq)
+    xml_port.set("mask", mask)
+    xml_port.set("defvalue", default)
+    xml_newseq = ET.Element("newseq")
+    xml_newseq.set("type", "standard")
+    xml_port.append(xml_newseq)
     keyval = input2definition(pad, key, input, padindex + 1, reversed, None)
     if mapping == "COIN" and nplayer <= 4:
         keyval = keyval + f" OR KEYCODE_{nplayer}_{nplayer + 4}" # 5 for player 1, 6 for player 2, 7 for player 3 and 8 for player 4
@@ -438,64 +367,58 @@ def generateSpecialPortElementPlayer(pad: Controller, config: minidom.Document,
             keyval = keyval + f" OR MOUSECODE_{nplayer}_{mousemappings[mapping]}"
         else:
             keyval = keyval + f" OR MOUSECODE_1_{mousemappings[mapping]}"
-    value = config.createTextNode(keyval)
-    xml_newseq.appendChild(value)
+    xml_newseq.text = keyval
     return xml_port
 
-def generateSpecialPortElement(pad: Controller, config: minidom.Document, tag: str, nplayer: int, padindex: int, mapping: str, key: str, input: Input, reversed: bool, mask: str, default: str, pedalkey: str | None):
+def generateSpecialPortElement(pad: Controller, tag: str, nplayer: int, padindex: int, mapping: str, key: str, input: Input, reversed: bool, mask: str, default: str, pedalkey: str | None):
     # Special button input (ie mouse button to gamepad)
-    xml_port = config.createElement("port")
-    xml_port.setAttribute("tag", tag)
-    xml_port.setAttribute("type", mapping)
-    xml_port.setAttribute("mask", mask)
-    xml_port.setAttribute("defvalue", default)
-    xml_newseq = config.createElement("newseq")
-    xml_newseq.setAttribute("type", "standard")
-    xml_port.appendChild(xml_newseq)
-    value = config.createTextNode(input2definition(pad, key, input, padindex + 1, reversed, None))
-    xml_newseq.appendChild(value)
+    xml_port = ET.Element("port")
+    xml_port.set("tag", tag)
+    xml_port.set("type", mapping)
+    xml_port.set("mask", mask)
+    xml_port.set("defvalue", default)
+    xml_newseq = ET.Element("newseq")
+    xml_newseq.set("type", "standard")
+    xml_port.append(xml_newseq)
+    xml_newseq.text = input2definition(pad, key, input, padindex + 1, reversed, None)
     return xml_port
 
-def generateComboPortElement(pad: Controller, config: minidom.Document, tag: str, padindex: int, mapping: str, kbkey: str, key: str, input: Input, reversed: bool, mask: str, default: str):
+def generateComboPortElement(pad: Controller, tag: str, padindex: int, mapping: str, kbkey: str, key: str, input: Input, reversed: bool, mask: str, default: str):
     # Maps a keycode + button - for important keyboard keys when available
-    xml_port = config.createElement("port")
-    xml_port.setAttribute("tag", tag)
-    xml_port.setAttribute("type", mapping)
-    xml_port.setAttribute("mask", mask)
-    xml_port.setAttribute("defvalue", default)
-    xml_newseq = config.createElement("newseq")
-    xml_newseq.setAttribute("type", "standard")
-    xml_port.appendChild(xml_newseq)
-    value = config.createTextNode(f"KEYCODE_{kbkey} OR {input2definition(pad, key, input, padindex + 1, reversed, None)}")
-    xml_newseq.appendChild(value)
+    xml_port = ET.Element("port")
+    xml_port.set("tag", tag)
+    xml_port.set("type", mapping)
+    xml_port.set("mask", mask)
+    xml_port.set("defvalue", default)
+    xml_newseq = ET.Element("newseq")
+    xml_newseq.set("type", "standard")
+    xml_port.append(xml_newseq)
+    xml_newseq.text = f"KEYCODE_{kbkey} OR {input2definition(pad, key, input, padindex + 1, reversed, None)}"
     return xml_port
 
-def generateAnalogPortElement(pad: Controller, config: minidom.Document, tag: str, nplayer: int, padindex: int, mapping: str, inckey: str, deckey: str, mappedinput: Input, mappedinput2: Input, reversed: bool, mask: str, default: str, delta: str, axis: str = ''):
+def generateAnalogPortElement(pad: Controller, tag: str, nplayer: int, padindex: int, mapping: str, inckey: str, deckey: str, mappedinput: Input, mappedinput2: Input, reversed: bool, mask: str, default: str, delta: str, axis: str = ''):
     # Mapping analog to digital (mouse, etc)
-    xml_port = config.createElement("port")
-    xml_port.setAttribute("tag", tag)
-    xml_port.setAttribute("type", mapping)
-    xml_port.setAttribute("mask", mask)
-    xml_port.setAttribute("defvalue", default)
-    xml_port.setAttribute("keydelta", delta)
-    xml_newseq_inc = config.createElement("newseq")
-    xml_newseq_inc.setAttribute("type", "increment")
-    xml_port.appendChild(xml_newseq_inc)
-    incvalue = config.createTextNode(input2definition(pad, inckey, mappedinput, padindex + 1, reversed, None, True))
-    xml_newseq_inc.appendChild(incvalue)
-    xml_newseq_dec = config.createElement("newseq")
-    xml_port.appendChild(xml_newseq_dec)
-    xml_newseq_dec.setAttribute("type", "decrement")
-    decvalue = config.createTextNode(input2definition(pad, deckey, mappedinput2, padindex + 1, reversed, None, True))
-    xml_newseq_dec.appendChild(decvalue)
-    xml_newseq_std = config.createElement("newseq")
-    xml_port.appendChild(xml_newseq_std)
-    xml_newseq_std.setAttribute("type", "standard")
+    xml_port = ET.Element("port")
+    xml_port.set("tag", tag)
+    xml_port.set("type", mapping)
+    xml_port.set("mask", mask)
+    xml_port.set("defvalue", default)
+    xml_port.set("keydelta", delta)
+    xml_newseq_inc = ET.Element("newseq")
+    xml_newseq_inc.set("type", "increment")
+    xml_port.append(xml_newseq_inc)
+    xml_newseq_inc.text = input2definition(pad, inckey, mappedinput, padindex + 1, reversed, None, True)
+    xml_newseq_dec = ET.Element("newseq")
+    xml_port.append(xml_newseq_dec)
+    xml_newseq_dec.set("type", "decrement")
+    xml_newseq_dec.text = input2definition(pad, deckey, mappedinput2, padindex + 1, reversed, None, True)
+    xml_newseq_std = ET.Element("newseq")
+    xml_port.append(xml_newseq_std)
+    xml_newseq_std.set("type", "standard")
     if axis == '':
-        stdvalue = config.createTextNode("NONE")
+        xml_newseq_std.text = "NONE"
     else:
-        stdvalue = config.createTextNode(f"JOYCODE_{padindex + 1}_{axis}")
-    xml_newseq_std.appendChild(stdvalue)
+        xml_newseq_std.text = f"JOYCODE_{padindex + 1}_{axis}"
     return xml_port
 
 def input2definition(pad: Controller, key: str, input: Input, joycode: int, reversed: bool, altButtons: MameControlScheme | None, ignoreAxis: bool = False, isWheel: bool = False):
@@ -597,47 +520,17 @@ def input2definition(pad: Controller, key: str, input: Input, joycode: int, reve
 def hasStick(pad: Controller) -> bool:
     return "joystick1up" in pad.inputs
 
-def getRoot(config: minidom.Document, name: str):
-    xml_section = config.getElementsByTagName(name)
-
-    if len(xml_section) == 0:
-        xml_section = config.createElement(name)
-        config.appendChild(xml_section)
-    else:
-        xml_section = xml_section[0]
-
-    return xml_section
-
-def getSection(config: minidom.Document, xml_root: minidom.Element, name: str):
-    xml_section = xml_root.getElementsByTagName(name)
-
-    if len(xml_section) == 0:
-        xml_section = config.createElement(name)
-        xml_root.appendChild(xml_section)
-    else:
-        xml_section = xml_section[0]
-
-    return xml_section
-
-def removeSection(config: minidom.Document, xml_root: minidom.Element, name: str):
-    xml_section = xml_root.getElementsByTagName(name)
-
-    for i in range(len(xml_section)):
-        old = xml_root.removeChild(xml_section[i])
-        old.unlink()
-
-def addCommonPlayerPorts(config: minidom.Document, xml_input: minidom.Element, nplayer: int):
+def addCommonPlayerPorts(xml_input: ET.Element, nplayer: int):
     # adstick for guns
     for axis in ["X", "Y"]:
         nanalog = 1 if axis == "X" else 2
-        xml_port = config.createElement("port")
-        xml_port.setAttribute("tag", f":mainpcb:ANALOG{nanalog}")
-        xml_port.setAttribute("type", f"P{nplayer}_AD_STICK_{axis}")
-        xml_port.setAttribute("mask", "255")
-        xml_port.setAttribute("defvalue", "128")
-        xml_newseq = config.createElement("newseq")
-        xml_newseq.setAttribute("type", "standard")
-        xml_port.appendChild(xml_newseq)
-        value = config.createTextNode(f"GUNCODE_{nplayer}_{axis}AXIS")
-        xml_newseq.appendChild(value)
-        xml_input.appendChild(xml_port)
+        xml_port = ET.Element("port")
+        xml_port.set("tag", f":mainpcb:ANALOG{nanalog}")
+        xml_port.set("type", f"P{nplayer}_AD_STICK_{axis}")
+        xml_port.set("mask", "255")
+        xml_port.set("defvalue", "128")
+        xml_newseq = ET.Element("newseq")
+        xml_newseq.set("type", "standard")
+        xml_port.append(xml_newseq)
+        xml_newseq.text = f"GUNCODE_{nplayer}_{axis}AXIS"
+        xml_input.append(xml_port)
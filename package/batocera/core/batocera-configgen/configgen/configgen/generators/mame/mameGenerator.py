@@ -5,11 +5,8 @@ import json
 import logging
 import os
 import shutil
-import subprocess
-import xml.etree.ElementTree as ET
 from pathlib import Path
 from typing import TYPE_CHECKING
-from xml.dom import minidom
 
 from PIL import Image
 
@@ -18,7 +15,6 @@ from ...batoceraPaths import (
     BATOCERA_SHARE_DIR,
     BIOS,
     CONFIGS,
-    DEFAULTS_DIR,
     ROMS,
     SAVES,
     SCREENSHOTS,
@@ -30,7 +26,10 @@ from ...utils import bezels as bezelsUtil, videoMode
 from ..Generator import Generator
 from . import mameControllers
 from .mameCommon import is_atom_floppy
-from .mamePaths import MAME_BIOS, MAME_CHEATS, MAME_CONFIG, MAME_DEFAULT_DATA, MAME_ROMS, MAME_SAVES
+from .mameMachineInfo import get_machine_info
+from .mamePaths import MAME_BIOS, MAME_CHEATS, MAME_CONFIG, MAME_DEFAULT_DATA, MAME_HASH, MAME_ROMS, MAME_SAVES
+from .mameSoftwareList import get_software
+from .mameTables import get_game_list, get_mess_system
 
 if TYPE_CHECKING:
     from ...Emulator import Emulator
@@ -89,24 +88,11 @@ class MameGenerator(Generator):
         for checkPath in mamePaths:
             mkdir_if_not_exists(checkPath)
 
-        messSystems: list[str] = []
-        messSysName: list[str] = []
-        messRomType: list[str] = []
-        messAutoRun: list[str] = []
-
-        with (DEFAULTS_DIR / 'data' / 'mame' / 'messSystems.csv').open() as openFile:
-            messDataList = csv.reader(openFile, delimiter=';', quotechar="'")
-            for row in messDataList:
-                messSystems.append(row[0])
-                messSysName.append(row[1])
-                messRomType.append(row[2])
-                messAutoRun.append(row[3])
-
         # Identify the current system
-        try:
-            messMode = messSystems.index(system.name)
-        except ValueError:
-            messMode = -1
+        if (messSystem := get_mess_system(system.name)) is not None:
+            messSysName, messRomType, messAutoRun = messSystem.model, messSystem.rom_type, messSystem.autorun
+        else:
+            messSysName = messRomType = messAutoRun = ""
 
         softList = system.config.get_str("softList", "none")
         softList = softList if softList != "none" else ""
@@ -126,7 +112,7 @@ class MameGenerator(Generator):
         # skip game info at start
         commandArray += [ "-skip_gameinfo" ]
 
-        if messMode == -1:
+        if messSystem is None:
             commandArray += [ "-rompath", f"{romDirname};{MAME_BIOS};{BIOS}" ]
         else:
             if softList in subdirSoftList:
@@ -156,7 +142,7 @@ class MameGenerator(Generator):
         # Set custom config path if option is selected or default path if not
         customCfg = system.config.get_bool("customcfg")
 
-        if messMode == -1:
+        if messSystem is None:
             if customCfg:
                 cfgPath = MAME_CONFIG / "custom"
             else:
@@ -164,16 +150,16 @@ class MameGenerator(Generator):
             mkdir_if_not_exists(MAME_CONFIG)
         else:
             if customCfg:
-                cfgPath = MAME_CONFIG / messSysName[messMode] / "custom"
+                cfgPath = MAME_CONFIG / messSysName / "custom"
             else:
-                cfgPath = MAME_CONFIG / messSysName[messMode]
-            mkdir_if_not_exists(MAME_CONFIG / messSysName[messMode])
+                cfgPath = MAME_CONFIG / messSysName
+            mkdir_if_not_exists(MAME_CONFIG / messSysName)
         mkdir_if_not_exists(cfgPath)
 
         # MAME will create custom configs per game for MAME ROMs and MESS ROMs with no system attached (LCD games, TV games, etc.)
         # This will allow an alternate config path per game for MESS console/computer ROMs that may need additional config.
-        if system.config.get_bool("pergamecfg") and messMode != -1 and messSysName[messMode] != "":
-            base_path = MAME_CONFIG / messSysName[messMode]
+        if system.config.get_bool("pergamecfg") and messSystem is not None and messSysName != "":
+            base_path = MAME_CONFIG / messSysName
             mkdir_if_not_exists(base_path)
             cfgPath = base_path / romBasename
             mkdir_if_not_exists(cfgPath)
@@ -258,7 +244,7 @@ class MameGenerator(Generator):
 
         # Mouse
         useMouse = False
-        if system.config.get_bool('use_mouse') or not (messSysName[messMode] == "" or messMode == -1):
+        if system.config.get_bool('use_mouse') or not (messSysName == "" or messSystem is None):
             useMouse = True
             commandArray += [ "-dial_device", "mouse" ]
             commandArray += [ "-trackball_device", "mouse" ]
@@ -301,10 +287,10 @@ class MameGenerator(Generator):
 
         # Finally we pass game name
         # MESS will use the full filename and pass the system & rom type parameters if needed.
-        if messSysName[messMode] == "" or messMode == -1:
+        if messSysName == "" or messSystem is None:
             commandArray += [ romBasename ]
         else:
-            messModel = messSysName[messMode]
+            messModel = messSysName
             # Alternate system for machines that have different configs (ie computers with different hardware)
             if altmodel := system.config.get("altmodel"):
                 messModel = altmodel
@@ -422,7 +408,7 @@ class MameGenerator(Generator):
                         else:
                             commandArray += [ "-cart" ]
                     else:
-                        commandArray += [ f'-{messRomType[messMode]}' ]
+                        commandArray += [ f'-{messRomType}' ]
                 else:
                     if boot_disk:
                         if (altromtype == "flop1" or not altromtype) and boot_disk in [ "macos30", "macos608", "macos701", "macos75" ]:
@@ -430,12 +416,12 @@ class MameGenerator(Generator):
                         elif altromtype:
                             commandArray += [ f'-{altromtype}' ]
                         else:
-                            commandArray += [ f'-{messRomType[messMode]}' ]
+                            commandArray += [ f'-{messRomType}' ]
                     else:
                         if altromtype:
                             commandArray += [ f'-{altromtype}' ]
                         else:
-                            commandArray += [ f'-{messRomType[messMode]}' ]
+                            commandArray += [ f'-{messRomType}' ]
                 # Use the full filename for MESS ROMs
                 commandArray += [ rom ]
             else:
@@ -448,7 +434,7 @@ class MameGenerator(Generator):
                         if checkFile.is_dir():
                             shutil.rmtree(checkFile)
                     mkdir_if_not_exists(softDir / "hash")
-                    (softDir / "hash" / f"{softList}.xml").symlink_to(f"/usr/bin/mame/hash/{softList}.xml")
+                    (softDir / "hash" / f"{softList}.xml").symlink_to(MAME_HASH / f"{softList}.xml")
                     if softList in subdirSoftList:
                         (softDir / softList).symlink_to(romDirname.parents[0], target_is_directory=True)
                         commandArray += [ romDirname.name ]
@@ -507,15 +493,8 @@ class MameGenerator(Generator):
                 autoRunDelay = 2
 
                 # if using software list, use "usage" for autoRunCmd (if provided)
-                if softList != "":
-                    softListFile = Path('/usr/bin/mame/hash') / f'{softList}.xml'
-                    if softListFile.exists():
-                        softwarelist = ET.parse(softListFile)
-                        for software in softwarelist.findall('software'):
-                            if software.attrib and software.get('name') == romName:
-                                for info in software.iter('info'):
-                                    if info.get('name') == 'usage':
-                                        autoRunCmd = f"{info.get('value')}\\n"
+                if softList != "" and (software := get_software(softList, romName)) and software.usage is not None:
+                    autoRunCmd = f"{software.usage}\\n"
 
                 # if still undefined, default autoRunCmd based on media type
                 if autoRunCmd == "":
@@ -545,15 +524,8 @@ class MameGenerator(Generator):
                 autoRunDelay = 2
 
                 # if using software list, use "usage" for autoRunCmd (if provided)
-                if softList != "":
-                    softListFile = Path('/usr/bin/mame/hash') / f'{softList}.xml'
-                    if softListFile.exists():
-                        softwarelist = ET.parse(softListFile)
-                        for software in softwarelist.findall('software'):
-                            if software.attrib and software.get('name') == romName:
-                                for info in software.iter('info'):
-                                    if info.get('name') == 'usage':
-                                        autoRunCmd = f"{info.get('value')}\\n"
+                if softList != "" and (software := get_software(softList, romName)) and software.usage is not None:
+                    autoRunCmd = f"{software.usage}\\n"
 
                 # if still undefined, default autoRunCmd based on media type
                 if (
@@ -577,7 +549,7 @@ class MameGenerator(Generator):
                                 autoRunCmd = f"{row[1]}\\n"
             elif system.name == "atom":
                 autoRunDelay = 1
-                autoRunCmd = messAutoRun[messMode]
+                autoRunCmd = messAutoRun
                 # Check if the media being used is a floppy type
                 if (
                     (altromtype == "flop1") or
@@ -594,7 +566,7 @@ class MameGenerator(Generator):
                                     break
             else:
                 # Check for an override file, otherwise use generic (if it exists)
-                autoRunCmd = messAutoRun[messMode]
+                autoRunCmd = messAutoRun
                 autoRunFile = MAME_DEFAULT_DATA / f'{softList}_autoload.csv'
                 if autoRunFile.exists():
                     with autoRunFile.open() as openARFile:
@@ -614,8 +586,8 @@ class MameGenerator(Generator):
             bezelSet = None
 
         try:
-            if messMode != -1:
-                MameGenerator.writeBezelConfig(bezelSet, system, rom, messSysName[messMode], gameResolution, system.guns_borders_size_name(guns), system.guns_border_ratio_type(guns))
+            if messSystem is not None:
+                MameGenerator.writeBezelConfig(bezelSet, system, rom, messSysName, gameResolution, system.guns_borders_size_name(guns), system.guns_border_ratio_type(guns))
             else:
                 MameGenerator.writeBezelConfig(bezelSet, system, rom, "", gameResolution, system.guns_borders_size_name(guns), system.guns_border_ratio_type(guns))
         except Exception:
@@ -623,7 +595,7 @@ class MameGenerator(Generator):
 
         buttonLayout = getMameControlScheme(system, rom)
 
-        if messMode == -1:
+        if messSystem is None:
             mameControllers.generatePadsConfig(cfgPath, playersControllers, "", buttonLayout, customCfg, specialController, bezelSet, useGuns, guns, useWheels, wheels, useMouse, multiMouse, system)
         else:
             mameControllers.generatePadsConfig(cfgPath, playersControllers, messModel, buttonLayout, customCfg, specialController, bezelSet, useGuns, guns, useWheels, wheels, useMouse, multiMouse, system)
@@ -715,7 +687,7 @@ class MameGenerator(Generator):
                 bz_height = img_height - bz_y - bz_bottom
             else:
                 img_width, img_height = bezelsUtil.fast_image_size(bz_infos["png"])
-                _, _, rotate = MameGenerator.getMameMachineSize(rom.stem, tmpZipDir)
+                _, _, rotate = MameGenerator.getMameMachineSize(rom.stem)
 
                 # assumes that all bezels are setup for 4:3H or 3:4V aspects
                 if rotate == 270 or rotate == 90:
@@ -803,79 +775,48 @@ class MameGenerator(Generator):
             pngFile.symlink_to(output_png_file)
 
     @staticmethod
-    def getMameMachineSize(machine: str, tmpdir: Path):
-        proc = subprocess.Popen(["/usr/bin/mame/mame", "-listxml", machine], stdout=subprocess.PIPE)
-        (out, _) = proc.communicate()
-        exitcode = proc.returncode
+    def getMameMachineSize(machine: str) -> tuple[int, int, int]:
+        display = get_machine_info(machine).display
 
-        if exitcode != 0:
-            raise BatoceraException(f"mame -listxml {machine} failed")
+        if display is None:
+            raise BatoceraException("Display element not found")
 
-        infofile = tmpdir / "infos.xml"
-        f = infofile.open("w")
-        f.write(out.decode())
-        f.close()
-
-        infos = minidom.parse(str(infofile))
-        display = infos.getElementsByTagName('display')
-
-        for element in display:
-            iwidth  = element.getAttribute("width")
-            iheight = element.getAttribute("height")
-            irotate = element.getAttribute("rotate")
-            return int(iwidth), int(iheight), int(irotate)
-
-        raise BatoceraException("Display element not found")
+        return display.width, display.height, display.rotate
 
 def getMameControlScheme(system: Emulator, rom_path: Path) -> MameControlScheme:
-    # Game list files
-    mameCapcom = MAME_DEFAULT_DATA / 'mameCapcom.txt'
-    mameKInstinct = MAME_DEFAULT_DATA / 'mameKInstinct.txt'
-    mameMKombat = MAME_DEFAULT_DATA / 'mameMKombat.txt'
-    mameNeogeo = MAME_DEFAULT_DATA / 'mameNeogeo.txt'
-    mameTwinstick = MAME_DEFAULT_DATA / 'mameTwinstick.txt'
-    mameRotatedstick = MAME_DEFAULT_DATA / 'mameRotatedstick.txt'
-
     # Controls for games with 5-6 buttons or other unusual controls
     controllerType = system.config.get("altlayout", "auto")
 
     if controllerType in [ "default", "neomini", "neocd", "twinstick", "qbert" ]:
         return controllerType  # pyright: ignore[reportReturnType]
 
-    capcomList = set(mameCapcom.read_text().split())
-    mkList = set(mameMKombat.read_text().split())
-    kiList = set(mameKInstinct.read_text().split())
-    neogeoList = set(mameNeogeo.read_text().split())
-    twinstickList = set(mameTwinstick.read_text().split())
-    qbertList = set(mameRotatedstick.read_text().split())
-
-    romName = rom_path.stem
-    if romName in capcomList:
+    gameList = get_game_list(rom_path.stem)
+    if gameList == "capcom":
         if controllerType in [ "auto", "snes" ]:
             return "sfsnes"
         if controllerType == "megadrive":
             return "megadrive"
         if controllerType == "fightstick":
             return "sfstick"
-    elif romName in mkList:
+    elif gameList == "mkombat":
         if controllerType in [ "auto", "snes" ]:
             return "mksnes"
         if controllerType == "megadrive":
             return "mkmegadrive"
         if controllerType == "fightstick":
             return "mkstick"
-    elif romName in kiList:
+    elif gameList == "kinstinct":
         if controllerType in [ "auto", "snes" ]:
             return "kisnes"
         if controllerType == "megadrive":
             return "megadrive"
         if controllerType == "fightstick":
             return "sfstick"
-    elif romName in  neogeoList:
+    elif gameList == "neogeo":
         return "neomini"
-    elif romName in  twinstickList:
+    elif gameList == "twinstick":
         return "twinstick"
-    elif romName in  qbertList:
+    elif gameList == "rotatedstick":
         return "qbert"
     else:
         if controllerType == "fightstick":
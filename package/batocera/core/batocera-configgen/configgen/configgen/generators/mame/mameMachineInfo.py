@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import logging
+import subprocess
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+
+from ...exceptions import BatoceraException
+from ...utils.cache import file_signature, load_cached, store
+from .mamePaths import MAME_BINARY, MAME_CACHE
+
+_logger = logging.getLogger(__name__)
+
+_CACHE_NAME = 'machines'
+
+
+@dataclass(slots=True, frozen=True)
+class MameDisplay:
+    width: int
+    height: int
+    rotate: int
+
+
+@dataclass(slots=True, frozen=True)
+class MameMachineInfo:
+    name: str
+    display: MameDisplay | None
+    players: int
+    buttons: int
+    controls: tuple[str, ...]  # control types, in the order MAME lists them
+
+
+def _int_attribute(element: ET.Element, name: str, /) -> int:
+    try:
+        return int(element.get(name, '0'))
+    except ValueError:
+        return 0
+
+
+def _parse_machine(machine: str, listxml: bytes, /) -> MameMachineInfo:
+    root = ET.fromstring(listxml)
+
+    # the devices used by the machine are listed after it
+    element = next((element for element in root.iter('machine') if element.get('name') == machine), None)
+    if element is None:
+        raise BatoceraException(f"mame -listxml {machine}: machine not found")
+
+    display: MameDisplay | None = None
+    if (display_element := element.find('display')) is not None:
+        try:
+            display = MameDisplay(
+                int(display_element.get('width', '')),
+                int(display_element.get('height', '')),
+                int(display_element.get('rotate', '0')),
+            )
+        except ValueError:
+            pass
+
+    players = 0
+    buttons = 0
+    controls: list[str] = []
+    if (input_element := element.find('input')) is not None:
+        players = _int_attribute(input_element, 'players')
+        for control in input_element.iter('control'):
+            buttons = max(buttons, _int_attribute(control, 'buttons'))
+            if (control_type := control.get('type')) and control_type not in controls:
+                controls.append(control_type)
+
+    return MameMachineInfo(machine, display, players, buttons, tuple(controls))
+
+
+def get_machine_info(machine: str, /) -> MameMachineInfo:
+    """
+    Returns the information MAME gives about `machine` in its -listxml output.
+
+    MAME is only run the first time a machine is asked for: the answers are kept in the MAME cache directory,
+    until the MAME binary changes.
+    """
+    key = file_signature(MAME_BINARY)
+    machines: dict[str, MameMachineInfo] = load_cached(_CACHE_NAME, key, dict, directory=MAME_CACHE)
+
+    if (info := machines.get(machine)) is not None:
+        return info
+
+    proc = subprocess.run([MAME_BINARY, '-listxml', machine], stdout=subprocess.PIPE, check=False)
+    if proc.returncode != 0:
+        raise BatoceraException(f"mame -listxml {machine} failed")
+
+    try:
+        info = machines[machine] = _parse_machine(machine, proc.stdout)
+    except ET.ParseError as e:
+        raise BatoceraException(f"mame -listxml {machine}: invalid output") from e
+
+    _logger.debug('MAME machine %s: %s', machine, info)
+    store(_CACHE_NAME, key, machines, directory=MAME_CACHE)
+
+    return info
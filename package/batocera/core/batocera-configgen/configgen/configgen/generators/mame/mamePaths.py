@@ -1,8 +1,9 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Final
 
-from ...batoceraPaths import BIOS, CHEATS, CONFIGS, DEFAULTS_DIR, ROMS, SAVES
+from ...batoceraPaths import BIOS, CACHE, CHEATS, CONFIGS, DEFAULTS_DIR, ROMS, SAVES
 
 MAME_CONFIG: Final = CONFIGS / "mame"
 MAME_SAVES: Final = SAVES / "mame"
@@ -10,3 +11,6 @@ MAME_BIOS: Final = BIOS / "mame"
 MAME_CHEATS: Final = CHEATS / "mame"
 MAME_ROMS: Final = ROMS / "mame"
 MAME_DEFAULT_DATA: Final = DEFAULTS_DIR / "data" / "mame"
+MAME_CACHE: Final = CACHE / "mame"
+MAME_HASH: Final = Path("/usr/bin/mame/hash")
+MAME_BINARY: Final = Path("/usr/bin/mame/mame")
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from ...utils.cache import file_signature, load_cached
+from .mamePaths import MAME_CACHE, MAME_HASH
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class SoftwarePart:
+    name: str
+    interface: str
+
+
+@dataclass(slots=True, frozen=True)
+class Software:
+    name: str
+    description: str
+    usage: str | None
+    parts: tuple[SoftwarePart, ...]
+
+
+def _parse_software_list(hash_file: Path, /) -> dict[str, Software]:
+    softwares: dict[str, Software] = {}
+
+    # the hash files can be several MB: the elements are dropped as soon as they are read
+    for _, element in ET.iterparse(hash_file):
+        if element.tag != 'software':
+            continue
+
+        if (name := element.get('name')) is not None:
+            usage: str | None = None
+            for info in element.iter('info'):
+                if info.get('name') == 'usage':
+                    usage = info.get('value')
+
+            softwares[name] = Software(
+                name=name,
+                description=element.findtext('description', ''),
+                usage=usage,
+                parts=tuple(
+                    SoftwarePart(part.get('name', ''), part.get('interface', '')) for part in element.iter('part')
+                ),
+            )
+
+        element.clear()
+
+    return softwares
+
+
+def get_software(softlist: str, name: str, /) -> Software | None:
+    """
+    Returns the entry of the software `name` in the MAME software list `softlist`.
+
+    Each software list is indexed once into the MAME cache, and indexed again when its hash file changes
+    (MAME updates).
+    """
+    hash_file = MAME_HASH / f'{softlist}.xml'
+    if not hash_file.exists():
+        return None
+
+    try:
+        softwares = load_cached(
+            f'softlist-{softlist}',
+            file_signature(hash_file),
+            lambda: _parse_software_list(hash_file),
+            directory=MAME_CACHE,
+        )
+    except ET.ParseError as e:
+        _logger.warning('unable to read the software list %s: %s', hash_file, e)
+        return None
+
+    return softwares.get(name)
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Any, Final
+
+from ...utils.cache import file_signature, load_cached
+from .mamePaths import MAME_DEFAULT_DATA
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    from .mameTypes import MameGameList
+
+_MAME_CONTROLS: Final = MAME_DEFAULT_DATA / 'mameControls.csv'
+_MESS_CONTROLS: Final = MAME_DEFAULT_DATA / 'messControls.csv'
+_MESS_SYSTEMS: Final = MAME_DEFAULT_DATA / 'messSystems.csv'
+
+# in the order getMameControlScheme checks them
+_GAME_LISTS: Final[tuple[tuple[MameGameList, str], ...]] = (
+    ('capcom', 'mameCapcom.txt'),
+    ('mkombat', 'mameMKombat.txt'),
+    ('kinstinct', 'mameKInstinct.txt'),
+    ('neogeo', 'mameNeogeo.txt'),
+    ('twinstick', 'mameTwinstick.txt'),
+    ('rotatedstick', 'mameRotatedstick.txt'),
+)
+
+
+@dataclass(slots=True, frozen=True)
+class MessSystem:
+    name: str
+    model: str  # empty for the systems run without a MESS machine (lcdgames, plugnplay)
+    rom_type: str
+    autorun: str
+
+
+@dataclass(slots=True, frozen=True)
+class _MameTables:
+    controls: dict[str, dict[str, str]]
+    mess_controls: dict[str, dict[str, dict[str, Any]]]
+    mess_systems: dict[str, MessSystem]
+    game_lists: dict[str, MameGameList]
+
+
+def _parse_mame_controls() -> dict[str, dict[str, str]]:
+    controls: dict[str, dict[str, str]] = {}
+
+    with _MAME_CONTROLS.open() as openFile:
+        for row in csv.reader(openFile):
+            controls.setdefault(row[0], {})[row[1]] = row[2]
+
+    return controls
+
+
+def _parse_mess_controls() -> dict[str, dict[str, dict[str, Any]]]:
+    controls: dict[str, dict[str, dict[str, Any]]] = {}
+
+    with _MESS_CONTROLS.open() as openFile:
+        for row in csv.reader(openFile, delimiter=';'):
+            currentEntry: dict[str, Any] = {}
+            controls.setdefault(row[0], {})[row[1]] = currentEntry
+            currentEntry['type'] = row[2]
+            currentEntry['player'] = int(row[3])
+            currentEntry['tag'] = row[4]
+            currentEntry['key'] = row[5]
+            if currentEntry['type'] in [ 'special', 'main' ]:
+                currentEntry['mapping'] = row[6]
+                currentEntry['useMapping'] = row[7]
+                currentEntry['reversed'] = row[8]
+                currentEntry['mask'] = row[9]
+                currentEntry['default'] = row[10]
+            elif currentEntry['type'] == 'analog':
+                currentEntry['incMapping'] = row[6]
+                currentEntry['decMapping'] = row[7]
+                currentEntry['useMapping1'] = row[8]
+                currentEntry['useMapping2'] = row[9]
+                currentEntry['reversed'] = row[10]
+                currentEntry['mask'] = row[11]
+                currentEntry['default'] = row[12]
+                currentEntry['delta'] = row[13]
+                currentEntry['axis'] = row[14]
+            if currentEntry['type'] == 'combo':
+                currentEntry['kbMapping'] = row[6]
+                currentEntry['mapping'] = row[7]
+                currentEntry['useMapping'] = row[8]
+                currentEntry['reversed'] = row[9]
+                currentEntry['mask'] = row[10]
+                currentEntry['default'] = row[11]
+            currentEntry['reversed'] = currentEntry['reversed'] != 'False'
+
+    return controls
+
+
+def _parse_mess_systems() -> dict[str, MessSystem]:
+    systems: dict[str, MessSystem] = {}
+
+    with _MESS_SYSTEMS.open() as openFile:
+        for row in csv.reader(openFile, delimiter=';', quotechar="'"):
+            systems.setdefault(row[0], MessSystem(row[0], row[1], row[2], row[3]))
+
+    return systems
+
+
+def _parse_game_lists() -> dict[str, MameGameList]:
+    game_lists: dict[str, MameGameList] = {}
+
+    # a game in several lists belongs to the first one
+    for game_list, file_name in _GAME_LISTS:
+        for game in (MAME_DEFAULT_DATA / file_name).read_text().split():
+            game_lists.setdefault(game, game_list)
+
+    return game_lists
+
+
+def _build_tables() -> _MameTables:
+    return _MameTables(_parse_mame_controls(), _parse_mess_controls(), _parse_mess_systems(), _parse_game_lists())
+
+
+@cache
+def _tables() -> _MameTables:
+    # the tables are compiled once from the csv/txt files, and compiled again when they change
+    sources = (_MAME_CONTROLS, _MESS_CONTROLS, _MESS_SYSTEMS, *(MAME_DEFAULT_DATA / file_name for _, file_name in _GAME_LISTS))
+    return load_cached('mame-tables', file_signature(*sources), _build_tables)
+
+
+def get_controls() -> Mapping[str, Mapping[str, str]]:
+    """The mappings of mameControls.csv, by control scheme (default, gunbuttons, mousebuttons, sfsnes...)."""
+    return _tables().controls
+
+
+def get_mess_controls() -> Mapping[str, Mapping[str, Mapping[str, Any]]]:
+    """The special controls of messControls.csv, by system and control name."""
+    return _tables().mess_controls
+
+
+def get_mess_system(name: str, /) -> MessSystem | None:
+    """The entry of messSystems.csv for the system `name`, None for the arcade systems."""
+    return _tables().mess_systems.get(name)
+
+
+def get_game_list(rom_name: str, /) -> MameGameList | None:
+    """The game list (used to choose the control scheme) of the game `rom_name`."""
+    return _tables().game_lists.get(rom_name)
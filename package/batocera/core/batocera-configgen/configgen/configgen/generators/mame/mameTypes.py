@@ -18,3 +18,14 @@ type MameControlScheme = Literal[
     'kisnes',
     'mddefault',
 ]
+
+# the game lists of mameCapcom.txt, mameMKombat.txt, mameKInstinct.txt, mameNeogeo.txt, mameTwinstick.txt
+# and mameRotatedstick.txt
+type MameGameList = Literal[
+    'capcom',
+    'mkombat',
+    'kinstinct',
+    'neogeo',
+    'twinstick',
+    'rotatedstick',
+]
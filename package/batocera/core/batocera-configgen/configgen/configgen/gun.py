@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 import logging
-import re
 import shutil
 from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
@@ -9,12 +8,12 @@ from pathlib import Path
 from typing import TYPE_CHECKING, ClassVar, Final, cast
 
 from .batoceraPaths import BATOCERA_SHARE_DIR, CONFIGS, SAVES, mkdir_if_not_exists
+from .utils.inputDevices import get_device_inventory
 
 if TYPE_CHECKING:
     from .Emulator import Emulator
 
 _logger = logging.getLogger(__name__)
-_input_re: Final = re.compile(r'^/dev/input/event([0-9]*)$')
 _PRECALIBRATION_DIR: Final = BATOCERA_SHARE_DIR / 'guns-precalibrations'
 
 
@@ -77,18 +76,15 @@ class Gun:
     @staticmethod
     def get_all() -> GunList:
         import evdev
-        import pyudev
 
         guns: GunList = []
-        context = pyudev.Context()
+        inventory = get_device_inventory()
 
         # guns are mouses, just filter on them
         mouses = {
-            int(match.group(1)): mouse
-            for mouse in context.list_devices(subsystem='input')
-            if mouse.device_node is not None
-            and (match := _input_re.match(mouse.device_node)) is not None
-            and mouse.properties.get('ID_INPUT_MOUSE') == '1'
+            mouse.event_id: mouse
+            for mouse in inventory.devices.values()
+            if mouse.has_property('ID_INPUT_MOUSE')
         }
 
         mouse_code_to_button = {
@@ -107,26 +103,25 @@ class Gun:
         mouse_button_codes = set(mouse_code_to_button.keys())
 
         for mouse_index, (_, mouse) in enumerate(sorted(mouses.items(), key=lambda item: item[0])):
-            _logger.info('found mouse %s at %s with id_mouse=%s', mouse_index, mouse.device_node, mouse_index)
-            if mouse.properties.get('ID_INPUT_GUN') != '1':
+            _logger.info('found mouse %s at %s with id_mouse=%s', mouse_index, mouse.node, mouse_index)
+            if not mouse.has_property('ID_INPUT_GUN'):
                 continue
 
-            device = evdev.InputDevice(cast('str', mouse.device_node))
-            device_codes = set(device.capabilities()[evdev.ecodes.EV_KEY]) & mouse_button_codes
+            device_codes = set(inventory.capabilities(mouse.node).get(evdev.ecodes.EV_KEY, [])) & mouse_button_codes
 
             gun = Gun(
-                node=cast('str', mouse.device_node),
+                node=mouse.node,
                 # retroarch uses mouse indexes into configuration files using ID_INPUT_MOUSE
                 # (TOUCHPAD are listed after mouses)
                 mouse_index=mouse_index,
-                needs_cross=mouse.properties.get('ID_INPUT_GUN_NEED_CROSS') == '1',
-                needs_borders=mouse.properties.get('ID_INPUT_GUN_NEED_BORDERS') == '1',
-                name=device.name,
+                needs_cross=mouse.has_property('ID_INPUT_GUN_NEED_CROSS'),
+                needs_borders=mouse.has_property('ID_INPUT_GUN_NEED_BORDERS'),
+                name=mouse.name,
                 buttons=[button for code, button in mouse_code_to_button.items() if code in device_codes],
             )
             guns.append(gun)
             _logger.info(
-                'found gun %s at %s with id_mouse=%s (%s)', len(guns) - 1, mouse.device_node, mouse_index, gun.name
+                'found gun %s at %s with id_mouse=%s (%s)', len(guns) - 1, mouse.node, mouse_index, gun.name
             )
 
         if not guns:
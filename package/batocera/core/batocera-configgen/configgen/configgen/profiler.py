@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import json
+import logging
 import os
+import time
 from contextlib import contextmanager
-from typing import TYPE_CHECKING
+from contextvars import ContextVar
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final, TypedDict
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -14,9 +19,31 @@ if TYPE_CHECKING:
 # 4) dot -Tpng emulatorlauncher.dot -o emulatorlauncher.png
 # 3) or upload the file /var/run/emulatorlauncher.prof on https://nejc.saje.info/pstats-viewer.html
 
+# The phase tracer below is always on: each launch writes /var/run/emulatorlauncher.trace.json
+# with the wall-clock start and duration (in ms, relative to the configgen start) of each span.
+
+_logger = logging.getLogger(__name__)
+
+_TRACE_FILE: Final = Path('/var/run/emulatorlauncher.trace.json')
+
 _profile: Profile | None = None
 
 
+class _Span(TypedDict):
+    name: str
+    start_ms: float
+    duration_ms: float
+
+
+_trace_origin: float = time.perf_counter()
+_trace_spans: list[_Span] = []
+_trace_metadata: dict[str, Any] = {}
+_current_span: ContextVar[str | None] = ContextVar('current_span', default=None)
+
+# identifies this launch in the logs (structured mode) and in the trace
+_launch_id: str = os.urandom(6).hex()
+
+
 if os.path.exists('/var/run/emulatorlauncher.perf'):  # noqa: PTH110
     import cProfile
 
@@ -43,3 +70,59 @@ def pause() -> Generator[None]:
     _profile.disable()
     yield
     _profile.enable()
+
+
+@contextmanager
+def span(name: str, /) -> Generator[None]:
+    start = time.perf_counter()
+    token = _current_span.set(name)
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        _current_span.reset(token)
+        _trace_spans.append({
+            'name': name,
+            'start_ms': round((start - _trace_origin) * 1000, 3),
+            'duration_ms': round((end - start) * 1000, 3),
+        })
+
+
+def reset() -> None:
+    """Starts a new trace, for a launch running in a process forked from the configgen daemon."""
+    global _trace_origin, _launch_id
+
+    _trace_origin = time.perf_counter()
+    _trace_spans.clear()
+    _trace_metadata.clear()
+    _launch_id = os.urandom(6).hex()
+
+
+def launch_id() -> str:
+    return _launch_id
+
+
+def current_span() -> str | None:
+    """Returns the name of the innermost span running in this thread, if any."""
+    return _current_span.get()
+
+
+def set_trace_metadata(**metadata: Any) -> None:
+    _trace_metadata.update(metadata)
+
+
+def write_trace() -> None:
+    trace = {
+        'launch_id': _launch_id,
+        **_trace_metadata,
+        'total_ms': round((time.perf_counter() - _trace_origin) * 1000, 3),
+        'spans': _trace_spans,
+    }
+
+    for trace_span in _trace_spans:
+        _logger.debug('trace: %s took %.1f ms', trace_span['name'], trace_span['duration_ms'])
+
+    try:
+        _TRACE_FILE.write_text(json.dumps(trace, separators=(',', ':'), default=str))
+    except OSError as e:
+        _logger.warning('unable to write the launch trace %s: %s', _TRACE_FILE, e)
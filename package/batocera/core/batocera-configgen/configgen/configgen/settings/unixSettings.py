@@ -1,37 +1,70 @@
 from __future__ import annotations
 
+import hashlib
 import io
 import logging
+import os
 import re
 import typing
 from dataclasses import InitVar, dataclass, field
 from pathlib import Path
+from typing import Final
 
 from batocera_common.configparser import CaseSensitiveConfigParser
 
+from ..utils.cache import file_signature, invalidate, is_cached, load_cached, store
+
 if typing.TYPE_CHECKING:
     from _typeshed import StrPath
     from collections.abc import Iterator
 
 _logger = logging.getLogger(__name__)
 
+_PROTECT_RE: Final = re.compile(r'[^A-Za-z0-9-\.]+')
+
 def _protect_string(string: str) -> str:
-    return re.sub(r'[^A-Za-z0-9-\.]+', '_', string)
+    return _PROTECT_RE.sub('_', string)
 
 @dataclass(slots=True)
 class UnixSettings:
     filename_or_path: InitVar[StrPath]
     separator: str = field(default='', kw_only=True)
+    cached: InitVar[bool] = field(default=False, kw_only=True)
+    deferred: InitVar[bool] = field(default=False, kw_only=True)
     settings_path: Path = field(init=False)
     config: CaseSensitiveConfigParser = field(init=False)
+    # sanitized prefix -> (sanitized remaining part of the key, value), built on the first lookup
+    _prefix_index: dict[str, list[tuple[str, str]]] | None = field(init=False, default=None, repr=False)
+    # changes recorded and not applied yet when deferred: (operation, name, value)
+    _pending: list[tuple[str, str, str]] | None = field(init=False, default=None, repr=False)
 
-    def __post_init__(self, filename_or_path: StrPath) -> None:
+    def __post_init__(self, filename_or_path: StrPath, cached: bool, deferred: bool) -> None:
         self.settings_path = Path(filename_or_path)
 
         # use ConfigParser as backend.
         _logger.debug("Creating parser for %s", self.settings_path)
         self.config = CaseSensitiveConfigParser(interpolation=None, strict=False) # strict=False to allow to read duplicates set by users
 
+        if deferred:
+            # generated files (ie retroarchcustom.cfg) are only read when the changes differ from the previous write
+            self._pending = []
+        elif cached:
+            # read-only users (ie batocera.conf in Emulator) can reuse the values parsed by a previous launch
+            self.config.read_dict({
+                'DEFAULT': load_cached(
+                    f'settings-{self.settings_path}',
+                    file_signature(self.settings_path, content=True),
+                    self.__read_values,
+                )
+            })
+        else:
+            self.__read()
+
+    def __read_values(self) -> dict[str, str]:
+        self.__read()
+        return dict(self.config.items('DEFAULT'))
+
+    def __read(self) -> None:
         try:
             # TODO: remove me when we migrate to Python 3.13 and can use allow_unnamed_section=True
             # pretend where have a [DEFAULT] section
@@ -47,8 +80,29 @@ class UnixSettings:
         except OSError as e:
             _logger.error(str(e))
 
-    def write(self) -> None:
-        with self.settings_path.open('w') as fp:
+    def __apply_pending(self) -> None:
+        if self._pending is None:
+            return
+
+        # cleared first, to be applied again on a new file if the read failed (ie invalid retroarch-core-options.cfg)
+        self.config.defaults().clear()
+        self.__read()
+        pending, self._pending = self._pending, None
+
+        for operation, name, value in pending:
+            if operation == 'save':
+                self.config.set('DEFAULT', name, value)
+            elif operation == 'disable_all':
+                self.__disable_all(name)
+            else:
+                self.config.remove_option('DEFAULT', name)
+
+    def __write(self) -> bool:
+        # written aside then renamed: a failed write leaves the previous file, never a truncated one
+        target = self.settings_path.resolve()
+        tmp_path = target.with_name(f'.{target.name}.{os.getpid()}.tmp')
+
+        with tmp_path.open('w') as fp:
             try:
                 for key, value in self.config.items('DEFAULT'):
                     fp.write(f"{key}{self.separator}={self.separator}{value!s}\n")
@@ -57,6 +111,45 @@ class UnixSettings:
                 # Python 2.7 is EOL and ConfigParser 2.7 takes "%(" as a won't fix error
                 # TODO: clean that up when porting to Python 3
                 _logger.error("Wrong value detected (after % char maybe?), ignoring.")
+                failed = True
+            else:
+                failed = False
+
+        if failed:
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+        tmp_path.replace(target)
+        return True
+
+    def write(self) -> bool:
+        """
+        Writes the settings to the file, returns False if the write was skipped.
+
+        When deferred, the file is left untouched (and is not even read) if the same changes were applied to it
+        by the previous write and it was not modified since.
+        """
+        if self._pending is None:
+            self.__write()
+            return True
+
+        cache_name = f'written-{self.settings_path}'
+        # hashed, not to keep the values (ie passwords) in the cache
+        changes = hashlib.sha256(repr((self.separator, self._pending)).encode()).hexdigest()
+
+        if is_cached(cache_name, (changes, file_signature(self.settings_path, content=True))):
+            _logger.debug("%s is up to date", self.settings_path)
+            self._pending = None
+            return False
+
+        self.__apply_pending()
+        if self.__write():
+            # only once the file is completely written
+            store(cache_name, (changes, file_signature(self.settings_path, content=True)), None)
+        else:
+            invalidate(cache_name)
+
+        return True
 
     def save(self, name: str, value: object) -> None:
         # at least for cheevos_password
@@ -64,17 +157,46 @@ class UnixSettings:
             _logger.debug("Writing %s = ******** to %s", name, self.settings_path)
         else:
             _logger.debug("Writing %s = %s to %s", name, value, self.settings_path)
+        if self._pending is not None:
+            self._pending.append(('save', name, str(value)))
+            return
         # TODO: do we need proper section support? PSP config is an ini file
         self.config.set('DEFAULT', name, str(value))
+        self._prefix_index = None
 
-    def disable_all(self, name: str) -> None:
-        _logger.debug("Disabling %s from %s", name, self.settings_path)
+    def __disable_all(self, name: str) -> None:
         for key, _ in self.config.items('DEFAULT'):
             if key[0:len(name)] == name:
                 self.config.remove_option('DEFAULT', key)
 
+    def disable_all(self, name: str) -> None:
+        _logger.debug("Disabling %s from %s", name, self.settings_path)
+        if self._pending is not None:
+            self._pending.append(('disable_all', name, ''))
+            return
+        self.__disable_all(name)
+        self._prefix_index = None
+
     def remove(self, name: str) -> None:
+        if self._pending is not None:
+            self._pending.append(('remove', name, ''))
+            return
         self.config.remove_option('DEFAULT', name)
+        self._prefix_index = None
+
+    def __build_prefix_index(self) -> dict[str, list[tuple[str, str]]]:
+        # index each key under all its dotted prefixes, so that looking for "name.*"
+        # doesn't have to go through all the keys of the file
+        index: dict[str, list[tuple[str, str]]] = {}
+
+        for key, value in self.config.items('DEFAULT'):
+            protected_key = _protect_string(key)
+            dot = protected_key.find('.')
+            while dot != -1 and dot < len(protected_key) - 1:
+                index.setdefault(protected_key[:dot], []).append((protected_key[dot + 1:], value))
+                dot = protected_key.find('.', dot + 1)
+
+        return index
 
     def get_all(self, name: str, /, *, keep_name: bool = False, keep_defaults: bool = False) -> dict[str, str]:
         return dict(self.get_all_iter(name, keep_name=keep_name, keep_defaults=keep_defaults))
@@ -84,10 +206,13 @@ class UnixSettings:
     ) -> Iterator[tuple[str, str]]:
         _logger.debug("Looking for %s.* in %s", name, self.settings_path)
 
-        for key, value in self.config.items('DEFAULT'):
-            m = re.match(rf"^{_protect_string(name)}\.(.+)", _protect_string(key))
-            if m:
-                if not keep_defaults and value in ['', 'default', 'auto']:
-                    continue
+        self.__apply_pending()
+
+        if self._prefix_index is None:
+            self._prefix_index = self.__build_prefix_index()
+
+        for sub_key, value in self._prefix_index.get(_protect_string(name), ()):
+            if not keep_defaults and value in ['', 'default', 'auto']:
+                continue
 
-                yield f'{name}.{m.group(1)}' if keep_name else m.group(1), value
+            yield f'{name}.{sub_key}' if keep_name else sub_key, value
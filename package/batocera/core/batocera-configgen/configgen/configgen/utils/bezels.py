@@ -1,22 +1,26 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import os
 import shutil
 import struct
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING, NotRequired, TypedDict, cast
+from typing import TYPE_CHECKING, Final, NotRequired, TypedDict, cast
 
 import qrcode
 from PIL import Image, ImageDraw, ImageFont, ImageOps
 
-from ..batoceraPaths import BATOCERA_SHARE_DIR, ES_GUNS_ART_METADATA, SYSTEM_DECORATIONS, USER_DECORATIONS
+from ..batoceraPaths import BATOCERA_SHARE_DIR, CACHE, ES_GUNS_ART_METADATA, SYSTEM_DECORATIONS, USER_DECORATIONS
 from ..exceptions import BatoceraException
 from . import metadata
+from .cache import file_signature, load_cached, store
 from .videoMode import getAltDecoration
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping
+    from collections.abc import Hashable, Mapping
 
     from PIL.ImageFile import ImageFile
     from qrcode.image.pil import PilImage
@@ -26,9 +30,14 @@ if TYPE_CHECKING:
 
     from ..config import SystemConfig
     from ..Emulator import Emulator
+    from .cache import FileSignature
 
 _logger = logging.getLogger(__name__)
 
+# final (resized, tattooed...) bezels, kept from a launch to another
+_BEZEL_CACHE_DIR: Final = CACHE / 'bezels'
+_BEZEL_CACHE_MAX_FILES: Final = 32
+
 class BezelInfos(TypedDict):
     png: Path
     info: Path
@@ -37,6 +46,94 @@ class BezelInfos(TypedDict):
     specific_to_game: bool
 
 
+@dataclass(slots=True)
+class _DecorationDirectory:
+    signature: FileSignature
+    # names (without extension) of the png files of the directory
+    pngs: frozenset[str]
+
+
+def _scanDecorationDirectory(directory: Path, /) -> _DecorationDirectory:
+    signature = file_signature(directory)[0]
+    pngs: set[str] = set()
+
+    if signature[1] is not None:
+        try:
+            with os.scandir(directory) as entries:
+                pngs.update(entry.name[:-4] for entry in entries if entry.name.endswith('.png'))
+        except OSError as e:
+            _logger.debug("unable to list the decorations of %s: %s", directory, e)
+
+    return _DecorationDirectory(signature, frozenset(pngs))
+
+
+@dataclass(slots=True)
+class _DecorationPack:
+    path: Path
+    # directory relative to the pack (".", "games", "games/<system>", "systems") -> png files
+    directories: dict[str, _DecorationDirectory] = field(default_factory=dict)
+    dirty: bool = False
+
+    def pngs(self, relative_directory: str, /) -> frozenset[str]:
+        # a directory only needs a stat to be checked: it is listed again only when its content changed
+        directory = self.path / relative_directory
+        known = self.directories.get(relative_directory)
+
+        if known is None or known.signature != file_signature(directory)[0]:
+            known = self.directories[relative_directory] = _scanDecorationDirectory(directory)
+            self.dirty = True
+
+        return known.pngs
+
+
+def _buildDecorationPack(path: Path, /) -> _DecorationPack:
+    pack = _DecorationPack(path)
+
+    for relative_directory in ('.', 'games', 'systems'):
+        pack.pngs(relative_directory)
+
+    games = path / 'games'
+    if games.is_dir():
+        for system_directory in games.iterdir():
+            if system_directory.is_dir():
+                pack.pngs(f'games/{system_directory.name}')
+
+    pack.dirty = False
+    return pack
+
+
+_decorationPacks: dict[Path, _DecorationPack] = {}
+
+
+def _getDecorationPack(decorations: Path, bezel: str, /) -> _DecorationPack:
+    path = decorations / bezel
+
+    if (pack := _decorationPacks.get(path)) is None:
+        pack = _decorationPacks[path] = load_cached(f'decorations-{path}', path, lambda: _buildDecorationPack(path))
+
+    return pack
+
+
+def _saveDecorationPacks() -> None:
+    for path, pack in _decorationPacks.items():
+        if pack.dirty:
+            pack.dirty = False
+            store(f'decorations-{path}', path, pack)
+
+
+def listGameBezels(bezel: str, systemName: str) -> set[str]:
+    """Returns the names of the games having their own bezel in the decoration pack for the system."""
+    games: set[str] = set()
+
+    for decorations in (USER_DECORATIONS, SYSTEM_DECORATIONS):
+        pack = _getDecorationPack(decorations, bezel)
+        games.update(pack.pngs(f'games/{systemName}'))
+        games.update(pack.pngs('games'))
+
+    _saveDecorationPacks()
+    return games
+
+
 def getBezelInfos(rom: str | Path, bezel: str, systemName: str, emulator: str) -> BezelInfos | None:
     # by order choose :
     # rom name in the system subfolder of the user directory (gb/mario.png)
@@ -50,85 +147,53 @@ def getBezelInfos(rom: str | Path, bezel: str, systemName: str, emulator: str) -
     # default name (default.png)
     # else return
     # mamezip files are for MAME-specific advanced artwork (bezels with overlays and backdrops, animated LEDs, etc)
+    # the png files are looked up in the decoration packs indexes instead of being stat'ed one by one
     altDecoration = getAltDecoration(systemName, rom, emulator)
     romBase = Path(rom).stem # filename without extension
-    overlay_info_file = USER_DECORATIONS / bezel / "games" / systemName / f"{romBase}.info"
-    overlay_png_file  = USER_DECORATIONS / bezel / "games" / systemName / f"{romBase}.png"
-    overlay_layout_file  = USER_DECORATIONS / bezel / "games" / systemName / f"{romBase}.lay"
-    overlay_mamezip_file  = USER_DECORATIONS / bezel / "games" / systemName / f"{romBase}.zip"
-    bezel_game = True
-    if not overlay_png_file.exists():
-        overlay_info_file = SYSTEM_DECORATIONS / bezel / "games" / systemName / f"{romBase}.info"
-        overlay_png_file  = SYSTEM_DECORATIONS / bezel / "games" / systemName / f"{romBase}.png"
-        overlay_layout_file  = USER_DECORATIONS / bezel / "games" / systemName / f"{romBase}.lay"
-        overlay_mamezip_file  = USER_DECORATIONS / bezel / "games" / systemName / f"{romBase}.zip"
-        bezel_game = True
-        if not overlay_png_file.exists():
-            overlay_info_file = USER_DECORATIONS / bezel / "games" / f"{romBase}.info"
-            overlay_png_file  = USER_DECORATIONS / bezel / "games" / f"{romBase}.png"
-            overlay_layout_file  = USER_DECORATIONS / bezel / "games" / f"{romBase}.lay"
-            overlay_mamezip_file  = USER_DECORATIONS / bezel / "games" / f"{romBase}.zip"
-            bezel_game = True
-            if not overlay_png_file.exists():
-                overlay_info_file = SYSTEM_DECORATIONS / bezel / "games" / f"{romBase}.info"
-                overlay_png_file  = SYSTEM_DECORATIONS / bezel / "games" / f"{romBase}.png"
-                overlay_layout_file  = USER_DECORATIONS / bezel / "games" / f"{romBase}.lay"
-                overlay_mamezip_file  = USER_DECORATIONS / bezel / "games" / f"{romBase}.zip"
-                bezel_game = True
-                if not overlay_png_file.exists():
-                    if altDecoration != "0":
-                        overlay_info_file = USER_DECORATIONS / bezel / "systems" / f"{systemName}-{altDecoration!s}.info"
-                        overlay_png_file  = USER_DECORATIONS / bezel / "systems" / f"{systemName}-{altDecoration!s}.png"
-                        overlay_layout_file  = USER_DECORATIONS / bezel / "systems" / f"{systemName}-{altDecoration!s}.lay"
-                        overlay_mamezip_file  = USER_DECORATIONS / bezel / "systems" / f"{systemName}-{altDecoration!s}.zip"
-                        bezel_game = False
-                    if not overlay_png_file.exists():
-                        overlay_info_file = USER_DECORATIONS / bezel / "systems" / f"{systemName}.info"
-                        overlay_png_file  = USER_DECORATIONS / bezel / "systems" / f"{systemName}.png"
-                        overlay_layout_file  = USER_DECORATIONS / bezel / "systems" / f"{systemName}.lay"
-                        overlay_mamezip_file  = USER_DECORATIONS / bezel / "systems" / f"{systemName}.zip"
-                        bezel_game = False
-                        if not overlay_png_file.exists():
-                            if altDecoration != "0":
-                                overlay_info_file = SYSTEM_DECORATIONS / bezel / "systems" / f"{systemName}-{altDecoration!s}.info"
-                                overlay_png_file  = SYSTEM_DECORATIONS / bezel / "systems" / f"{systemName}-{altDecoration!s}.png"
-                                overlay_layout_file  = SYSTEM_DECORATIONS / bezel / "systems" / f"{systemName}-{altDecoration!s}.lay"
-                                overlay_mamezip_file  = SYSTEM_DECORATIONS / bezel / "systems" / f"{systemName}-{altDecoration!s}.zip"
-                                bezel_game = False
-                            if not overlay_png_file.exists():
-                                overlay_info_file = SYSTEM_DECORATIONS / bezel / "systems" / f"{systemName}.info"
-                                overlay_png_file  = SYSTEM_DECORATIONS / bezel / "systems" / f"{systemName}.png"
-                                overlay_layout_file  = SYSTEM_DECORATIONS / bezel / "systems" / f"{systemName}.lay"
-                                overlay_mamezip_file  = SYSTEM_DECORATIONS / bezel / "systems" / f"{systemName}.zip"
-                                bezel_game = False
-                                if not overlay_png_file.exists():
-                                    overlay_info_file = USER_DECORATIONS / bezel / f"default-{altDecoration!s}.info"
-                                    overlay_png_file  = USER_DECORATIONS / bezel / f"default-{altDecoration!s}.png"
-                                    overlay_layout_file  = USER_DECORATIONS / bezel / f"default-{altDecoration!s}.lay"
-                                    overlay_mamezip_file  = USER_DECORATIONS / bezel / f"default-{altDecoration!s}.zip"
-                                    bezel_game = True
-                                    if not overlay_png_file.exists():
-                                        overlay_info_file = USER_DECORATIONS / bezel / "default.info"
-                                        overlay_png_file  = USER_DECORATIONS / bezel / "default.png"
-                                        overlay_layout_file  = USER_DECORATIONS / bezel / "default.lay"
-                                        overlay_mamezip_file  = USER_DECORATIONS / bezel / "default.zip"
-                                        bezel_game = True
-                                        if not overlay_png_file.exists():
-                                            overlay_info_file = SYSTEM_DECORATIONS / bezel / f"default-{altDecoration!s}.info"
-                                            overlay_png_file  = SYSTEM_DECORATIONS / bezel / f"default-{altDecoration!s}.png"
-                                            overlay_layout_file  = SYSTEM_DECORATIONS / bezel / f"default-{altDecoration!s}.lay"
-                                            overlay_mamezip_file  = SYSTEM_DECORATIONS / bezel / f"default-{altDecoration!s}.zip"
-                                            bezel_game = True
-                                            if not overlay_png_file.exists():
-                                                overlay_info_file = SYSTEM_DECORATIONS / bezel / "default.info"
-                                                overlay_png_file  = SYSTEM_DECORATIONS / bezel / "default.png"
-                                                overlay_layout_file  = SYSTEM_DECORATIONS / bezel / "default.lay"
-                                                overlay_mamezip_file  = SYSTEM_DECORATIONS / bezel / "default.zip"
-                                                bezel_game = True
-                                                if not overlay_png_file.exists():
-                                                    return None
+
+    # (decorations, directory, name, directory of the lay and zip files, specific to the game)
+    # the lay and zip files of the system games bezels are searched in the user directory
+    candidates: list[tuple[Path, str, str, Path, bool]] = [
+        (USER_DECORATIONS, f"games/{systemName}", romBase, USER_DECORATIONS, True),
+        (SYSTEM_DECORATIONS, f"games/{systemName}", romBase, USER_DECORATIONS, True),
+        (USER_DECORATIONS, "games", romBase, USER_DECORATIONS, True),
+        (SYSTEM_DECORATIONS, "games", romBase, USER_DECORATIONS, True),
+    ]
+    if altDecoration != "0":
+        candidates.append((USER_DECORATIONS, "systems", f"{systemName}-{altDecoration!s}", USER_DECORATIONS, False))
+    candidates.append((USER_DECORATIONS, "systems", systemName, USER_DECORATIONS, False))
+    if altDecoration != "0":
+        candidates.append((SYSTEM_DECORATIONS, "systems", f"{systemName}-{altDecoration!s}", SYSTEM_DECORATIONS, False))
+    candidates += [
+        (SYSTEM_DECORATIONS, "systems", systemName, SYSTEM_DECORATIONS, False),
+        (USER_DECORATIONS, ".", f"default-{altDecoration!s}", USER_DECORATIONS, True),
+        (USER_DECORATIONS, ".", "default", USER_DECORATIONS, True),
+        (SYSTEM_DECORATIONS, ".", f"default-{altDecoration!s}", SYSTEM_DECORATIONS, True),
+        (SYSTEM_DECORATIONS, ".", "default", SYSTEM_DECORATIONS, True),
+    ]
+
+    found = next(
+        (
+            candidate for candidate in candidates
+            if candidate[2] in _getDecorationPack(candidate[0], bezel).pngs(candidate[1])
+        ),
+        None
+    )
+    _saveDecorationPacks()
+
+    if found is None:
+        return None
+
+    decorations, directory, name, extras_decorations, bezel_game = found
+    overlay_png_file = decorations / bezel / directory / f"{name}.png"
     _logger.debug("Original bezel file used: %s", overlay_png_file)
-    return { "png": overlay_png_file, "info": overlay_info_file, "layout": overlay_layout_file, "mamezip": overlay_mamezip_file, "specific_to_game": bezel_game }
+    return {
+        "png": overlay_png_file,
+        "info": decorations / bezel / directory / f"{name}.info",
+        "layout": extras_decorations / bezel / directory / f"{name}.lay",
+        "mamezip": extras_decorations / bezel / directory / f"{name}.zip",
+        "specific_to_game": bezel_game,
+    }
 
 # Much faster than PIL Image.size
 def fast_image_size(image_file: str | Path) -> tuple[int, int]:
@@ -146,15 +211,27 @@ def fast_image_size(image_file: str | Path) -> tuple[int, int]:
             return -1, -1
         return struct.unpack('>ii', head[16:24]) #image width, height
 
-def resizeImage(input_png: str | Path, output_png: str | Path, screen_width: int, screen_height: int, bezel_stretch: bool = False) -> None:
-    imgin = Image.open(input_png)
+# The *BezelImage functions work on in-memory images so that the bezel steps (resize, tattoo, QR code, borders)
+# can be chained without an encode/decode round-trip between them, saveBezelImage() writing the final image.
+# The path based functions are kept for the callers using a single step.
+
+def openBezelImage(input_png: str | Path) -> Image.Image:
+    return Image.open(input_png)
+
+def saveBezelImage(image: Image.Image, output_png: str | Path) -> None:
+    # the bezel is a temporary file: favor the encoding speed over the size
+    image.save(output_png, format="PNG", compress_level=1)
+
+def resizeBezelImage(imgin: Image.Image, screen_width: int, screen_height: int, bezel_stretch: bool = False) -> Image.Image:
     fillcolor = 'black'
     _logger.debug("Resizing bezel: image mode %s", imgin.mode)
     if imgin.mode != "RGBA":
-        alphaPaste(input_png, output_png, imgin, fillcolor, (screen_width, screen_height), bezel_stretch)
-    else:
-        imgout = imgin.resize((screen_width, screen_height), Image.Resampling.BICUBIC)
-        imgout.save(output_png, mode="RGBA", format="PNG")
+        return alphaPasteBezelImage(imgin, fillcolor, (screen_width, screen_height), bezel_stretch)
+    return imgin.resize((screen_width, screen_height), Image.Resampling.BICUBIC)
+
+def resizeImage(input_png: str | Path, output_png: str | Path, screen_width: int, screen_height: int, bezel_stretch: bool = False) -> None:
+    imgout = resizeBezelImage(Image.open(input_png), screen_width, screen_height, bezel_stretch)
+    imgout.save(output_png, mode="RGBA", format="PNG")
 
 def padImage(input_png: str | Path, output_png: str | Path, screen_width: int, screen_height: int, bezel_width: int, bezel_height: int, bezel_stretch: bool = False) -> None:
     imgin = Image.open(input_png)
@@ -169,7 +246,7 @@ def padImage(input_png: str | Path, output_png: str | Path, screen_width: int, s
             imgout = ImageOps.pad(imgin, (screen_width, screen_height), color=fillcolor, centering=(0.5,0.5))
         imgout.save(output_png, mode="RGBA", format="PNG")
 
-def addQRCode(input_png: str | Path, output_png: str | Path, code: str, system: Emulator):
+def addQRCodeToBezelImage(image: Image.Image, code: str, system: Emulator) -> Image.Image:
     url = f"https://retroachievements.org/game/{code}"
 
     bxsize = 3
@@ -181,10 +258,9 @@ def addQRCode(input_png: str | Path, output_png: str | Path, code: str, system:
 
     x = 29 * bxsize + bdsize * bxsize * 2
 
-    w,h = fast_image_size(input_png)
-    newBezel = Image.open(input_png)
+    w,h = image.size
     qrimg    = cast('Image.Image', qrimg.convert("RGBA"))
-    newBezel = newBezel.convert("RGBA")
+    newBezel = image.convert("RGBA")
 
     corner = system.config.get('bezel.qrcode_corner', 'NE')
     if (corner.upper() == 'NW'):
@@ -195,42 +271,41 @@ def addQRCode(input_png: str | Path, output_png: str | Path, code: str, system:
         newBezel.paste(qrimg, (0, h-x, x, h))
     else: # default = NE
         newBezel.paste(qrimg, (w-x, 0, w, x))
-    newBezel.save(output_png)
+    return newBezel
 
-def tatooImage(input_png: Path, output_png: Path, system: Emulator) -> None:
-    tattoo_file: ImageFile | None = None
+def addQRCode(input_png: str | Path, output_png: str | Path, code: str, system: Emulator):
+    addQRCodeToBezelImage(Image.open(input_png), code, system).save(output_png)
 
+def tattooPath(system: Emulator) -> Path:
     if system.config['bezel.tattoo'] == 'system':
         tattoo_path = BATOCERA_SHARE_DIR / 'controller-overlays' / f'{system.name}.png'
-        try:
-            if not tattoo_path.exists():
-                tattoo_path = BATOCERA_SHARE_DIR / 'controller-overlays' / 'generic.png'
-            tattoo_file = Image.open(tattoo_path)
-        except Exception:
-            _logger.error("Error opening controller overlay: %s", tattoo_path)
-    elif system.config['bezel.tattoo'] == 'custom' and (tattoo_path := Path(system.config['bezel.tattoo_file'])).exists():
-        try:
-            tattoo_file = Image.open(tattoo_path)
-        except Exception:
-            _logger.error("Error opening custom file: %s", tattoo_path)
-    else:
-        tattoo_path = BATOCERA_SHARE_DIR / 'controller-overlays' / 'generic.png'
-        try:
-            tattoo_file = Image.open(tattoo_path)
-        except Exception:
-            _logger.error("Error opening custom file: %s", tattoo_path)
+        if not tattoo_path.exists():
+            tattoo_path = BATOCERA_SHARE_DIR / 'controller-overlays' / 'generic.png'
+        return tattoo_path
+
+    if system.config['bezel.tattoo'] == 'custom' and (tattoo_path := Path(system.config['bezel.tattoo_file'])).exists():
+        return tattoo_path
+
+    return BATOCERA_SHARE_DIR / 'controller-overlays' / 'generic.png'
+
+def tattooBezelImage(image: Image.Image, system: Emulator) -> Image.Image:
+    tattoo_file: ImageFile | None = None
+
+    tattoo_path = tattooPath(system)
+    try:
+        tattoo_file = Image.open(tattoo_path)
+    except Exception:
+        _logger.error("Error opening tattoo file: %s", tattoo_path)
 
     if tattoo_file is None:
         raise BatoceraException(f'Tattoo image could not be opened: {tattoo_path}')
 
-    # Open the existing bezel...
-    back = Image.open(input_png)
     # Convert it otherwise it implodes later on...
-    back = back.convert("RGBA")
+    back = image.convert("RGBA")
     tattoo = tattoo_file.convert("RGBA")
     # Quickly grab the sizes.
-    w,h = fast_image_size(input_png)
-    tw,th = fast_image_size(tattoo_path)
+    w,h = back.size
+    tw,th = tattoo.size
     if not system.config.get_bool("bezel.resize_tattoo", True):
         # Maintain the image's original size.
         # Failsafe for if the image is too large.
@@ -260,21 +335,19 @@ def tatooImage(input_png: Path, output_png: Path, system: Emulator) -> None:
         tattooCanvas.paste(tattoo, (0,h-th-margin))
     else: # default = NW
         tattooCanvas.paste(tattoo, (0,margin))
-    back = Image.alpha_composite(back, tattooCanvas)
+    return Image.alpha_composite(back, tattooCanvas)
 
-    imgnew = Image.new("RGBA", (w,h), (0,0,0,255))
-    imgnew.paste(back, (0,0,w,h))
-    imgnew.save(output_png, mode="RGBA", format="PNG")
+def tatooImage(input_png: Path, output_png: Path, system: Emulator) -> None:
+    tattooBezelImage(Image.open(input_png), system).save(output_png, mode="RGBA", format="PNG")
 
-def alphaPaste(input_png: str | Path, output_png: str | Path, imgin: ImageFile, fillcolor: str, screensize: tuple[int, int], bezel_stretch: bool) -> None:
+def alphaPasteBezelImage(imgin: Image.Image, fillcolor: str, screensize: tuple[int, int], bezel_stretch: bool) -> Image.Image:
     # screensize=(screen_width, screen_height)
-    imgin = Image.open(input_png)
     # TheBezelProject have Palette + alpha, not RGBA. PIL can't convert from P+A to RGBA.
     # Even if it can load P+A, it can't save P+A as PNG. So we have to recreate a new image to adapt it.
     if 'transparency' not in imgin.info:
         raise BatoceraException("No transparent pixels in the bezel image")
     alpha = imgin.split()[-1]  # alpha from original palette + alpha
-    ix,iy = fast_image_size(input_png)
+    ix,iy = imgin.size
     sx,sy = screensize
     i_ratio = (float(ix) / float(iy))
     s_ratio = (float(sx) / float(sy))
@@ -291,9 +364,11 @@ def alphaPaste(input_png: str | Path, output_png: str | Path, imgin: ImageFile,
     imgnew = Image.new("RGBA", (ix,iy), (0,0,0,255))
     imgnew.paste(alpha, (0,0,ix,iy))
     if bezel_stretch:
-        imgout = ImageOps.fit(imgnew, screensize)
-    else:
-        imgout = ImageOps.pad(imgnew, screensize, color=fillcolor, centering=(0.5,0.5))
+        return ImageOps.fit(imgnew, screensize)
+    return ImageOps.pad(imgnew, screensize, color=fillcolor, centering=(0.5,0.5))
+
+def alphaPaste(input_png: str | Path, output_png: str | Path, imgin: ImageFile, fillcolor: str, screensize: tuple[int, int], bezel_stretch: bool) -> None:
+    imgout = alphaPasteBezelImage(Image.open(input_png), fillcolor, screensize, bezel_stretch)
     imgout.save(output_png, mode="RGBA", format="PNG")
 
 def gunBordersSize(bordersSize: str | None) -> tuple[int, int]:
@@ -305,7 +380,7 @@ def gunBordersSize(bordersSize: str | None) -> tuple[int, int]:
         return 2, 1
     return 0, 0
 
-def gunBorderImage(input_png: str | Path, output_png: str | Path, aspect_ratio: str | None, innerBorderSizePer: int = 2, outerBorderSizePer: int = 3, innerBorderColor: str = "#ffffff", outerBorderColor: str = "#000000") -> int:
+def gunBorderBezelImage(image: Image.Image, aspect_ratio: str | None, innerBorderSizePer: int = 2, outerBorderSizePer: int = 3, innerBorderColor: str = "#ffffff", outerBorderColor: str = "#000000") -> tuple[Image.Image, int]:
     # good default border that works in most circumstances is:
     #
     # 2% of the screen width in white.  Surrounded by 3% screen width of
@@ -322,9 +397,7 @@ def gunBorderImage(input_png: str | Path, output_png: str | Path, aspect_ratio:
     # If all the games are drawn with the border this way then the settings
     # are static and the adjustment only needs to be calculated once.
 
-    from PIL import ImageDraw
-    w,h = fast_image_size(input_png)
-
+    w,h = image.size
     # Calculate new width for 4:3 aspect ratio if a widescreen resolution
     if abs(w / h - 4 / 3) < 0.01:
         new_w = w
@@ -358,17 +431,21 @@ def gunBorderImage(input_png: str | Path, output_png: str | Path, aspect_ratio:
         [(offset_x + outerBorderSize, outerBorderSize), (offset_x + outerBorderSize + innerBorderSize, h - outerBorderSize)]
     ]
 
-    back = Image.open(input_png)
     imgnew = Image.new("RGBA", (w,h), (0,0,0,255))
-    imgnew.paste(back, (0,0,w,h))
+    imgnew.paste(image, (0,0,w,h))
     imgnewdraw = ImageDraw.Draw(imgnew)
     for shape in outerShapes:
         imgnewdraw.rectangle(shape, fill=outerBorderColor)
     for shape in innerShapes:
         imgnewdraw.rectangle(shape, fill=innerBorderColor)
+
+    return imgnew, outerBorderSize + innerBorderSize
+
+def gunBorderImage(input_png: str | Path, output_png: str | Path, aspect_ratio: str | None, innerBorderSizePer: int = 2, outerBorderSizePer: int = 3, innerBorderColor: str = "#ffffff", outerBorderColor: str = "#000000") -> int:
+    imgnew, bordersSize = gunBorderBezelImage(Image.open(input_png), aspect_ratio, innerBorderSizePer, outerBorderSizePer, innerBorderColor, outerBorderColor)
     imgnew.save(output_png, mode="RGBA", format="PNG")
 
-    return outerBorderSize + innerBorderSize
+    return bordersSize
 
 def gunsBorderSize(w: int, h: int, innerBorderSizePer: int = 2, outerBorderSizePer: int = 3) -> int:
     return (w * (innerBorderSizePer + outerBorderSizePer)) // 100
@@ -385,6 +462,39 @@ def gunsBordersColorFomConfig(config: SystemConfig) -> str:
             return "#ffffff"
     return "#ffffff"
 
+def _bezelCacheFile(key: Hashable) -> Path:
+    return _BEZEL_CACHE_DIR / f'{hashlib.sha256(repr(key).encode()).hexdigest()[:32]}.png'
+
+def getCachedBezel(key: Hashable) -> Path | None:
+    cache_file = _bezelCacheFile(key)
+    if not cache_file.exists():
+        return None
+
+    _logger.debug("bezel cache: hit %s", cache_file)
+    try:
+        os.utime(cache_file)  # most recently used
+    except OSError:
+        pass
+    return cache_file
+
+def cacheBezel(key: Hashable, png: Path) -> None:
+    cache_file = _bezelCacheFile(key)
+    tmp_file = cache_file.with_name(f'{cache_file.name}.tmp')
+
+    try:
+        _BEZEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(png, tmp_file)
+        tmp_file.replace(cache_file)
+        _logger.debug("bezel cache: stored %s as %s", png, cache_file)
+
+        # keep only the most recently used bezels
+        cached_files = sorted(_BEZEL_CACHE_DIR.glob('*.png'), key=lambda file: file.stat().st_mtime, reverse=True)
+        for cached_file in cached_files[_BEZEL_CACHE_MAX_FILES:]:
+            cached_file.unlink(missing_ok=True)
+    except OSError as e:
+        _logger.warning("bezel cache: unable to store %s: %s", png, e)
+        tmp_file.unlink(missing_ok=True)
+
 def createTransparentBezel(output_png: Path, width: int, height: int) -> None:
     from PIL import ImageDraw
     imgnew = Image.new("RGBA", (width,height), (0,0,0,0))
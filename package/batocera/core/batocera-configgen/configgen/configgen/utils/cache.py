@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import re
+from pathlib import Path
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable
+
+_logger = logging.getLogger(__name__)
+
+# /var/run is a tmpfs: caches stored here are dropped on reboot (and thus on upgrade)
+CONFIGGEN_CACHE_DIR: Final = Path('/var/run/configgen-cache')
+
+_MISSING: Final = object()
+
+type FileSignature = tuple[str, int, int] | tuple[str, None, None] | tuple[str, int, int, int, int, str]
+
+
+def _cache_file(directory: Path, name: str, /) -> Path:
+    return directory / f"{re.sub(r'[^A-Za-z0-9_.-]+', '_', name)}.pickle"
+
+
+def file_signature(*paths: Path, content: bool = False) -> tuple[FileSignature, ...]:
+    """
+    Returns a hashable value which changes as soon as one of the files is created, removed or modified.
+
+    The mtime has a 2 s granularity on FAT/exFAT (ie /userdata), so a same length edit may not change it: with
+    `content`, for small files edited by the users, the inode, the ctime and a hash of the content are added.
+    """
+    signature: list[FileSignature] = []
+
+    for path in paths:
+        try:
+            stat = path.stat()
+            if content:
+                digest = hashlib.blake2b(path.read_bytes(), digest_size=16).hexdigest()
+        except OSError:
+            signature.append((str(path), None, None))
+        else:
+            if content:
+                signature.append((str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino, stat.st_ctime_ns, digest))
+            else:
+                signature.append((str(path), stat.st_mtime_ns, stat.st_size))
+
+    return tuple(signature)
+
+
+def _load(directory: Path, name: str, key: Hashable, /) -> object:
+    cache_file = _cache_file(directory, name)
+
+    try:
+        with cache_file.open('rb') as f:
+            cached_key, value = pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        _logger.debug('cache %s: unable to read %s: %s', name, cache_file, e)
+    else:
+        if cached_key == key:
+            _logger.debug('cache %s: hit', name)
+            return value
+
+    _logger.debug('cache %s: miss', name)
+    return _MISSING
+
+
+def load_cached[T](name: str, key: Hashable, build: Callable[[], T], /, *, directory: Path = CONFIGGEN_CACHE_DIR) -> T:
+    """
+    Returns the value stored in the cache `name` if it was stored with the same `key`,
+    otherwise calls `build()`, stores its result with `key` and returns it.
+
+    Any error while reading or writing the cache falls back to `build()`.
+    """
+    if (value := _load(directory, name, key)) is not _MISSING:
+        return value  # pyright: ignore[reportReturnType]
+
+    value = build()
+    store(name, key, value, directory=directory)
+
+    return value
+
+
+def is_cached(name: str, key: Hashable, /, *, directory: Path = CONFIGGEN_CACHE_DIR) -> bool:
+    """Returns True if the cache `name` was stored with the same `key`."""
+    return _load(directory, name, key) is not _MISSING
+
+
+def store(name: str, key: Hashable, value: object, /, *, directory: Path = CONFIGGEN_CACHE_DIR) -> None:
+    import tempfile
+
+    cache_file = _cache_file(directory, name)
+    tmp_file: Path | None = None
+
+    try:
+        # only readable by root: some caches hold the values of batocera.conf, passwords included
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        # a temporary file per call (0600), as several threads may store the same cache at once
+        fd, tmp_name = tempfile.mkstemp(prefix=f'{cache_file.name}.', suffix='.tmp', dir=directory)
+        tmp_file = Path(tmp_name)
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump((key, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(cache_file)
+    except Exception as e:
+        _logger.debug('cache %s: unable to write %s: %s', name, cache_file, e)
+        if tmp_file is not None:
+            tmp_file.unlink(missing_ok=True)
+
+
+def invalidate(name: str, /, *, directory: Path = CONFIGGEN_CACHE_DIR) -> None:
+    _cache_file(directory, name).unlink(missing_ok=True)
@@ -10,9 +10,11 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Final, Literal, NotRequired, TypedDict, cast
 
 from ..batoceraPaths import CONFIGS, EVMAPY
+from .cache import file_signature, load_cached
+from .inputDevices import get_device_inventory
 
 if TYPE_CHECKING:
-    from collections.abc import Container, Mapping
+    from collections.abc import Container, Iterable, Mapping
     from types import TracebackType
 
     from ..controller import Controller, Controllers
@@ -87,10 +89,68 @@ def _keys_mouse_action_to_evmapy_action(
     )
 
 
+def _merge_keys_files(files: Iterable[Path], /) -> _KeysConfig:
+    files = list(files)
+
+    if len(files) == 1:
+        return json.loads(files[0].read_text())
+
+    merged_unique_values: dict[str, dict[str, _KeysAction | _KeysMouseAction]] = defaultdict(dict)
+
+    for file in files:
+        values: _KeysConfig = json.loads(file.read_text())
+
+        for player_actions in values:
+            for action in values[player_actions]:
+                # merge multiple trigger keys list in a single ordered key
+                if isinstance(action['trigger'], list):
+                    action['trigger'].sort()
+                    trigger = '-'.join(action['trigger'])
+                else:
+                    trigger = action['trigger']
+
+                if trigger not in merged_unique_values[player_actions]:
+                    merged_unique_values[player_actions][trigger] = action
+
+    return {
+        player_actions: list(actions.values())
+        for player_actions, actions in merged_unique_values.items()
+    }
+
+
+def _action_targets(actions: Iterable[_EvmapyAction], /) -> frozenset[str]:
+    # the keys and mouse axes evmapy has to emit for these actions
+    targets: set[str] = set()
+
+    for action in actions:
+        if action['type'] == 'key':
+            targets.update(action['target'] if isinstance(action['target'], list) else [action['target']])
+        elif action['type'] == 'mouse':
+            targets.add(f'mouse:{action["target"]}')
+
+    return frozenset(targets)
+
+
+def _write_if_changed(path: Path, content: str, /) -> bool:
+    try:
+        if path.read_text() == content:
+            return False
+    except OSError:
+        pass
+
+    path.write_text(content)
+    return True
+
+
 @dataclass(slots=True)
 class evmapy(AbstractContextManager[None, None]):
     # evmapy is a process that map pads to keyboards (for pygame for example)
     __started: bool = field(init=False, default=False)
+    __keys_file: Path | None = field(init=False, default=None)
+    __pad_action_config: _KeysConfig = field(init=False, default_factory=dict)
+    # config file name -> keys emitted by the actions of the device
+    __targets: dict[str, frozenset[str]] = field(init=False, default_factory=dict)
+    __started_targets: frozenset[str] = field(init=False, default=frozenset())
 
     system: str
     emulator: str
@@ -113,39 +173,38 @@ class evmapy(AbstractContextManager[None, None]):
     ) -> None:
         if self.__started:
             self.__started = False
+            # the device files are kept, the next launch only rewrites the ones which changed
             subprocess.call(['batocera-evmapy', 'stop'])
-            subprocess.call(['batocera-evmapy', 'clear'])
 
-    def __build_merged_keys_file(self) -> Path | None:
+    def __load_keys(self) -> tuple[Path, _KeysConfig] | None:
         # consider files here in this order to get a configuration
-        files_to_merge = [
-            keys_file
-            for keys_file in [
-                # {rom}.keys form is forbidden for directories, it must be inside
-                (self.rom.parent / f'{self.rom.name}.keys') if not self.rom.is_dir() else (self.rom / 'padto.keys'),
-                # EVMAPY / f"{self.system}.{self.emulator}.{self.core}.keys",
-                # EVMAPY / f"{self.system}.{self.emulator}.keys",
-                EVMAPY / f'{self.system}.keys',
-                EVMAPY / f'{self.emulator}.keys',
-                EVMAPY / 'any.keys',
-                # _EVMAPY_SHARE_DIR / f"{self.system}.{self.emulator}.{self.core}.keys" ,
-                _EVMAPY_SHARE_DIR / f'{self.system}.{self.emulator}.keys',
-                _EVMAPY_SHARE_DIR / f'{self.system}.keys',
-                _EVMAPY_SHARE_DIR / f'{self.emulator}.keys',
-                _EVMAPY_SHARE_DIR / 'any.keys',
-            ]
-            if keys_file.exists()
+        candidates = [
+            # {rom}.keys form is forbidden for directories, it must be inside
+            (self.rom.parent / f'{self.rom.name}.keys') if not self.rom.is_dir() else (self.rom / 'padto.keys'),
+            # EVMAPY / f"{self.system}.{self.emulator}.{self.core}.keys",
+            # EVMAPY / f"{self.system}.{self.emulator}.keys",
+            EVMAPY / f'{self.system}.keys',
+            EVMAPY / f'{self.emulator}.keys',
+            EVMAPY / 'any.keys',
+            # _EVMAPY_SHARE_DIR / f"{self.system}.{self.emulator}.{self.core}.keys" ,
+            _EVMAPY_SHARE_DIR / f'{self.system}.{self.emulator}.keys',
+            _EVMAPY_SHARE_DIR / f'{self.system}.keys',
+            _EVMAPY_SHARE_DIR / f'{self.emulator}.keys',
+            _EVMAPY_SHARE_DIR / 'any.keys',
         ]
 
         # merge conditionnally on the global hotkeys file until it is set everywhere
-        keys_file = _EVMAPY_SHARE_DIR / 'hotkeys.keys'
-        user_keys_file = CONFIGS / 'hotkeys.keys'  # prefer the custom one
+        hotkeys_files = [
+            CONFIGS / 'hotkeys.keys',  # prefer the custom one
+            _EVMAPY_SHARE_DIR / 'hotkeys.keys',
+        ]
 
-        if user_keys_file.exists():
-            keys_file = user_keys_file
+        signature = file_signature(*candidates, *hotkeys_files)
+        existing = [Path(path) for path, mtime, _ in signature if mtime is not None]
 
-        if keys_file.exists():
-            files_to_merge.append(keys_file)
+        files_to_merge = [keys_file for keys_file in candidates if keys_file in existing]
+        if (hotkeys_file := next((file for file in hotkeys_files if file in existing), None)) is not None:
+            files_to_merge.append(hotkeys_file)
 
         if not files_to_merge:
             _logger.debug('no files to merge')
@@ -153,50 +212,36 @@ class evmapy(AbstractContextManager[None, None]):
 
         _logger.debug('files to merge : %s', files_to_merge)
 
+        # the merged keys only change with the files, so they are only merged again when one of them changes
+        keys_config = load_cached(
+            f'evmapy-keys-{self.system}-{self.emulator}', signature, lambda: _merge_keys_files(files_to_merge)
+        )
+
         if len(files_to_merge) == 1:
-            return files_to_merge[0]
+            return files_to_merge[0], keys_config
 
+        # kept for troubleshooting, evmapy only reads the device files
         merged_file = Path('/var/run/evmapy_merged.keys')
+        _write_if_changed(merged_file, json.dumps(keys_config, indent=2))
 
-        merged_unique_values: dict[str, dict[str, _KeysAction | _KeysMouseAction]] = defaultdict(dict)
-
-        for file in files_to_merge:
-            values: _KeysConfig = json.loads(file.read_text())
-
-            for player_actions in values:
-                for action in values[player_actions]:
-                    # merge multiple trigger keys list in a single ordered key
-                    if isinstance(action['trigger'], list):
-                        action['trigger'].sort()
-                        trigger = '-'.join(action['trigger'])
-                    else:
-                        trigger = action['trigger']
-
-                    if trigger not in merged_unique_values[player_actions]:
-                        merged_unique_values[player_actions][trigger] = action
-
-        merged_values: _KeysConfig = defaultdict(list)
-
-        for player_actions in merged_unique_values:
-            for action in merged_unique_values[player_actions]:
-                merged_values[player_actions].append(merged_unique_values[player_actions][action])
-
-        merged_file.write_text(json.dumps(merged_values, indent=2))
-
-        return merged_file
+        return merged_file, keys_config
 
     def __prepare(self) -> bool:
-        keys_file = self.__build_merged_keys_file()
+        keys = self.__load_keys()
 
-        if keys_file is None:
+        if keys is None:
             # otherwise, preparation did nothing
             _logger.debug('no evmapy config file found for system=%s, emulator=%s', self.system, self.emulator)
             return False
 
+        keys_file, pad_action_config = keys
         _logger.debug('evmapy on %s', keys_file)
-        subprocess.call(['batocera-evmapy', 'clear'])
 
-        pad_action_config: _KeysConfig = json.loads(keys_file.read_text())
+        self.__keys_file = keys_file
+        self.__pad_action_config = pad_action_config
+        self.__targets = {}
+
+        _EVMAPY_RUN_DIR.mkdir(parents=True, exist_ok=True)
 
         # configure guns
         for ngun, gun in enumerate(self.guns, start=1):
@@ -208,8 +253,55 @@ class evmapy(AbstractContextManager[None, None]):
             if (actions := pad_action_config.get(f'actions_player{pad.player_number}')) is not None:
                 self.__write_controller_config(pad, actions, keys_file)
 
+        # instead of clearing the directory, only remove the files of the devices which are not configured anymore
+        for config_file in _EVMAPY_RUN_DIR.glob('*.json'):
+            if config_file.name not in self.__targets:
+                _logger.debug('removing the outdated evmapy config file %s', config_file)
+                config_file.unlink(missing_ok=True)
+
+        self.__started_targets = frozenset().union(*self.__targets.values())
+
         return True
 
+    def update_controllers(self, changes: Mapping[int, Controller | None], /) -> None:
+        """
+        Updates the configuration of the players whose controller changed (player number -> controller, or None
+        when disconnected) without rewriting the configuration of the other devices, then reloads evmapy.
+        """
+        if not self.__started or self.__keys_file is None:
+            return
+
+        controllers = {controller.player_number: controller for controller in self.controllers}
+
+        for player_number, controller in changes.items():
+            if (previous := controllers.pop(player_number, None)) is not None:
+                config_name = f'{Path(previous.device_path).name}.json'
+                self.__targets.pop(config_name, None)
+                (_EVMAPY_RUN_DIR / config_name).unlink(missing_ok=True)
+
+            if controller is not None:
+                controllers[player_number] = controller
+                if (actions := self.__pad_action_config.get(f'actions_player{controller.player_number}')) is not None:
+                    self.__write_controller_config(controller, actions, self.__keys_file)
+
+        self.controllers = sorted(controllers.values(), key=lambda controller: controller.player_number)
+
+        # evmapy drops the removed devices by itself and loads the configuration of the new ones when it receives
+        # SIGHUP, but its virtual keyboard only has the keys known when it started: restart it when new ones are needed
+        targets = frozenset().union(*self.__targets.values())
+        if targets <= self.__started_targets:
+            subprocess.call(['batocera-evmapy', 'reload'])
+        else:
+            subprocess.call(['batocera-evmapy', 'stop'])
+            subprocess.call(['batocera-evmapy', 'start'])
+            self.__started_targets = targets
+
+    def __write_config(self, config_file: Path, evmapy_config: _EvmapyConfig, /) -> None:
+        self.__targets[config_file.name] = _action_targets(evmapy_config['actions'])
+
+        if not _write_if_changed(config_file, json.dumps(evmapy_config, indent=2)):
+            _logger.debug('config file %s is unchanged', config_file)
+
     def __write_gun_config(self, gun: Gun, actions: _KeysActions, keys_file: Path, /) -> None:
         config_file = _EVMAPY_RUN_DIR / f'{Path(gun.node).name}.json'
         _logger.debug('config file for keysfile is %s (from %s) - gun', config_file, keys_file)
@@ -228,7 +320,7 @@ class evmapy(AbstractContextManager[None, None]):
             'grab': False,
         }
 
-        config_file.write_text(json.dumps(evmapy_config, indent=2))
+        self.__write_config(config_file, evmapy_config)
 
     def __write_controller_config(self, controller: Controller, keys_actions: _KeysActions, keys_file: Path, /) -> None:
         config_file = _EVMAPY_RUN_DIR / f'{Path(controller.device_path).name}.json'
@@ -409,7 +501,7 @@ class evmapy(AbstractContextManager[None, None]):
                 axis['min'], axis['max'] = self.__get_pad_min_max_axis_for_keys(axis['min'], axis['max'])
 
         # save config file
-        config_file.write_text(json.dumps(evmapy_config, indent=2))
+        self.__write_config(config_file, evmapy_config)
 
     def __get_mapping_for_triggers(
         self,
@@ -522,10 +614,7 @@ class evmapy(AbstractContextManager[None, None]):
         return trigger
 
     def __get_pad_min_max_axis(self, device_path: str, axis_code: int, /) -> tuple[int, int]:
-        import evdev
-
-        device = evdev.InputDevice(device_path)
-        capabilities = device.capabilities(False)
+        capabilities = get_device_inventory().capabilities(device_path)
 
         for event_type in capabilities:
             if event_type == 3:  # "EV_ABS"
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import subprocess
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final
+
+from .cache import file_signature, load_cached, store
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from .cache import FileSignature
+
+_logger = logging.getLogger(__name__)
+
+# scripts named like discord.async.sh are started without waiting for them
+_ASYNC_MARKER: Final = '.async'
+_CACHE_NAME: Final = 'hooks-scripts'
+_CACHE_VERSION: Final = 1
+
+
+@dataclass(slots=True)
+class _ScriptsDirectory:
+    signature: FileSignature
+    files: tuple[str, ...]
+    directories: tuple[str, ...]
+
+
+def _scan_directory(directory: Path, /) -> _ScriptsDirectory:
+    signature = file_signature(directory)[0]
+    files: list[str] = []
+    directories: list[str] = []
+
+    if signature[1] is not None:
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    (directories if entry.is_dir() else files).append(entry.name)
+        except OSError as e:
+            _logger.debug('unable to list the scripts of %s: %s', directory, e)
+
+    return _ScriptsDirectory(signature, tuple(sorted(files)), tuple(sorted(directories)))
+
+
+_directories: dict[Path, _ScriptsDirectory] | None = None
+
+
+def _list_scripts(folder: Path, /) -> list[Path]:
+    # the scripts tree is listed once, then each directory is only listed again when its signature changes
+    global _directories
+
+    if _directories is None:
+        _directories = load_cached(_CACHE_NAME, _CACHE_VERSION, dict)
+
+    scripts: list[Path] = []
+    changed = False
+    pending = [folder]
+
+    while pending:
+        directory = pending.pop()
+        known = _directories.get(directory)
+
+        if known is None or known.signature != file_signature(directory)[0]:
+            known = _directories[directory] = _scan_directory(directory)
+            changed = True
+
+        scripts.extend(directory / name for name in known.files)
+        pending.extend(directory / name for name in reversed(known.directories))
+
+    if changed:
+        store(_CACHE_NAME, _CACHE_VERSION, _directories)
+
+    return scripts
+
+
+@dataclass(slots=True)
+class _RunningHook:
+    script: Path
+    process: subprocess.Popen[bytes]
+    start: float
+
+
+def _wait(hooks: list[_RunningHook], timeout: float, /) -> None:
+    # the scripts run concurrently: each one is waited for until the deadline shared by all of them
+    for hook in hooks:
+        try:
+            returncode = hook.process.wait(
+                timeout=max(hook.start + timeout - time.perf_counter(), 0) if timeout else None
+            )
+        except subprocess.TimeoutExpired:
+            _logger.warning('external script %s still running after %ss, killing it', hook.script, timeout)
+            # the script runs in its own session: its children are killed with it
+            try:
+                os.killpg(hook.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            hook.process.wait()
+        else:
+            _logger.debug(
+                'external script %s exited with %s after %.1f ms',
+                hook.script,
+                returncode,
+                (time.perf_counter() - hook.start) * 1000,
+            )
+
+
+# the asynchronous scripts still running, reaped by the next run_hooks() call (e.g. at gameStop) once they are done;
+# those outliving the launch are reaped by init
+_background: list[subprocess.Popen[bytes]] = []
+
+
+def _reap_background() -> None:
+    _background[:] = [process for process in _background if process.poll() is None]
+
+
+def run_hooks(folders: Iterable[Path], event: str, args: Iterable[str | Path], /, *, timeout: float = 0) -> None:
+    """
+    Runs the executable files found in the folders (and their subfolders) with the event and args.
+
+    The scripts run concurrently and are waited for, unless marked as asynchronous (e.g. discord.async.sh).
+    A script still running after `timeout` seconds is killed, 0 meaning no timeout.
+    """
+    _reap_background()
+
+    arguments = list(args)
+    running: list[_RunningHook] = []
+
+    for folder in folders:
+        for script in _list_scripts(folder):
+            if not os.access(script, os.X_OK):
+                continue
+
+            command = [script, event, *arguments]
+
+            try:
+                if _ASYNC_MARKER in script.suffixes:
+                    _logger.debug('calling external script in the background: %s', command)
+                    _background.append(subprocess.Popen(command, start_new_session=True))
+                else:
+                    _logger.debug('calling external script: %s', command)
+                    running.append(
+                        _RunningHook(script, subprocess.Popen(command, start_new_session=True), time.perf_counter())
+                    )
+            except OSError as e:
+                _logger.error('unable to call the external script %s: %s', script, e)
+
+    _wait(running, timeout)
@@ -6,6 +6,8 @@ import subprocess
 from contextlib import contextmanager
 from typing import TYPE_CHECKING
 
+from .inputDevices import get_device_inventory
+
 if TYPE_CHECKING:
     from collections.abc import Generator as _Generator
 
@@ -51,10 +53,8 @@ def set_hotkeygen_context(generator: Generator, system: Emulator, /) -> _Generat
         subprocess.call(["hotkeygen", "--default-context"])
 
 def get_hotkeygen_event() -> str | None:
-    import evdev
-
-    for dev in evdev.list_devices():
-        input_device = evdev.InputDevice(dev)
-        if input_device.name == "batocera hotkeys":
-            return dev
+    # the name is known from udev, no need to open every event node
+    for device in get_device_inventory().devices.values():
+        if device.name == "batocera hotkeys":
+            return device.node
     return None
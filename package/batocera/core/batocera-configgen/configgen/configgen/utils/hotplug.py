@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import logging
+import struct
+import threading
+import time
+from typing import TYPE_CHECKING, Final
+
+from .inputDevices import get_device_inventory
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    import pyudev
+
+    from ..controller import Controller
+
+_logger = logging.getLogger(__name__)
+
+# a pad exposes several nodes (eventX, jsX, sensors...) and a bluetooth reconnection several add/remove:
+# the events are processed once no other event was received during _DEBOUNCE seconds
+_DEBOUNCE: Final = 0.3
+_MAX_DEBOUNCE: Final = 2.0
+_STOP_CHECK_INTERVAL: Final = 0.5
+
+
+def _crc16(data: bytes, /) -> int:
+    # CRC-16/ARC, as SDL_crc16()
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+def sdl_guid(bus: int, vendor: int, product: int, version: int, name: str, /) -> str:
+    """Returns the GUID SDL2 computes for a linux joystick (see SDL_CreateJoystickGUID())."""
+    encoded_name = name.encode()
+    crc = _crc16(encoded_name)
+
+    if vendor and product:
+        data = struct.pack('<HHHHHHHBB', bus, crc, vendor, 0, product, 0, version, 0, 0)
+    else:
+        data = struct.pack('<HH', bus, crc) + encoded_name[:11].ljust(12, b'\0')
+
+    return data.hex()
+
+
+def sdl_guid_from_udev(device: pyudev.Device, /) -> str | None:
+    """Returns the SDL2 GUID of an input event node from its udev properties, without opening it."""
+    parent = device.find_parent('input')
+    if parent is None:
+        return None
+
+    try:
+        bus, vendor, product, version = (int(value, 16) for value in parent.properties['PRODUCT'].split('/'))
+    except (KeyError, ValueError):
+        return None
+
+    return sdl_guid(bus, vendor, product, version, parent.properties.get('NAME', '').strip('"'))
+
+
+def _guid_key(guid: str, /) -> str:
+    # the name crc is not part of the GUID computed by older SDL versions, and the last two bytes hold the
+    # signature and data of the SDL driver (ie 'h' for HIDAPI, 'v' for virtual joysticks), unknown to udev
+    guid = guid.lower()
+    return guid[:4] + '0000' + guid[8:28] + '0000'
+
+
+def _vendor_product(guid: str, /) -> str | None:
+    # vendor and product ids, only set in the GUIDs of devices having them
+    guid = guid.lower()
+    if len(guid) != 32 or guid[12:16] != '0000' or guid[20:24] != '0000' or guid[8:12] == '0000' or guid[16:20] == '0000':
+        return None
+    return guid[8:12] + guid[16:20]
+
+
+def _is_joystick_event_node(device: pyudev.Device, /) -> bool:
+    return (
+        device.properties.get('ID_INPUT_JOYSTICK') == '1'
+        and device.sys_name.startswith('event')
+        and device.device_node is not None
+    )
+
+
+class ControllerHotplugMonitor:
+    """
+    Follows the (dis)connection of the players controllers while the emulator runs.
+
+    Bursts of udev events are coalesced, a connected event node is matched to the first disconnected player
+    having the same GUID, and `on_change` is called with the players (by player number) whose controller changed.
+    """
+
+    __slots__ = ('_active', '_initial', '_on_change', '_stopping', '_thread')
+
+    def __init__(
+        self,
+        controllers: Sequence[Controller | None],
+        on_change: Callable[[dict[int, Controller | None]], None],
+        /,
+    ) -> None:
+        self._initial = list(controllers)
+        self._active = list(controllers)
+        self._on_change = on_change
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self.__run, name='controller-hotplug', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def __run(self) -> None:
+        try:
+            import pyudev
+
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by(subsystem='input')
+            monitor.start()
+        except Exception as e:
+            _logger.error('unable to monitor the controllers: %s', e)
+            return
+
+        _logger.info('starting the controller hotplug monitor')
+
+        while not self._stopping.is_set():
+            device = monitor.poll(timeout=_STOP_CHECK_INTERVAL)
+            if device is None:
+                continue
+
+            # only the last event of each node matters
+            events: dict[str, pyudev.Device] = {}
+            deadline = time.monotonic() + _MAX_DEBOUNCE
+
+            while device is not None:
+                if _is_joystick_event_node(device):
+                    events[device.device_node] = device
+                if time.monotonic() > deadline:
+                    break
+                device = monitor.poll(timeout=_DEBOUNCE)
+
+            if events and not self._stopping.is_set():
+                get_device_inventory().refresh(events)
+
+                try:
+                    # the removed nodes are processed first, so that their players can be matched by new ones
+                    self.__apply(sorted(events.values(), key=lambda device: device.action != 'remove'))
+                except Exception as e:
+                    _logger.error('unable to apply the controllers changes: %s', e)
+
+    def __apply(self, devices: Iterable[pyudev.Device], /) -> None:
+        changes: dict[int, Controller | None] = {}
+
+        for device in devices:
+            node: str = device.device_node
+            _logger.debug('joystick %s: %s', device.action, node)
+
+            if device.action == 'remove':
+                for index, controller in enumerate(self._active):
+                    if controller is not None and controller.device_path == node:
+                        _logger.info('player %s controller disconnected (%s)', controller.player_number, node)
+                        self._active[index] = changes[controller.player_number] = None
+                continue
+
+            if any(controller is not None and controller.device_path == node for controller in self._active):
+                continue
+
+            if (guid := sdl_guid_from_udev(device)) is None:
+                continue
+
+            if (match := self.__match(device, guid)) is None:
+                _logger.info('no disconnected player controller matches %s (GUID: %s)', node, guid)
+                continue
+
+            index, initial = match
+            _logger.info('player %s controller reconnected (GUID: %s, path: %s)', initial.player_number, guid, node)
+            self._active[index] = changes[initial.player_number] = initial.replace(device_path=node)
+
+        if changes:
+            self._on_change(changes)
+
+    def __match(self, device: pyudev.Device, guid: str, /) -> tuple[int, Controller] | None:
+        disconnected = [
+            (index, initial) for index, initial in enumerate(self._initial)
+            if initial is not None and self._active[index] is None
+        ]
+
+        guid_key = _guid_key(guid)
+        for index, initial in disconnected:
+            if _guid_key(initial.guid) == guid_key:
+                return index, initial
+
+        # other fields may differ from the GUID SDL computed (ie another bus or version): fall back to the name
+        # and the vendor and product ids
+        if (vendor_product := _vendor_product(guid)) is None:
+            return None
+
+        parent = device.find_parent('input')
+        name = parent.properties.get('NAME', '').strip('"') if parent is not None else ''
+        for index, initial in disconnected:
+            if name in (initial.real_name, initial.name) and _vendor_product(initial.guid) == vendor_product:
+                return index, initial
+
+        return None
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+_logger = logging.getLogger(__name__)
+
+_EVENT_NODE_RE: Final = re.compile(r'^/dev/input/event([0-9]+)$')
+
+
+@dataclass(slots=True, frozen=True)
+class InputDeviceInfo:
+    node: str
+    event_id: int
+    sys_path: str
+    name: str  # the name of the parent input device, as reported by evdev
+    properties: Mapping[str, str]
+
+    def has_property(self, name: str, /) -> bool:
+        return self.properties.get(name) == '1'
+
+
+class DeviceInventory:
+    """
+    Snapshot of the /dev/input/event* nodes, shared by everything configuring devices during a launch.
+
+    The udev properties of all the nodes are read at once on the first use, while each node is only opened
+    (for its evdev capabilities) the first time they are asked for. `refresh()` drops the snapshot once the
+    devices changed (hotplug, virtual devices).
+    """
+
+    __slots__ = ('_capabilities', '_devices', '_lock')
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._devices: dict[str, InputDeviceInfo] | None = None
+        self._capabilities: dict[str, dict[int, list[Any]]] = {}
+
+    @property
+    def devices(self) -> Mapping[str, InputDeviceInfo]:
+        """The event nodes by path, in the udev enumeration order."""
+        with self._lock:
+            if self._devices is None:
+                self._devices = self.__enumerate()
+            return self._devices
+
+    def get(self, node: str, /) -> InputDeviceInfo | None:
+        return self.devices.get(node)
+
+    def capabilities(self, node: str, /) -> dict[int, list[Any]]:
+        """Returns the evdev capabilities of the node (as InputDevice.capabilities(), with the absinfo)."""
+        with self._lock:
+            if (capabilities := self._capabilities.get(node)) is None:
+                import evdev
+
+                device = evdev.InputDevice(node)
+                try:
+                    capabilities = self._capabilities[node] = device.capabilities()
+                finally:
+                    device.close()
+
+            return capabilities
+
+    def refresh(self, nodes: Iterable[str] | None = None, /) -> None:
+        """Drops the snapshot, and the capabilities of `nodes` (all of them by default)."""
+        with self._lock:
+            self._devices = None
+
+            if nodes is None:
+                self._capabilities.clear()
+            else:
+                for node in nodes:
+                    self._capabilities.pop(node, None)
+
+    def __enumerate(self) -> dict[str, InputDeviceInfo]:
+        import pyudev
+
+        devices: dict[str, InputDeviceInfo] = {}
+
+        for device in pyudev.Context().list_devices(subsystem='input'):
+            if device.device_node is None or (match := _EVENT_NODE_RE.match(device.device_node)) is None:
+                continue
+
+            parent = device.find_parent('input')
+            devices[device.device_node] = InputDeviceInfo(
+                node=device.device_node,
+                event_id=int(match.group(1)),
+                sys_path=device.sys_path,
+                name=parent.properties.get('NAME', '').strip('"') if parent is not None else '',
+                properties=dict(device.properties),
+            )
+
+        _logger.debug('input devices: %s', ', '.join(devices))
+
+        return devices
+
+
+_inventory: Final = DeviceInventory()
+
+
+def get_device_inventory() -> DeviceInventory:
+    return _inventory
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import atexit
 import errno
 import io
+import json
 import logging
+import queue
 import sys
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, TextIO
+from logging.handlers import QueueHandler, QueueListener
+from typing import TYPE_CHECKING, Any, TextIO
+
+from .. import profiler
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -87,13 +93,82 @@ class EpipeTolerantTextIO(io.TextIOBase):
         return self._raw.closed
 
 
+class LaunchContextFilter(logging.Filter):
+    """
+    Adds the launch id and the tracer span the record is logged from (see profiler),
+    so that the structured logs can be matched with /var/run/emulatorlauncher.trace.json.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.launch_id = profiler.launch_id()
+        record.span = profiler.current_span()
+        return True
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Queues the records as they are, to be formatted by the listener thread.
+
+    QueueHandler.prepare() formats the message in the caller thread and merges the exception into it, which
+    loses the `exception` field of the JSON lines.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as a single line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'location': f'{record.filename}:{record.lineno}',
+            'function': record.funcName,
+            'thread': record.threadName,
+            'launch_id': getattr(record, 'launch_id', None),
+            'span': getattr(record, 'span', None),
+            'message': record.getMessage(),
+        }
+
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+
+        return json.dumps(entry, default=str)
+
+
+_listener: QueueListener | None = None
+
+
+def stop_log_queue() -> None:
+    """Writes the records still queued and stops the queue thread, if any (ie before os._exit())."""
+    global _listener
+
+    if (listener := _listener) is not None:
+        _listener = None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.flush()
+
+
 @contextmanager
-def setup_logging() -> Generator[None]:
+def setup_logging(*, level: int = logging.DEBUG, json_lines: bool = False, queued: bool = False) -> Generator[None]:
     """
     Configure logging with EPIPE-tolerant stdout/stderr and handlers.
     - DEBUG..INFO to stdout
     - WARNING..CRITICAL to stderr
     Also replaces sys.stdout/sys.stderr to protect non-logging writes.
+
+    With `json_lines`, each record is written as a JSON object carrying the launch id and the tracer span.
+    With `queued`, the records are written by a background thread, the logging calls only enqueue them. The
+    records still queued are lost if the process is killed.
     """
     logger = logging.getLogger()
     original_handlers = list(logger.handlers)
@@ -105,7 +180,7 @@ def setup_logging() -> Generator[None]:
     sys.stderr = EpipeTolerantTextIO(sys.stderr)
 
     error_level = logging.WARNING
-    formatter = logging.Formatter(
+    formatter = JsonLinesFormatter() if json_lines else logging.Formatter(
         "%(asctime)s %(levelname)s (%(filename)s:%(lineno)d):%(funcName)s %(message)s"
     )
 
@@ -121,13 +196,36 @@ def setup_logging() -> Generator[None]:
     stderr_handler.setLevel(error_level)
     stderr_handler.setFormatter(formatter)
 
-    logger.setLevel(logging.DEBUG)
-    logger.addHandler(stdout_handler)
-    logger.addHandler(stderr_handler)
+    logger.setLevel(level)
+
+    global _listener
+
+    if queued:
+        # the records are formatted and written by the listener thread, the callers only enqueue them
+        records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+        _listener = QueueListener(records, stdout_handler, stderr_handler, respect_handler_level=True)
+        queue_handler = LazyQueueHandler(records)
+        queue_handler.addFilter(LaunchContextFilter())
+        logger.addHandler(queue_handler)
+        _listener.start()
+        # the records queued when exiting without leaving this context (ie sys.exit() from a thread) are written too
+        atexit.register(stop_log_queue)
+    else:
+        stdout_handler.addFilter(LaunchContextFilter())
+        stderr_handler.addFilter(LaunchContextFilter())
+        logger.addHandler(stdout_handler)
+        logger.addHandler(stderr_handler)
 
     try:
         yield
     finally:
+        # write the pending records before the handlers are closed
+        if queued:
+            stop_log_queue()
+            atexit.unregister(stop_log_queue)
+            for h in (stdout_handler, stderr_handler):
+                h.close()
+
         # Clean up logging handlers
         for h in logger.handlers[:]:
             try:
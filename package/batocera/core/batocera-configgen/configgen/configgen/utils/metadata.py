@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import logging
 import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Final
 
+from .cache import file_signature, load_cached
+
 _logger = logging.getLogger(__name__)
 
 # hardcoded list of system for arcade
@@ -47,17 +50,92 @@ def _short_name_from_path(path: str | Path) -> str:
             inblock = False
     return ret
 
-def _update_metadata_from_element(md: dict[str, str], element: ET.Element, /, extra_log_text: str = '') -> None:
-    for child in element:
-        for attrib_name, attrib_value in child.attrib.items():
-            key = f'{child.tag}_{attrib_name}'
-            md[key] = attrib_value
-            _logger.info("found game metadata %s=%s%s", key, attrib_value, extra_log_text)
+type _MetadataItems = tuple[tuple[str, str], ...]
+
+
+def _metadata_items_from_element(element: ET.Element, /) -> _MetadataItems:
+    return tuple(
+        (f'{child.tag}_{attrib_name}', attrib_value)
+        for child in element
+        for attrib_name, attrib_value in child.attrib.items()
+    )
+
+
+def _update_metadata_from_items(md: dict[str, str], items: _MetadataItems, /, extra_log_text: str = '') -> None:
+    for key, value in items:
+        md[key] = value
+        _logger.info("found game metadata %s=%s%s", key, value, extra_log_text)
+
+
+@dataclass(slots=True)
+class _SystemMetadata:
+    default: _MetadataItems | None = None
+    # game id -> (position of the game in the system, metadata), only the first game of a given id is kept
+    games: dict[str, tuple[int, _MetadataItems]] = field(default_factory=dict)
+    longest_game_id: int = 0
+
+    def find_game(self, game: str, /) -> _MetadataItems | None:
+        # the first game (in the database order) whose id is contained in the game name wins:
+        # look up each substring of the game name instead of testing each game id of the system
+        found: tuple[int, _MetadataItems] | None = None
+        game_length = len(game)
+
+        for start in range(game_length):
+            for end in range(start + 1, min(start + self.longest_game_id, game_length) + 1):
+                candidate = self.games.get(game[start:end])
+                if candidate is not None and (found is None or candidate[0] < found[0]):
+                    found = candidate
+
+        return found[1] if found is not None else None
+
+
+@dataclass(slots=True)
+class _MetadataIndex:
+    systems: list[_SystemMetadata] = field(default_factory=list)
+    # system id -> index in systems, in the database order
+    by_system: dict[str, list[int]] = field(default_factory=dict)
+
+
+def _build_index(db_xml: Path, /) -> _MetadataIndex:
+    index = _MetadataIndex()
+    root = ET.parse(db_xml).getroot()
+
+    for system_element in root.iterfind('./system[@id]'):
+        system_metadata = _SystemMetadata()
+
+        for position, game_element in enumerate(system_element.iterfind('./game[@id]')):
+            game_id = game_element.attrib['id']
+            if game_id == 'default':
+                if system_metadata.default is None:
+                    system_metadata.default = _metadata_items_from_element(game_element)
+            elif game_id not in system_metadata.games:
+                system_metadata.games[game_id] = (position, _metadata_items_from_element(game_element))
+                system_metadata.longest_game_id = max(system_metadata.longest_game_id, len(game_id))
+
+        for system_id in dict.fromkeys(system_element.attrib['id'].split(',')):
+            index.by_system.setdefault(system_id, []).append(len(index.systems))
+        index.systems.append(system_metadata)
+
+    return index
+
+
+_indexes: dict[Path, _MetadataIndex] = {}
+
+
+def _get_index(db_xml: Path, /) -> _MetadataIndex:
+    # the database is compiled once into an index, kept until the xml file changes
+    if (index := _indexes.get(db_xml)) is None:
+        index = _indexes[db_xml] = load_cached(
+            f'metadata-{db_xml}', file_signature(db_xml), lambda: _build_index(db_xml)
+        )
+
+    return index
+
 
 def get_games_meta_data(db_xml: str | Path, system: str, rom: str | Path) -> dict[str, str]:
     # load the database
-    tree = ET.parse(db_xml)
-    root: ET.Element = tree.getroot()
+    db_xml = Path(db_xml)
+    index = _get_index(db_xml)
     game = _short_name_from_path(rom)
     md: dict[str, str] = {}
 
@@ -65,18 +143,15 @@ def get_games_meta_data(db_xml: str | Path, system: str, rom: str | Path) -> dic
 
     target_system = 'arcade' if system in _ARCADE_SYSTEMS else system
 
-    for system_element in root.iterfind('./system[@id]'):
-        if target_system not in system_element.attrib['id'].split(','):
-            continue
+    for system_index in index.by_system.get(target_system, ()):
+        system_metadata = index.systems[system_index]
 
         # search the game named default
-        if (default_element := system_element.find('./game[@id="default"]')) is not None:
-            _update_metadata_from_element(md, default_element, extra_log_text=' (system level)')
+        if system_metadata.default is not None:
+            _update_metadata_from_items(md, system_metadata.default, extra_log_text=' (system level)')
 
-        for game_element in system_element.iterfind('./game[@id!="default"]'):
-            if game_element.attrib['id'] not in game:
-                continue
-            _update_metadata_from_element(md, game_element)
+        if (game_items := system_metadata.find_game(game)) is not None:
+            _update_metadata_from_items(md, game_items)
             return md
 
     return md
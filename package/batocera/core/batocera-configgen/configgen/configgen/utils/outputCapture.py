@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import logging
+import threading
+from collections import deque
+from typing import IO, TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_logger = logging.getLogger(__name__)
+
+_READ_SIZE: Final = 64 * 1024
+
+
+class _RingBuffer:
+    """Keeps the last `max_bytes` bytes written to it."""
+
+    __slots__ = ('_chunks', '_max_bytes', '_size')
+
+    def __init__(self, max_bytes: int, /) -> None:
+        self._max_bytes = max_bytes
+        self._chunks: deque[bytes] = deque()
+        self._size = 0
+
+    def write(self, data: bytes, /) -> None:
+        self._chunks.append(data)
+        self._size += len(data)
+
+        while self._size - len(self._chunks[0]) >= self._max_bytes:
+            self._size -= len(self._chunks.popleft())
+
+    def getvalue(self) -> bytes:
+        return b''.join(self._chunks)[-self._max_bytes:]
+
+
+class OutputCapture:
+    """
+    Drains a pipe in a background thread while the process runs.
+
+    Only the last `tail_bytes` bytes of the output are kept in memory, instead of holding the whole output of the
+    process until it exits, and they are written to the log file once the output ends: nothing is written to the
+    disk while the game runs.
+    """
+
+    __slots__ = ('_log_file', '_pipe', '_tail', '_thread')
+
+    def __init__(self, pipe: IO[bytes], log_file: Path, /, *, tail_bytes: int) -> None:
+        self._pipe = pipe
+        self._log_file = log_file
+        self._tail = _RingBuffer(tail_bytes)
+        self._thread = threading.Thread(target=self.__drain, name=f'capture-{log_file.stem}', daemon=True)
+        self._thread.start()
+
+    def __drain(self) -> None:
+        try:
+            while data := self._pipe.read1(_READ_SIZE):  # pyright: ignore[reportAttributeAccessIssue]
+                self._tail.write(data)
+        except (OSError, ValueError) as e:
+            _logger.debug('stopped capturing the emulator output: %s', e)
+
+    def join(self) -> str:
+        """Waits for the end of the output, writes its tail to the log file and returns it."""
+        self._thread.join()
+        tail = self._tail.getvalue()
+
+        try:
+            self._log_file.parent.mkdir(parents=True, exist_ok=True)
+            self._log_file.write_bytes(tail)
+        except OSError as e:
+            _logger.warning('unable to write the emulator output log %s: %s', self._log_file, e)
+
+        return tail.decode(errors='backslashreplace')
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import logging
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Final, Self
+
+from .. import profiler
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from types import TracebackType
+
+_logger = logging.getLogger(__name__)
+
+# the prelaunch steps are mostly waiting for subprocesses and files
+_MAX_WORKERS: Final = 4
+
+
+class TaskScheduler:
+    """
+    Runs named steps in a thread pool, a step starting once the steps it depends on are done.
+
+    A step may only depend on steps submitted before it, so the steps waiting for others never
+    prevent those from running. When not parallel, each step runs in the caller thread when submitted.
+    Exceptions raised by a step are raised again by `result()`.
+    """
+
+    __slots__ = ('_executor', '_futures', 'timings')
+
+    def __init__(self, parallel: bool, /) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS, thread_name_prefix='prelaunch') if parallel else None
+        self._futures: dict[str, Future[Any]] = {}
+        # step name -> duration in ms
+        self.timings: dict[str, float] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+        /,
+    ) -> None:
+        self.close()
+
+    @property
+    def parallel(self) -> bool:
+        return self._executor is not None
+
+    def submit[T](self, name: str, fn: Callable[[], T], /, *, after: Iterable[str] = ()) -> Future[T]:
+        if name in self._futures:
+            raise ValueError(f'step {name} already submitted')
+
+        dependencies = [self._futures[dependency] for dependency in after]
+
+        def run() -> T:
+            for dependency in dependencies:
+                dependency.result()
+
+            start = time.perf_counter()
+            try:
+                with profiler.span(name):
+                    return fn()
+            finally:
+                self.timings[name] = duration = (time.perf_counter() - start) * 1000
+                _logger.debug('prelaunch step %s took %.1f ms', name, duration)
+
+        if self._executor is not None:
+            future = self._executor.submit(run)
+        else:
+            future: Future[T] = Future()
+            try:
+                future.set_result(run())
+            except Exception as e:
+                future.set_exception(e)
+
+        self._futures[name] = future
+        return future
+
+    def result(self, name: str, /) -> Any:
+        return self._futures[name].result()
+
+    def wait_all(self) -> None:
+        # raises the exception of the first failed step
+        for future in list(self._futures.values()):
+            future.result()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import fcntl
+import json
 import logging
+import os
 import subprocess
+import sys
+import time
 from contextlib import contextmanager
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import TYPE_CHECKING, Final
 
@@ -16,27 +22,64 @@ _logger = logging.getLogger(__name__)
 
 _SQUASHFS_DIR: Final = Path("/var/run/squashfs/")
 
+# images kept mounted from a launch to another when the mount cache is enabled
+_MOUNT_CACHE_FILE: Final = Path("/var/run/squashfs-cache.json")
+_MOUNT_CACHE_LOCK: Final = Path("/var/run/squashfs-cache.lock")
+# held by the reaper as long as it runs, so that a single one runs at once
+_REAPER_LOCK: Final = Path("/var/run/squashfs-reaper.lock")
 
-@contextmanager
-def mount_squashfs(rom: Path, /) -> Generator[Path]:
-    _logger.debug("mount_squashfs(%s)", rom)
-    mount_point = _SQUASHFS_DIR / rom.stem
 
-    mkdir_if_not_exists(_SQUASHFS_DIR)
+@dataclass(slots=True)
+class _CachedMount:
+    image: str
+    signature: list[int]  # mtime_ns and size of the image when it was mounted
+    rom: str  # the path given to the emulator
+    last_used: float
+    pid: int | None  # the configgen process using it, if any
+
+
+def _image_signature(image: Path, /) -> list[int]:
+    stat = image.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+@contextmanager
+def _mount_cache() -> Generator[dict[str, _CachedMount]]:
+    # the cache is shared by configgen and the reaper, so it is only read and written while locked
+    with _MOUNT_CACHE_LOCK.open("a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
 
-    # first, try to clean an empty remaining directory (for example because of a crash)
-    if mount_point.exists() and mount_point.is_dir():
-        _logger.debug("squashfs_rom: %s already exists", mount_point)
-        # try to remove an empty directory, else, run the directory, ignoring the .squashfs
         try:
-            mount_point.rmdir()
-        except (FileNotFoundError, OSError):
-            _logger.debug("squashfs_rom: failed to rmdir %s", mount_point)
-            yield mount_point
-            # No cleanup is necessary
-            return
+            mounts = {
+                mount_point: _CachedMount(**entry)
+                for mount_point, entry in json.loads(_MOUNT_CACHE_FILE.read_text()).items()
+            }
+        except (OSError, ValueError, TypeError):
+            mounts = {}
 
-    # ok, the base directory doesn't exist, let's create it and mount the squashfs on it
+        yield mounts
+
+        if mounts:
+            _MOUNT_CACHE_FILE.write_text(json.dumps({mount_point: asdict(mount) for mount_point, mount in mounts.items()}))
+        else:
+            _MOUNT_CACHE_FILE.unlink(missing_ok=True)
+
+
+def _in_use(mount: _CachedMount, /) -> bool:
+    if mount.pid is None:
+        return False
+
+    try:
+        os.kill(mount.pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+
+
+def _mount(rom: Path, mount_point: Path, /) -> Path:
     mount_point.mkdir()
 
     return_code = subprocess.call(["mount", rom, mount_point])
@@ -53,23 +96,209 @@ def mount_squashfs(rom: Path, /) -> Generator[Path]:
         rom_single = mount_point / rom.stem
         if len(list(mount_point.iterdir())) == 1 and rom_single.exists():
             _logger.debug("squashfs: single rom %s", rom_single)
-            yield rom_single
+            return rom_single
+
+        try:
+            rom_linked = (mount_point / ".ROM").resolve(strict=True)
+        except OSError:
+            return mount_point
+    except BaseException:
+        _unmount(mount_point)
+        raise
+
+    _logger.debug("squashfs: linked rom %s", rom_linked)
+    return rom_linked
+
+
+def _unmount(mount_point: Path, /) -> bool:
+    if mount_point.is_mount():
+        return_code = subprocess.call(["umount", mount_point])
+        if return_code != 0:
+            _logger.debug("mount_squashfs: unmounting %s failed", mount_point)
+            return False
+
+    # cleaning the empty directory
+    try:
+        mount_point.rmdir()
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        _logger.debug("mount_squashfs: removing %s failed: %s", mount_point, e)
+        return False
+
+    return True
+
+
+def _reap(mounts: dict[str, _CachedMount], /, *, keep: int | None, idle_timeout: float) -> None:
+    # unmounts the least recently used images beyond `keep` and the ones unused for `idle_timeout` seconds
+    now = time.time()
+    unused = sorted(
+        (mount_point for mount_point, mount in mounts.items() if not _in_use(mount)),
+        key=lambda mount_point: mounts[mount_point].last_used,
+        reverse=True,
+    )
+
+    for index, mount_point in enumerate(unused):
+        if (keep is None or index < keep) and (idle_timeout <= 0 or now - mounts[mount_point].last_used < idle_timeout):
+            continue
+
+        _logger.debug("squashfs cache: unmounting %s", mount_point)
+        if _unmount(Path(mount_point)):
+            del mounts[mount_point]
+
+
+def _reaper_running() -> bool:
+    with _REAPER_LOCK.open("a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+
+    return False
+
+
+def _start_reaper(idle_timeout: float, /) -> None:
+    # unmounts the images still unused once the idle timeout is reached, after configgen exited
+    if _reaper_running():
+        _logger.debug("squashfs cache: the reaper is already running")
+        return
+
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", __name__, str(idle_timeout)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        _logger.warning("unable to start the squashfs cache reaper: %s", e)
+
+
+@contextmanager
+def _mount_squashfs_cached(rom: Path, mount_point: Path, cache_size: int, idle_timeout: float, /) -> Generator[Path]:
+    signature = _image_signature(rom)
+    key = str(mount_point)
+
+    with _mount_cache() as mounts:
+        cached = mounts.get(key)
+
+        if cached is not None and not (
+            cached.image == str(rom) and cached.signature == signature and mount_point.is_mount()
+        ):
+            _logger.debug("squashfs cache: %s is outdated", mount_point)
+            if not _unmount(mount_point):
+                raise BatoceraException(f"Unable to unmount the file {mount_point}")
+            del mounts[key]
+            cached = None
+
+        if cached is None and mount_point.exists() and not _unmount(mount_point):
+            # a remaining directory (for example because of a crash) is not known by the cache: as without the
+            # cache, run the directory, ignoring the .squashfs
+            _logger.debug("squashfs cache: unable to clean %s, running it", mount_point)
+            rom_path = None
         else:
-            try:
-                rom_linked = (mount_point / ".ROM").resolve(strict=True)
-            except OSError:
-                yield mount_point
+            if cached is None:
+                cached = mounts[key] = _CachedMount(str(rom), signature, str(_mount(rom, mount_point)), time.time(), None)
             else:
-                _logger.debug("squashfs: linked rom %s", rom_linked)
-                yield rom_linked
+                _logger.debug("squashfs cache: reusing %s", mount_point)
+
+            cached.pid = os.getpid()
+            rom_path = Path(cached.rom)
+
+    if rom_path is None:
+        yield mount_point
+        return
+
+    try:
+        yield rom_path
+    finally:
+        with _mount_cache() as mounts:
+            if (cached := mounts.get(key)) is not None:
+                cached.pid = None
+                cached.last_used = time.time()
+
+            _reap(mounts, keep=cache_size, idle_timeout=idle_timeout)
+
+            # started while the cache is locked, as the reaper only exits once the cache is empty
+            if mounts and idle_timeout > 0:
+                _start_reaper(idle_timeout)
+
+
+@contextmanager
+def mount_squashfs(rom: Path, /, *, cache_size: int = 0, idle_timeout: float = 0) -> Generator[Path]:
+    """
+    Mounts the squashfs image and returns the rom to run from it.
+
+    With a `cache_size`, the image is kept mounted on exit, with at most `cache_size` unused images kept at once
+    (least recently used first) and each of them unmounted after `idle_timeout` seconds without being used.
+    """
+    _logger.debug("mount_squashfs(%s)", rom)
+    mount_point = _SQUASHFS_DIR / rom.stem
+
+    mkdir_if_not_exists(_SQUASHFS_DIR)
+
+    if cache_size > 0:
+        with _mount_squashfs_cached(rom, mount_point, cache_size, idle_timeout) as rom_path:
+            yield rom_path
+        return
+
+    # the cache may have been disabled while images were kept mounted
+    if _MOUNT_CACHE_FILE.exists():
+        with _mount_cache() as mounts:
+            _reap(mounts, keep=0, idle_timeout=0)
+
+    # first, try to clean an empty remaining directory (for example because of a crash)
+    if mount_point.exists() and mount_point.is_dir():
+        _logger.debug("squashfs_rom: %s already exists", mount_point)
+        # try to remove an empty directory, else, run the directory, ignoring the .squashfs
+        try:
+            mount_point.rmdir()
+        except (FileNotFoundError, OSError):
+            _logger.debug("squashfs_rom: failed to rmdir %s", mount_point)
+            yield mount_point
+            # No cleanup is necessary
+            return
+
+    # ok, the base directory doesn't exist, let's create it and mount the squashfs on it
+    rom_path = _mount(rom, mount_point)
+
+    try:
+        yield rom_path
     finally:
         _logger.debug("mount_squashfs: cleaning up %s", mount_point)
 
-        # unmount
-        return_code = subprocess.call(["umount", mount_point])
-        if return_code != 0:
-            _logger.debug("mount_squashfs: unmounting %s failed", mount_point)
+        if not _unmount(mount_point):
             raise BatoceraException(f"Unable to unmount the file {mount_point}")
 
-        # cleaning the empty directory
-        mount_point.rmdir()
+
+def _run_reaper(idle_timeout: float, /) -> None:
+    with _REAPER_LOCK.open("a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            # another reaper is running
+            return
+
+        while True:
+            with _mount_cache() as mounts:
+                _reap(mounts, keep=None, idle_timeout=idle_timeout)
+
+                if not mounts:
+                    # released while the cache is locked: a launch caching a mount from now on starts a new reaper
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+                    return
+
+                # the last_used of the mounts may have been updated by the launches since the previous pass
+                now = time.time()
+                delay = min(
+                    (mount.last_used + idle_timeout - now for mount in mounts.values() if not _in_use(mount)),
+                    default=idle_timeout,
+                )
+
+            time.sleep(max(delay, 0) + 1)
+
+
+if __name__ == "__main__":
+    # reaper: python -m configgen.utils.squashfs <idle timeout>
+    _run_reaper(float(sys.argv[1]))
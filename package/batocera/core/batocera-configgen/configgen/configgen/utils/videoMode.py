@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import csv
 import logging
+import os
 import re
+import signal
 import subprocess
 import sys
+import threading
 import time
 from pathlib import Path
 from typing import TYPE_CHECKING, Final
@@ -21,6 +24,50 @@ _logger = logging.getLogger(__name__)
 _ROTATION_FILE: Final = Path("/var/run/rk-rotation")
 _GLXINFO_BIN: Final = Path("/usr/bin/glxinfo")
 
+# batocera-resolution is a (slow to start) shell script: each answer is kept for the whole launch (the queries
+# may come from several prelaunch threads), until the mode is changed
+_MODE_ACTIONS: Final = ("currentMode", "currentResolution", "refreshRate")
+# a hung batocera-resolution must not block the launch
+_QUERY_TIMEOUTS: Final = {"listOutputs": 3}
+
+# action -> (output, return code)
+_snapshot: dict[str, tuple[str, int]] = {}
+_snapshot_lock: Final = threading.Lock()
+
+def _query(action: str) -> tuple[str, int]:
+    with _snapshot_lock:
+        if (result := _snapshot.get(action)) is not None:
+            return result
+
+        _logger.debug("batocera-resolution: querying %s", action)
+        out, return_code = _run(["batocera-resolution", action], _QUERY_TIMEOUTS.get(action))
+        if out is None:
+            _logger.error("batocera-resolution %s timed out", action)
+            return "", 1
+
+        result = _snapshot[action] = (out, return_code)
+        return result
+
+def _run(cmd: list[str], timeout: float | None) -> tuple[str | None, int]:
+    # run in its own session, so that a hung batocera-resolution is killed with the shells running it
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, start_new_session=True) as proc:
+        try:
+            out = proc.communicate(timeout=timeout)[0]
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            return None, 1
+
+    return out.decode(), proc.returncode
+
+def invalidateDisplayCache() -> None:
+    # outputs and modes lists don't depend on the current mode
+    with _snapshot_lock:
+        for action in _MODE_ACTIONS:
+            _snapshot.pop(action, None)
+
 # Set a specific video mode
 def changeMode(videomode: str) -> None:
     if checkModeExists(videomode):
@@ -37,20 +84,20 @@ def changeMode(videomode: str) -> None:
                 if i == max_tries - 1:
                     raise BatoceraException("Error setting video mode") from e
                 time.sleep(1)
+            finally:
+                invalidateDisplayCache()
 
 def getCurrentMode() -> str:  # noqa: RET503
-    proc = subprocess.Popen(["batocera-resolution currentMode"], stdout=subprocess.PIPE, shell=True)
-    (out, _) = proc.communicate()
-    for val in out.decode().splitlines():
+    out, _ = _query("currentMode")
+    for val in out.splitlines():
         return val # return the first line
 
     if TYPE_CHECKING:
         raise AssertionError("unreachable")
 
 def getRefreshRate() -> str:  # noqa: RET503
-    proc = subprocess.Popen(["batocera-resolution refreshRate"], stdout=subprocess.PIPE, shell=True)
-    (out, _) = proc.communicate()
-    for val in out.decode().splitlines():
+    out, _ = _query("refreshRate")
+    for val in out.splitlines():
         return val # return the first line
 
     if TYPE_CHECKING:
@@ -121,33 +168,31 @@ def getScreensInfos(config: SystemConfig) -> list[ScreenInfo]:
     return res
 
 def getScreens() -> list[str]:
-    proc = subprocess.Popen(["batocera-resolution listOutputs"], stdout=subprocess.PIPE, shell=True)
-    (out, _) = proc.communicate()
-    return out.decode().splitlines()
+    out, _ = _query("listOutputs")
+    return out.splitlines()
 
 def minTomaxResolution() -> None:
     proc = subprocess.Popen(["batocera-resolution minTomaxResolution"], stdout=subprocess.PIPE, shell=True)
     proc.communicate()
+    invalidateDisplayCache()
 
 def getCurrentResolution(name: str | None = None) -> Resolution:
     if name is None:
-        proc = subprocess.Popen(["batocera-resolution currentResolution"], stdout=subprocess.PIPE, shell=True)
+        out, _ = _query("currentResolution")
     else:
         proc = subprocess.Popen([f"batocera-resolution --screen {name} currentResolution"], stdout=subprocess.PIPE, shell=True)
+        out = proc.communicate()[0].decode()
 
-    (out, _) = proc.communicate()
-    vals = out.decode().split("x")
+    vals = out.split("x")
     return { "width": int(vals[0]), "height": int(vals[1]) }
 
 def getCurrentOutput() -> str:
-    proc = subprocess.Popen(["batocera-resolution currentOutput"], stdout=subprocess.PIPE, shell=True)
-    (out, _) = proc.communicate()
-    return out.decode().strip()
+    out, _ = _query("currentOutput")
+    return out.strip()
 
 def supportSystemRotation() -> bool:
-    proc = subprocess.Popen(["batocera-resolution supportSystemRotation"], stdout=subprocess.PIPE, shell=True)
-    proc.communicate()
-    return proc.returncode == 0
+    _, return_code = _query("supportSystemRotation")
+    return return_code == 0
 
 def isResolutionReversed():
     return _ROTATION_FILE.exists()
@@ -160,9 +205,8 @@ def checkModeExists(videomode: str) -> bool:
             return True
 
     # specific resolution given
-    proc = subprocess.Popen(["batocera-resolution listModes"], stdout=subprocess.PIPE, shell=True)
-    (out, _) = proc.communicate()
-    for valmod in out.decode().splitlines():
+    out, _ = _query("listModes")
+    for valmod in out.splitlines():
         vals = valmod.split(":")
         if(videomode == vals[0]):
             return True
@@ -10,10 +10,9 @@ from contextlib import contextmanager
 from pathlib import Path
 from typing import TYPE_CHECKING, Final, cast
 
-import evdev
-
 from .. import controllersConfig
 from ..exceptions import BatoceraException
+from .inputDevices import get_device_inventory
 
 if TYPE_CHECKING:
     from collections.abc import Generator, Iterable
@@ -195,6 +194,7 @@ def configure_wheels(
             if os.access(range_path, os.F_OK | os.R_OK | os.W_OK):
                 range_path.write_text(str(wanted_ra))
                 ra = wanted_ra
+                get_device_inventory().refresh([controller.device_path])
 
             # no need new device in some cases
             if wanted_ra < ra or wanted_deadzone > 0:
@@ -212,6 +212,10 @@ def configure_wheels(
                     new_pads.append(newdev)
                     procs.append(p)
 
+    # the virtual wheels are new input devices
+    if new_pads:
+        get_device_inventory().refresh(new_pads)
+
     # recompute sdl ids
     if recompute_sdl_ids:
         # build the new joystick list
@@ -277,6 +281,9 @@ def configure_wheels(
             _logger.error("hum, unable to reset wheel controllers !")
             # don't fail
 
+        if new_pads:
+            get_device_inventory().refresh(new_pads)
+
 
 def _reconfigure_angle_rotation(
     controller: Controller, rotation_angle: int, wanted_rotation_angle: int, wanted_deadzone: int, wanted_midzone: int
@@ -285,9 +292,10 @@ def _reconfigure_angle_rotation(
     if "joystick1left" not in controller.inputs:
         raise BatoceraException(f"Wheel {controller.real_name} has no joystick1left configured. Strange for a wheel.")
 
+    import evdev
+
     wheel_axis = int(controller.inputs["joystick1left"].id)
-    input_device = evdev.InputDevice(controller.device_path)
-    caps = input_device.capabilities()
+    caps = get_device_inventory().capabilities(controller.device_path)
 
     abs_min = None
     abs_max = None
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import Final
+
+import pytest
+
+# the configgen project directory: configgen is imported from there (and not from configgen/, whose types.py
+# would shadow the stdlib one)
+_PROJECT_DIR: Final = Path(__file__).parent.parent
+
+# only imported by the steps needing them, not to slow down the start of each launch
+_DEFERRED_MODULES: Final = ('pyudev', 'sdl2', 'PIL', 'qrcode', 'evdev', 'yaml')
+
+# generous: slower boards take longer, the point is to catch a heavy import added to the start path
+_IMPORT_TIME_BUDGET_US: Final = 1_000_000
+
+
+def _import_times(module: str, /) -> dict[str, int]:
+    """Returns the cumulative import time (in us) of each module imported by `import module`, from -X importtime."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=_PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:') or line.endswith('imported package'):
+            continue
+
+        _, cumulative, name = line.removeprefix('import time:').split('|')
+        times[name.strip()] = int(cumulative)
+
+    return times
+
+
+@pytest.fixture(scope='module')
+def launcher_import_times() -> dict[str, int]:
+    return _import_times('configgen.emulatorlauncher')
+
+
+@pytest.mark.parametrize('module', _DEFERRED_MODULES)
+def test_heavy_module_is_not_imported(launcher_import_times: dict[str, int], module: str) -> None:
+    imported = [name for name in launcher_import_times if name == module or name.startswith(f'{module}.')]
+
+    assert imported == []
+
+
+def test_import_time_budget(launcher_import_times: dict[str, int]) -> None:
+    assert launcher_import_times['configgen.emulatorlauncher'] < _IMPORT_TIME_BUDGET_US
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import sys
+from typing import TYPE_CHECKING
+
+from configgen.utils.logger import setup_logging
+
+if TYPE_CHECKING:
+    import pytest
+
+
+class _Stream(io.StringIO):
+    # setup_logging() closes the streams it wraps once done, the output is read afterwards
+    def close(self) -> None:
+        pass
+
+
+class TestQueuedJsonLines:
+    def test_exception_is_a_field(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        stderr = _Stream()
+        monkeypatch.setattr(sys, 'stdout', _Stream())
+        monkeypatch.setattr(sys, 'stderr', stderr)
+
+        with setup_logging(json_lines=True, queued=True):
+            try:
+                raise ValueError('invalid value')
+            except ValueError:
+                logging.getLogger('configgen.test').exception('failed with %s', 'args')
+
+        lines = stderr.getvalue().splitlines()
+        assert len(lines) == 1
+
+        entry = json.loads(lines[0])
+        assert entry['level'] == 'ERROR'
+        assert entry['message'] == 'failed with args'
+        assert 'ValueError: invalid value' in entry['exception']